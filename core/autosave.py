@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer
+
+from core.file_utils import atomic_write_text
+
+
+class AutosaveService(QObject):
+    """Verzögertes, atomares Speichern von Text im Hintergrund.
+
+    `touch()` wird bei jeder Änderung aufgerufen und startet nur den Timer neu; erst
+    wenn `interval_ms` lang nichts passiert ist, wird der Text einmal über
+    `text_source()` geholt und in einem Hintergrund-Thread geschrieben. Ein einzelner
+    Worker sorgt dafür, dass Schreibvorgänge in der richtigen Reihenfolge ankommen.
+    `on_flushed` wird nach jedem erfolgreichen Schreiben im Hintergrund-Thread aufgerufen.
+
+    Die Leerlaufzeit lässt sich in `config.json` einstellen (siehe `configured_interval`):
+
+        "autosave_interval_ms": 2000
+    """
+
+    CONFIG_KEY = "autosave_interval_ms"
+    DEFAULT_INTERVAL_MS = 1000
+    MIN_INTERVAL_MS = 100  # Kürzer würde fast jeder Tastendruck einen Schreibvorgang auslösen
+
+    def __init__(self, path, text_source, interval_ms=DEFAULT_INTERVAL_MS, parent=None, on_flushed=None):
+        super().__init__(parent)
+        self.path = path
+        self.text_source = text_source
+        self.on_flushed = on_flushed
+        self._dirty = False
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @classmethod
+    def configured_interval(cls, trainee_manager):
+        """Liest die Leerlaufzeit aus `config.json`; fehlt sie oder ist sie ungültig, gilt der Standardwert."""
+        value = trainee_manager.get_config_value(cls.CONFIG_KEY, cls.DEFAULT_INTERVAL_MS)
+        try:
+            return max(cls.MIN_INTERVAL_MS, int(value))
+        except (TypeError, ValueError):
+            print(f"⚠️ Ungültiger Wert für '{cls.CONFIG_KEY}' in config.json, verwende {cls.DEFAULT_INTERVAL_MS} ms.")
+            return cls.DEFAULT_INTERVAL_MS
+
+    def touch(self):
+        """Markiert den Text als geändert und startet den Timer neu."""
+        self._dirty = True
+        self._timer.start()
+
+    def flush(self):
+        """Speichert ausstehende Änderungen sofort (im Hintergrund)."""
+        self._timer.stop()
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return self._executor.submit(self._write, self.text_source())
+
+    def close(self):
+        """Speichert ausstehende Änderungen und wartet, bis alles geschrieben ist."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, text):
+        try:
+            atomic_write_text(self.path, text)
+        except OSError as e:
+            print(f"⚠️ Automatisches Speichern von {self.path} fehlgeschlagen: {e}")
+            return
+
+        if self.on_flushed:
+            self.on_flushed()
@@ -0,0 +1,306 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class CatalogWatcher:
+    """Meldet Änderungen im Trainee-Ordner an den Katalog (nur den betroffenen Trainee).
+
+    Bewusst ohne `FileSystemEventHandler`-Basisklasse: der Observer ruft nur
+    `dispatch()` auf, so wird watchdog erst beim Start der Überwachung importiert.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def dispatch(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            trainee_name = self.catalog.trainee_for_path(path) if path else None
+            if trainee_name:
+                self.catalog.schedule_refresh(trainee_name)
+
+
+class CatalogEvents(QObject):
+    """Meldet Katalogänderungen an die GUI.
+
+    Gesendet wird aus Watchdog-Timern oder Hintergrund-Jobs; Empfänger im
+    GUI-Thread bekommen das Signal daher automatisch als Queued-Connection.
+    """
+
+    trainee_changed = pyqtSignal(str)  # Trainee wurde angelegt, geändert oder entfernt
+
+
+class TraineeCatalog:
+    """Index aller Trainees & Trainings mit zwischengespeicherten Metadaten.
+
+    Der Katalog liegt als SQLite-Datei im Konfigurationsordner und wird beim Start
+    in den Speicher geladen, sodass Auflisten und Filtern nie auf die (evtl.
+    Netzwerk-)Platte zugreifen. Ein Watchdog-Observer aktualisiert nur die Trainees,
+    in deren Ordner sich etwas geändert hat; jede Änderung wird über
+    `events.trainee_changed` gemeldet.
+    """
+
+    REFRESH_DELAY = 0.5  # Sekunden, um mehrere Dateiereignisse zusammenzufassen
+    REFRESH_ATTEMPTS = 3  # So oft wird neu gelesen, wenn sich der Ordner während des Scans ändert
+
+    def __init__(self, db_path, trainee_folder):
+        self.db_path = db_path
+        self.trainee_folder = trainee_folder
+        self._lock = threading.RLock()
+        self._timers = {}
+        self.observer = None
+        self.events = CatalogEvents()
+
+        # trainee → {"mtime": ..., "trainings": {training → Metadaten}}
+        self.trainees = {}
+
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.create_tables()
+        self.load()
+
+    def create_tables(self):
+        """Legt die Tabellen an, falls sie noch nicht existieren."""
+        with self._lock, self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS trainees (name TEXT PRIMARY KEY, mtime REAL)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS trainings ("
+                "trainee TEXT, name TEXT, date TEXT, mtime REAL, screenshot_count INTEGER, has_akte INTEGER, "
+                "PRIMARY KEY (trainee, name))"
+            )
+
+    def load(self):
+        """Lädt den gespeicherten Katalog; gehört er zu einem anderen Trainee-Ordner, wird er verworfen."""
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'trainee_folder'").fetchone()
+            if not row or row[0] != self.trainee_folder:
+                with self.connection:
+                    self.connection.execute("DELETE FROM trainees")
+                    self.connection.execute("DELETE FROM trainings")
+                    self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('trainee_folder', ?)", (self.trainee_folder,))
+                self.trainees = {}
+                return
+
+            self.trainees = {name: {"mtime": mtime, "trainings": {}} for name, mtime in self.connection.execute("SELECT name, mtime FROM trainees")}
+            for trainee, name, date, mtime, screenshot_count, has_akte in self.connection.execute("SELECT * FROM trainings"):
+                if trainee in self.trainees:
+                    self.trainees[trainee]["trainings"][name] = {
+                        "date": date, "mtime": mtime, "screenshot_count": screenshot_count, "has_akte": bool(has_akte)
+                    }
+
+    def is_empty(self):
+        """True, wenn noch nie ein Scan gelaufen ist."""
+        with self._lock:
+            return not self.trainees
+
+    # ------------------------------------------------------------------
+    # Abfragen (nur Speicher)
+    # ------------------------------------------------------------------
+
+    def get_trainees(self):
+        """Gibt alle Trainee-Namen sortiert zurück."""
+        with self._lock:
+            return sorted(self.trainees, key=str.lower)
+
+    def get_trainings(self, trainee_name):
+        """Gibt alle Trainings eines Trainees sortiert zurück."""
+        with self._lock:
+            trainee = self.trainees.get(trainee_name)
+            return sorted(trainee["trainings"], key=str.lower) if trainee else []
+
+    def has_trainee(self, trainee_name):
+        """True, wenn der Trainee im Katalog steht."""
+        with self._lock:
+            return trainee_name in self.trainees
+
+    def get_training_info(self, trainee_name, training_name):
+        """Gibt die Metadaten eines Trainings zurück (Datum, Screenshot-Anzahl, Akte vorhanden)."""
+        with self._lock:
+            trainee = self.trainees.get(trainee_name)
+            info = trainee["trainings"].get(training_name) if trainee else None
+            return dict(info) if info else None
+
+    # ------------------------------------------------------------------
+    # Aktualisierung (Platte → Katalog)
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Gleicht den Katalog mit der Platte ab; nur Trainings mit geänderter mtime werden neu gelesen."""
+        if not os.path.isdir(self.trainee_folder):
+            return
+
+        on_disk = set()
+        for entry in os.scandir(self.trainee_folder):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            on_disk.add(entry.name)
+            self.refresh_trainee(entry.name, only_changed=True)
+
+        with self._lock:
+            for trainee_name in set(self.trainees) - on_disk:
+                self.remove_trainee(trainee_name)
+
+    def refresh_trainee(self, trainee_name, only_changed=False):
+        """Liest einen Trainee neu ein. Mit `only_changed` werden unveränderte Trainings übersprungen.
+
+        Gelesen wird ohne Lock; vor dem Schreiben wird unter dem Lock geprüft, ob sich
+        die mtimes seit dem Scan geändert haben. So kann ein langsamer, älterer Scan
+        keinen neueren Stand überschreiben.
+        """
+        trainee_path = os.path.join(self.trainee_folder, trainee_name)
+        for _ in range(self.REFRESH_ATTEMPTS):
+            if not os.path.isdir(trainee_path):
+                self.remove_trainee(trainee_name)
+                return
+
+            with self._lock:
+                known_trainings = dict(self.trainees.get(trainee_name, {}).get("trainings", {}))
+
+            try:
+                trainee_mtime, training_mtimes = self.scan_mtimes(trainee_path)
+                trainings = {}
+                for name, mtime in training_mtimes.items():
+                    known = known_trainings.get(name)
+                    if only_changed and known and known["mtime"] == mtime:
+                        trainings[name] = known
+                    else:
+                        trainings[name] = self.read_training_info(os.path.join(trainee_path, name), mtime)
+            except FileNotFoundError:
+                continue  # Während des Scans gelöscht oder umbenannt
+
+            with self._lock:
+                try:
+                    if self.scan_mtimes(trainee_path) != (trainee_mtime, training_mtimes):
+                        continue  # Während des Scans geändert, neu lesen
+                except FileNotFoundError:
+                    continue
+
+                known = self.trainees.get(trainee_name)
+                if known and known["mtime"] == trainee_mtime and known["trainings"] == trainings:
+                    return  # Nichts geändert, Datenbank nicht anfassen
+
+                self.trainees[trainee_name] = {"mtime": trainee_mtime, "trainings": trainings}
+                with self.connection:
+                    self.connection.execute("INSERT OR REPLACE INTO trainees VALUES (?, ?)", (trainee_name, trainee_mtime))
+                    self.connection.execute("DELETE FROM trainings WHERE trainee = ?", (trainee_name,))
+                    self.connection.executemany(
+                        "INSERT INTO trainings VALUES (?, ?, ?, ?, ?, ?)",
+                        [(trainee_name, name, info["date"], info["mtime"], info["screenshot_count"], int(info["has_akte"]))
+                         for name, info in trainings.items()],
+                    )
+            self.events.trainee_changed.emit(trainee_name)
+            return
+
+        # Ordner ändert sich laufend: nach dem nächsten Dateiereignis erneut versuchen
+        self.schedule_refresh(trainee_name)
+
+    def remove_trainee(self, trainee_name):
+        """Entfernt einen Trainee aus dem Katalog."""
+        with self._lock:
+            if self.trainees.pop(trainee_name, None) is None:
+                return
+            with self.connection:
+                self.connection.execute("DELETE FROM trainees WHERE name = ?", (trainee_name,))
+                self.connection.execute("DELETE FROM trainings WHERE trainee = ?", (trainee_name,))
+        self.events.trainee_changed.emit(trainee_name)
+
+    def scan_mtimes(self, trainee_path):
+        """mtime des Trainee-Ordners und aller Trainings (Trainingsname → mtime)."""
+        trainee_mtime = os.stat(trainee_path).st_mtime
+        training_mtimes = {entry.name: self.training_mtime(entry.path) for entry in os.scandir(trainee_path)
+                           if entry.is_dir() and not entry.name.startswith(".")}
+        return trainee_mtime, training_mtimes
+
+    @staticmethod
+    def training_mtime(training_path):
+        """mtime eines Trainings: jüngste Änderung am Trainings- oder Screenshot-Ordner."""
+        mtime = os.stat(training_path).st_mtime
+        screenshots_path = os.path.join(training_path, "screenshots")
+        if os.path.isdir(screenshots_path):
+            mtime = max(mtime, os.stat(screenshots_path).st_mtime)
+        return mtime
+
+    @staticmethod
+    def read_training_info(training_path, mtime):
+        """Liest die Metadaten eines Trainings von der Platte."""
+        screenshots_path = os.path.join(training_path, "screenshots")
+        screenshot_count = 0
+        if os.path.isdir(screenshots_path):
+            screenshot_count = sum(1 for name in os.listdir(screenshots_path) if name.lower().endswith(".png"))
+
+        akte_file = os.path.join(training_path, "akte.json")
+        has_akte = os.path.exists(akte_file)
+
+        date = None
+        if has_akte:
+            try:
+                with open(akte_file, "r", encoding="utf-8") as f:
+                    date = json.load(f).get("training_date")
+            except (json.JSONDecodeError, OSError):
+                pass
+        if not date:
+            date = datetime.fromtimestamp(os.stat(training_path).st_ctime).strftime("%Y-%m-%d %H:%M:%S")
+
+        return {"date": date, "mtime": mtime, "screenshot_count": screenshot_count, "has_akte": has_akte}
+
+    # ------------------------------------------------------------------
+    # Dateisystem-Überwachung
+    # ------------------------------------------------------------------
+
+    def trainee_for_path(self, path):
+        """Bestimmt den Trainee, zu dem ein Pfad im Trainee-Ordner gehört."""
+        relative_path = os.path.relpath(path, self.trainee_folder)
+        if relative_path.startswith(".."):
+            return None
+        trainee_name = relative_path.split(os.sep)[0]
+        if trainee_name in (".", "") or trainee_name.startswith("."):
+            return None
+        return trainee_name
+
+    def schedule_refresh(self, trainee_name):
+        """Aktualisiert einen Trainee kurz nach dem letzten Dateiereignis."""
+        with self._lock:
+            timer = self._timers.get(trainee_name)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(self.REFRESH_DELAY, self._run_scheduled_refresh, args=(trainee_name,))
+            timer.daemon = True
+            self._timers[trainee_name] = timer
+            timer.start()
+
+    def _run_scheduled_refresh(self, trainee_name):
+        with self._lock:
+            self._timers.pop(trainee_name, None)
+        try:
+            self.refresh_trainee(trainee_name, only_changed=True)
+        except OSError as e:
+            print(f"⚠️ Katalog konnte '{trainee_name}' nicht aktualisieren: {e}")
+
+    def refresh_and_watch(self):
+        """Gleicht den Katalog ab und startet danach die Überwachung (für einen Hintergrund-Thread)."""
+        try:
+            self.refresh()
+        except OSError as e:
+            print(f"⚠️ Katalog konnte nicht aktualisiert werden: {e}")
+        self.start_watching()
+
+    def start_watching(self):
+        """Startet die Überwachung des Trainee-Ordners."""
+        from watchdog.observers import Observer
+
+        if self.observer or not os.path.isdir(self.trainee_folder):
+            return
+        self.observer = Observer()
+        self.observer.daemon = True
+        self.observer.schedule(CatalogWatcher(self), self.trainee_folder, recursive=True)
+        self.observer.start()
+
+    def stop_watching(self):
+        """Stoppt die Überwachung."""
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
@@ -0,0 +1,108 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+
+
+def document_text(document, position, length):
+    """Gibt den Text eines `QTextDocument`-Ausschnitts zurück (Absatztrenner → Zeilenumbruch)."""
+    end = min(position + length, document.characterCount() - 1)  # Qt zählt den letzten Absatztrenner mit
+
+    cursor = QTextCursor(document)
+    cursor.setPosition(min(position, end))
+    cursor.setPosition(end, QTextCursor.KeepAnchor)
+    return cursor.selectedText().replace("\u2029", "\n")
+
+
+class ChangeFeed(QObject):
+    """Überträgt Änderungen an Notizen & Bemerkungen als Deltas über den Live-Kanal.
+
+    Notizen werden als Patches `[Position, entfernte Zeichen, neuer Text]` gesendet,
+    Bemerkungen nur mit den geänderten Schlüsseln. Änderungen werden gesammelt und
+    höchstens alle `interval_ms` verschickt; aufeinanderfolgendes Tippen und Löschen
+    an derselben Stelle wird dabei zu einem Patch zusammengefasst. Die übertragene
+    Datenmenge hängt so von den Änderungen ab, nicht von der Größe der Dokumente.
+
+    Jeder Patch-Block enthält die erwartete Länge der Notizen; weicht sie beim
+    Server ab, fordert er über den Kanal den vollständigen Text neu an.
+    """
+
+    EVENT_NOTES_RESET = "notes_reset"
+    EVENT_NOTES_PATCH = "notes_patch"
+    EVENT_COMMENTS = "comments"
+
+    resync_requested = pyqtSignal()
+
+    def __init__(self, live_channel, notes_source, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.live_channel = live_channel
+        self.notes_source = notes_source  # liefert den aktuellen Notiztext (nur im GUI-Thread aufrufen)
+        self.notes_length = None
+        self._patches = []
+        self._comments = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+        self.resync_requested.connect(self.reset_notes)  # Signal kommt aus dem Thread des Kanals
+        self.live_channel.on_message = self.handle_server_message
+
+    def reset_notes(self):
+        """Sendet den vollständigen Notiztext als neue Grundlage für alle folgenden Patches."""
+        self._patches = []
+        text = self.notes_source()
+        self.notes_length = len(text)
+        self.live_channel.send(self.EVENT_NOTES_RESET, text=text)
+
+    def notes_changed(self, position, chars_removed, inserted_text, notes_length):
+        """Merkt sich eine Änderung der Notizen (Position, entfernte Zeichen, eingefügter Text, neue Länge)."""
+        if self.notes_length is None:
+            return  # Ohne Grundlage beim Server wäre der Patch wertlos
+        self.notes_length = notes_length
+        self.merge_patch(position, chars_removed, inserted_text)
+        self.schedule_flush()
+
+    def merge_patch(self, position, chars_removed, inserted_text):
+        """Hängt einen Patch an oder fasst ihn mit dem vorherigen zusammen (Tippen & Backspace)."""
+        if self._patches:
+            last = self._patches[-1]
+            last_end = last[0] + len(last[2])
+            if chars_removed == 0 and position == last_end:
+                last[2] += inserted_text
+                return
+            if not inserted_text and position + chars_removed == last_end and last[0] <= position:
+                last[2] = last[2][:position - last[0]]
+                return
+            if not inserted_text and not last[2] and position + chars_removed == last[0]:
+                last[0] = position  # Backspace über bestehenden Text
+                last[1] += chars_removed
+                return
+            if not inserted_text and not last[2] and position == last[0]:
+                last[1] += chars_removed  # Entf über bestehenden Text
+                return
+        self._patches.append([position, chars_removed, inserted_text])
+
+    def comments_changed(self, comments):
+        """Merkt sich geänderte Bemerkungen (Schlüssel wie in `comments.json`; nur im GUI-Thread aufrufen)."""
+        self._comments.update(comments)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        """Startet den Timer, falls nicht schon ein Versand aussteht (keine Verlängerung bei weiterem Tippen)."""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Sendet alle gesammelten Änderungen sofort."""
+        self._timer.stop()
+        if self._patches:
+            self.live_channel.send(self.EVENT_NOTES_PATCH, patches=self._patches, length=self.notes_length)
+            self._patches = []
+        if self._comments:
+            self.live_channel.send(self.EVENT_COMMENTS, comments=self._comments)
+            self._comments = {}
+
+    def handle_server_message(self, message):
+        """Wird im Thread des Kanals aufgerufen; eine Neusynchronisierung läuft im GUI-Thread."""
+        if "notes" in message.get("resync", ()):
+            self.resync_requested.emit()
@@ -0,0 +1,21 @@
+import json
+import os
+import tempfile
+
+
+def atomic_write_text(path, text):
+    """Schreibt Text atomar: erst in eine temporäre Datei, dann per Umbenennen ersetzen."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def atomic_write_json(path, data):
+    """Schreibt JSON atomar (siehe `atomic_write_text`)."""
+    atomic_write_text(path, json.dumps(data, indent=4, ensure_ascii=False))
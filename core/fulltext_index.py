@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from core.trainee_manager import TraineeManager, get_trainee_manager
+
+
+class FulltextIndex:
+    """SQLite-FTS5-Volltextindex über Notizen, Bemerkungen und Akten aller Trainings.
+
+    Pro Datei wird die mtime gespeichert, sodass `refresh()` nur geänderte Dateien
+    neu einliest. `update_training()` wird nach dem Speichern aufgerufen und hält
+    den Index ohne vollständigen Scan aktuell.
+    """
+
+    DB_FILE = os.path.join(TraineeManager.CONFIG_DIR, "fulltext.sqlite")
+    SOURCES = {"notes": "notes.txt", "comments": "comments.json", "akte": "akte.json"}
+
+    def __init__(self, trainee_folder, db_path=DB_FILE):
+        self.trainee_folder = trainee_folder
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        # Der Index lässt sich jederzeit aus den Dateien neu aufbauen: WAL ohne fsync pro Transaktion genügt
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        with self._lock, self.connection:
+            columns = [row[1] for row in self.connection.execute("PRAGMA table_info(files)")]
+            if columns and "doc_id" not in columns:
+                # Index aus älterer Version ohne Verweis auf das Dokument: verwerfen, `refresh()` baut ihn neu auf
+                self.connection.execute("DROP TABLE files")
+                self.connection.execute("DROP TABLE IF EXISTS documents")
+            # `doc_id` ist die rowid in `documents`; FTS5 kann dort nicht nach Pfad löschen, ohne alles zu durchsuchen
+            self.connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL, doc_id INTEGER)")
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5("
+                "trainee, training, kind, content, path UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    # ------------------------------------------------------------------
+    # Indizieren
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Gleicht den Index mit allen Trainings im Trainee-Ordner ab."""
+        if not os.path.isdir(self.trainee_folder):
+            return
+
+        seen_paths = set()
+        for trainee_entry in os.scandir(self.trainee_folder):
+            if not trainee_entry.is_dir() or trainee_entry.name.startswith("."):
+                continue
+            for training_entry in os.scandir(trainee_entry.path):
+                if training_entry.is_dir() and not training_entry.name.startswith("."):
+                    seen_paths.update(self.update_training(trainee_entry.name, training_entry.name))
+
+        with self._lock, self.connection:
+            for (path,) in self.connection.execute("SELECT path FROM files").fetchall():
+                if path not in seen_paths:
+                    self.remove_file(path)
+
+    def update_training(self, trainee_name, training_name):
+        """Indiziert die Dateien eines Trainings neu, sofern sie sich geändert haben. Gibt die Pfade zurück."""
+        training_folder = os.path.join(self.trainee_folder, trainee_name, training_name)
+        paths = set()
+        changed = {}  # Pfad → (bekannt, mtime, Art, Inhalt); mtime None = Datei entfernt
+        for kind, file_name in self.SOURCES.items():
+            path = os.path.join(training_folder, file_name)
+            paths.add(path)
+            with self._lock:
+                row = self.connection.execute("SELECT mtime FROM files WHERE path = ?", (path,)).fetchone()
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                if row:
+                    changed[path] = (True, None, kind, None)
+                continue
+            if not row or row[0] != mtime:
+                changed[path] = (bool(row), mtime, kind, self.extract_text(kind, path))
+
+        if changed:
+            # Eine Transaktion pro Training statt pro Datei
+            with self._lock, self.connection:
+                for path, (known, mtime, kind, content) in changed.items():
+                    if known:
+                        self.remove_file(path)
+                    if mtime is None:
+                        continue
+                    cursor = self.connection.execute(
+                        "INSERT INTO documents (trainee, training, kind, content, path) VALUES (?, ?, ?, ?, ?)",
+                        (trainee_name, training_name, kind, content, path),
+                    )
+                    self.connection.execute("INSERT INTO files VALUES (?, ?, ?)", (path, mtime, cursor.lastrowid))
+        return paths
+
+    def refresh_trainee(self, trainee_name):
+        """Gleicht den Index nur für einen Trainee ab (nach einer Katalogänderung)."""
+        trainee_path = os.path.join(self.trainee_folder, trainee_name)
+        seen_paths = set()
+        if os.path.isdir(trainee_path):
+            for training_entry in os.scandir(trainee_path):
+                if training_entry.is_dir() and not training_entry.name.startswith("."):
+                    seen_paths.update(self.update_training(trainee_name, training_entry.name))
+
+        prefix = trainee_path + os.sep
+        with self._lock, self.connection:
+            rows = self.connection.execute(
+                "SELECT path FROM files WHERE path >= ? AND path < ?", (prefix, prefix + "\U0010ffff")).fetchall()
+            for (path,) in rows:
+                if path not in seen_paths:
+                    self.remove_file(path)
+
+    def update_training_folder(self, training_folder):
+        """Wie `update_training`, aber mit dem vollen Pfad des Trainingsordners."""
+        relative_path = os.path.relpath(training_folder, self.trainee_folder)
+        parts = relative_path.split(os.sep)
+        if len(parts) != 2 or parts[0].startswith(".."):
+            return
+        try:
+            self.update_training(parts[0], parts[1])
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Volltextindex konnte nicht aktualisiert werden: {e}")
+
+    def remove_file(self, path):
+        """Entfernt eine Datei aus dem Index (Aufrufer hält Lock & Transaktion)."""
+        row = self.connection.execute("SELECT doc_id FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.connection.execute("DELETE FROM documents WHERE rowid = ?", (row[0],))
+
+    @staticmethod
+    def extract_text(kind, path):
+        """Liest den durchsuchbaren Text aus einer Trainingsdatei."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if kind == "notes":
+                    return f.read()
+
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            return ""
+
+        if kind == "comments":
+            return "\n".join(f"{name}: {comment}" for name, comment in data.items() if comment)
+
+        lines = [data.get("training_name", ""), data.get("comment", "")]
+        for entry in data.get("criteria", []):
+            lines.append(f"{entry.get('criterion', '')}: {entry.get('strengths', '')} / {entry.get('weaknesses', '')}")
+        return "\n".join(line for line in lines if line)
+
+    # ------------------------------------------------------------------
+    # Suchen
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build_query(text):
+        """Wandelt eine Nutzereingabe in eine FTS5-Abfrage um (jedes Wort als Präfix, alle müssen vorkommen)."""
+        words = [word.replace('"', "") for word in re.split(r"\s+", text.strip())]
+        return " ".join(f'"{word}"*' for word in words if word)
+
+    def search(self, text, limit=100):
+        """Sucht im Index und gibt Treffer als Liste von Dicts (trainee, training, kind, snippet) zurück."""
+        query = self.build_query(text)
+        if not query:
+            return []
+
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT trainee, training, kind, snippet(documents, 3, '[', ']', '…', 12) "
+                "FROM documents WHERE documents MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [{"trainee": trainee, "training": training, "kind": kind, "snippet": snippet.replace("\n", " ")}
+                for trainee, training, kind, snippet in rows]
+
+    def match_trainees(self, text):
+        """Gibt die Trainees zurück, in deren Dateien alle Wörter der Eingabe (als Präfix) vorkommen.
+
+        Gesucht wird nur im Inhalt; Trainee- und Trainingsnamen deckt der `SearchIndex` ab.
+        """
+        query = self.build_query(text)
+        if not query:
+            return set()
+
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT trainee FROM documents WHERE documents MATCH ?", (f"content : ({query})",)).fetchall()
+        return {trainee for (trainee,) in rows}
+
+
+_shared_fulltext_index = None
+
+
+def get_fulltext_index():
+    """Gibt den prozessweiten Volltextindex für den aktuellen Trainee-Ordner zurück."""
+    global _shared_fulltext_index
+    trainee_folder = get_trainee_manager().trainee_folder
+    if _shared_fulltext_index is None or _shared_fulltext_index.trainee_folder != trainee_folder:
+        _shared_fulltext_index = FulltextIndex(trainee_folder)
+    return _shared_fulltext_index
@@ -0,0 +1,336 @@
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import ssl
+import struct
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"  # RFC 6455, Abschnitt 1.3
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+CLOSE_NORMAL = 1000
+
+
+class ChannelUnsupported(Exception):
+    """Der Server bietet keinen Live-Kanal an (z. B. 404 statt 101 beim Handshake)."""
+
+
+def websocket_accept(key):
+    """Erwarteter `Sec-WebSocket-Accept`-Wert zu einem `Sec-WebSocket-Key`."""
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def encode_frame(opcode, payload, mask=True):
+    """Baut einen einzelnen WebSocket-Frame (Client-Frames müssen maskiert sein)."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, (0x80 if mask else 0) | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, (0x80 if mask else 0) | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, (0x80 if mask else 0) | 127, length)
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + apply_mask(payload, key)
+
+
+def apply_mask(payload, key):
+    """XOR mit dem 4-Byte-Schlüssel – als eine große Ganzzahl statt Byte für Byte."""
+    length = len(payload)
+    if not length:
+        return payload
+    repeated = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+
+
+class LiveChannel:
+    """Dauerhafter Ereigniskanal zum Debrief-Server (asyncio, WebSocket mit JSON-Zeilen).
+
+    Statt pro Ereignis eine eigene Anfrage zu senden, hält der Kanal eine WebSocket-
+    Verbindung offen und schreibt Ereignisse als JSON-Zeilen in Text-Nachrichten.
+    Ereignisse, die während eines laufenden Schreibvorgangs eintreffen, werden zu
+    einer Nachricht gebündelt. Der Server bestätigt die höchste verarbeitete
+    Sequenznummer; unbestätigte Ereignisse werden nach einem Verbindungsabbruch
+    erneut gesendet (der Server verwirft bereits bekannte Sequenznummern).
+
+    Läuft in einem eigenen Thread mit eigener Event-Loop; `send()` ist aus jedem
+    Thread aufrufbar. Lehnt der Server den Handshake ab (kein 101), wird der Kanal
+    abgeschaltet; Timeouts und Abbrüche führen zu neuen Versuchen mit Backoff.
+    """
+
+    EVENT_SCREENSHOT = "screenshot"
+    EVENT_SHOW_SCREENSHOT = "show_screenshot"
+
+    def __init__(self, api_base_url, training_id, batch_delay=0.01, max_batch_size=200, connect_timeout=5.0, max_reconnect_delay=10.0):
+        self.url = urlsplit(f"{api_base_url.rstrip('/')}/{training_id}/events")
+        self.session_id = uuid.uuid4().hex  # Sequenznummern gelten pro Sitzung
+        self.batch_delay = batch_delay
+        self.max_batch_size = max_batch_size
+        self.connect_timeout = connect_timeout
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.enabled = True
+        self.sent_events = 0
+        self.sent_batches = 0
+        self.acked_sequence = 0
+        self.on_message = None  # optional: erhält Antwortzeilen mit mehr als der Bestätigung (im Kanal-Thread)
+
+        self._sequence = itertools.count(1)
+        self._unacked = {}  # Sequenznummer → Ereignis (nur im Loop-Thread verwendet)
+        self._all_acked = asyncio.Event()  # gesetzt, sobald `_unacked` leer ist
+        self._closing = False
+        self._close_requested = False
+        self._reconnect_delay = 0.5
+        self._loop = asyncio.new_event_loop()
+        self._queue = asyncio.Queue()
+        self._thread = threading.Thread(target=self._thread_main, name="LiveChannel", daemon=True)
+        self._task = None  # asyncio-Task von `_run()`, gesetzt im Loop-Thread
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # Öffentliche API (thread-sicher)
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Startet den Hintergrund-Thread und baut die Verbindung auf."""
+        self._task = self._loop.create_task(self._run())
+        self._started = True
+        self._thread.start()
+
+    def send(self, event_type, **data):
+        """Reiht ein Ereignis ein; gibt False zurück, wenn der Kanal nicht (mehr) verfügbar ist."""
+        if not self.enabled or not self._started:
+            return False
+        event = {"type": event_type, "seq": next(self._sequence), "ts": round(time.time(), 3)}
+        event.update(data)
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            return False  # Loop wurde gerade beendet
+        return True
+
+    def close(self, timeout=2.0):
+        """Sendet ausstehende Ereignisse, schließt die WebSocket-Verbindung sauber und stoppt den Thread."""
+        if not self._started:
+            return
+        self._started = False
+        self.enabled = False
+        self._close_requested = True
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            self._thread.join(timeout)
+        if self._thread.is_alive():
+            pending = len(self._unacked) + max(self._queue.qsize() - 1, 0)
+            print(f"⚠️ Live-Kanal nicht erreichbar, {pending} Ereignis(se) nicht gesendet.")
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout)
+
+    def _thread_main(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Live-Kanal wurde unerwartet beendet: {e}")
+        finally:
+            self.enabled = False  # Ohne laufende Loop nimmt `send()` nichts mehr an
+            self._loop.close()
+
+    # ------------------------------------------------------------------
+    # Event-Loop
+    # ------------------------------------------------------------------
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(self._connect(), self.connect_timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                if not await self._wait_before_reconnect(f"Verbindung fehlgeschlagen ({e})"):
+                    return
+                continue
+
+            try:
+                await self._session(reader, writer)
+                return
+            except ChannelUnsupported as e:
+                self.enabled = False
+                print(f"⚠️ Server unterstützt keinen Live-Kanal ({e}), Live-Ereignisse werden nicht gesendet.")
+                return
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+                if not await self._wait_before_reconnect(f"Verbindung unterbrochen ({type(e).__name__})"):
+                    return
+            finally:
+                writer.close()
+
+    async def _wait_before_reconnect(self, reason):
+        """Wartet exponentiell länger vor dem nächsten Verbindungsversuch.
+
+        Auch nach `close()` wird weiter versucht, ausstehende Ereignisse loszuwerden –
+        begrenzt durch den Timeout von `close()`.
+        """
+        if self._close_requested:
+            self._reconnect_delay = min(self._reconnect_delay, 0.2)
+        print(f"🔁 Live-Kanal: {reason}, neuer Versuch in {self._reconnect_delay:.1f} s")
+        await asyncio.sleep(self._reconnect_delay)
+        self._reconnect_delay = min(self._reconnect_delay * 2, self.max_reconnect_delay)
+        return True
+
+    async def _connect(self):
+        if self.url.scheme in ("https", "wss"):
+            return await asyncio.open_connection(self.url.hostname, self.url.port or 443, ssl=ssl.create_default_context())
+        return await asyncio.open_connection(self.url.hostname, self.url.port or 80)
+
+    async def _session(self, reader, writer):
+        """Führt den Handshake aus, sendet unbestätigte Ereignisse erneut und schreibt danach neue Ereignisse."""
+        await asyncio.wait_for(self._handshake(reader, writer), self.connect_timeout)
+        self._reconnect_delay = 0.5
+
+        ack_task = asyncio.ensure_future(self._read_frames(reader, writer))
+        get_task = None
+        try:
+            if self._unacked:
+                await self._write_batch(writer, list(self._unacked.values()))
+
+            while not self._closing:
+                if get_task is None:
+                    get_task = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({get_task, ack_task}, return_when=asyncio.FIRST_COMPLETED)
+                if get_task not in done:
+                    raise ConnectionError("Server hat den Live-Kanal geschlossen")
+
+                batch = await self._collect_batch(get_task.result())
+                get_task = None
+                for event in batch:
+                    self._unacked[event["seq"]] = event
+                if batch:
+                    self._all_acked.clear()
+                    await self._write_batch(writer, batch)
+                if ack_task.done():
+                    raise ConnectionError("Server hat den Live-Kanal geschlossen")
+
+            # Erst die letzte Bestätigung abwarten: nach dem Close-Frame darf der Server nichts mehr senden
+            if self._unacked:
+                acked_task = asyncio.ensure_future(self._all_acked.wait())
+                await asyncio.wait({acked_task, ack_task}, timeout=self.connect_timeout, return_when=asyncio.FIRST_COMPLETED)
+                acked_task.cancel()
+                if self._unacked:
+                    raise ConnectionError("Verbindung endete vor der letzten Bestätigung")
+            writer.write(encode_frame(OPCODE_CLOSE, struct.pack("!H", CLOSE_NORMAL)))
+            await writer.drain()
+            await asyncio.wait_for(ack_task, self.connect_timeout)
+        finally:
+            if get_task is not None:
+                get_task.cancel()
+            if not ack_task.done():
+                ack_task.cancel()
+            elif not ack_task.cancelled():
+                ack_task.exception()  # Fehler beim Lesen ist bereits als Verbindungsabbruch behandelt
+
+    async def _handshake(self, reader, writer):
+        """WebSocket-Upgrade (RFC 6455); alles außer 101 mit passendem Accept-Wert gilt als nicht unterstützt."""
+        host = self.url.hostname if not self.url.port else f"{self.url.hostname}:{self.url.port}"
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        writer.write(
+            f"GET {self.url.path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Upgrade: websocket\r\n"
+            f"Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            f"Sec-WebSocket-Version: 13\r\n"
+            f"X-Session-Id: {self.session_id}\r\n\r\n".encode("ascii")
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Keine Antwort vom Server")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        status = int(status_line.split()[1])
+        if status != 101:
+            raise ChannelUnsupported(f"HTTP {status}")
+        if headers.get("sec-websocket-accept") != websocket_accept(key):
+            raise ChannelUnsupported("ungültiger WebSocket-Handshake")
+
+    async def _collect_batch(self, first_event):
+        """Bündelt alle bereits wartenden Ereignisse (Bursts) zu einem Chunk."""
+        if first_event is None:
+            self._closing = True
+            return []
+        if self.batch_delay:
+            await asyncio.sleep(self.batch_delay)
+
+        batch = [first_event]
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is None:
+                self._closing = True
+                break
+            batch.append(event)
+        return batch
+
+    async def _write_batch(self, writer, batch):
+        data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in batch).encode("utf-8")
+        writer.write(encode_frame(OPCODE_TEXT, data))
+        await writer.drain()
+        self.sent_events += len(batch)
+        self.sent_batches += 1
+
+    @staticmethod
+    async def _read_frame(reader):
+        """Liest einen Frame und gibt `(fin, opcode, payload)` zurück."""
+        first, second = await reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key:
+            payload = apply_mask(payload, key)
+        return bool(first & 0x80), first & 0x0F, payload
+
+    async def _read_frames(self, reader, writer):
+        """Liest die Bestätigungen (JSON-Zeilen in Text-Nachrichten) bis zum Close-Frame des Servers."""
+        message = b""
+        while True:
+            fin, opcode, payload = await self._read_frame(reader)
+            if opcode == OPCODE_CLOSE:
+                if not self._closing:
+                    writer.write(encode_frame(OPCODE_CLOSE, payload[:2]))  # Close des Servers beantworten
+                return
+            if opcode == OPCODE_PING:
+                writer.write(encode_frame(OPCODE_PONG, payload))
+                continue
+            if opcode not in (OPCODE_TEXT, OPCODE_CONTINUATION):
+                continue  # Pong & Binärdaten sind für den Kanal bedeutungslos
+
+            message += payload
+            if not fin:
+                continue
+            for line in message.splitlines():
+                if not line.strip():
+                    continue
+                message_data = json.loads(line)
+                self.acked_sequence = max(self.acked_sequence, message_data.get("ack", 0))
+                if self.on_message and len(message_data) > 1:
+                    self.on_message(message_data)
+            message = b""
+            for sequence in [s for s in self._unacked if s <= self.acked_sequence]:
+                del self._unacked[sequence]
+            if not self._unacked:
+                self._all_acked.set()
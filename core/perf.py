@@ -0,0 +1,173 @@
+"""Leichtgewichtige Zeitmessung für Start & heiße Pfade.
+
+Aktiviert über die Umgebungsvariable `TRAINEEMANAGER_PERF` oder den Schlüssel
+`performance_log` in `config.json`:
+
+    "1" / true   → Spans werden als JSON-Zeilen nach `perf.log` geschrieben
+    "profile"    → zusätzlich ein cProfile-Dump pro äußerstem Span in `profiles/`
+
+Ausgeschaltet kostet ein Span nur einen Funktionsaufruf. Auswertung mit
+`python tools/perf_report.py`.
+"""
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+PERF_ENV = "TRAINEEMANAGER_PERF"
+PERF_CONFIG_KEY = "performance_log"
+LOG_FILE_NAME = "perf.log"
+PROFILE_FOLDER_NAME = "profiles"
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+MODE_OFF = None
+MODE_SPANS = "spans"
+MODE_PROFILE = "profile"
+
+_mode = ...  # ... = noch nicht ermittelt
+_logger = None
+_setup_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_perf_folder():
+    """Ordner für Log und Profile (Konfigurationsordner des TraineeManagers)."""
+    from core.trainee_manager import TraineeManager  # Spät importieren, trainee_manager nutzt selbst dieses Modul
+    return TraineeManager.CONFIG_DIR
+
+
+def parse_mode(value):
+    """Wandelt den Wert aus Umgebung/Konfiguration in einen Modus um."""
+    if value in (None, False, "", "0", "false", "False", "off"):
+        return MODE_OFF
+    if str(value).lower() == MODE_PROFILE:
+        return MODE_PROFILE
+    return MODE_SPANS
+
+
+def read_config_mode():
+    """Liest `performance_log` aus `config.json` (ohne einen `TraineeManager` anzulegen)."""
+    try:
+        with open(os.path.join(get_perf_folder(), "config.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get(PERF_CONFIG_KEY)
+    except (OSError, json.JSONDecodeError, AttributeError, TypeError):
+        return None
+
+
+def get_mode():
+    """Gibt den aktiven Modus zurück; wird beim ersten Aufruf ermittelt und danach zwischengespeichert."""
+    global _mode
+    if _mode is ...:
+        value = os.getenv(PERF_ENV)
+        _mode = parse_mode(value if value is not None else read_config_mode())
+    return _mode
+
+
+def set_mode(mode):
+    """Setzt den Modus zur Laufzeit (z. B. für Benchmarks)."""
+    global _mode
+    _mode = mode
+
+
+def is_enabled():
+    """True, wenn Spans aufgezeichnet werden."""
+    return get_mode() is not MODE_OFF
+
+
+def get_logger():
+    """Richtet beim ersten Aufruf den rotierenden JSON-Lines-Logger ein."""
+    global _logger
+    if _logger is None:
+        with _setup_lock:
+            if _logger is None:
+                folder = get_perf_folder()
+                os.makedirs(folder, exist_ok=True)
+                handler = RotatingFileHandler(os.path.join(folder, LOG_FILE_NAME), maxBytes=MAX_LOG_BYTES,
+                                              backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("traineemanager.perf")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+def record(name, duration_ms, **fields):
+    """Schreibt einen Messwert als JSON-Zeile ins Performance-Log."""
+    entry = {"ts": round(time.time(), 3), "span": name, "ms": round(duration_ms, 3),
+             "thread": threading.current_thread().name}
+    entry.update(fields)
+    try:
+        get_logger().info(json.dumps(entry, ensure_ascii=False, default=str))
+    except OSError as e:
+        print(f"⚠️ Performance-Log konnte nicht geschrieben werden: {e}")
+
+
+@contextmanager
+def span(name, **fields):
+    """Misst die Dauer des Blocks und schreibt sie ins Performance-Log (falls aktiviert)."""
+    mode = get_mode()
+    if mode is MODE_OFF:
+        yield
+        return
+
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    profiler = start_profiler() if mode == MODE_PROFILE and depth == 0 else None
+    error = None
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _local.depth = depth
+        if profiler:
+            dump_profile(profiler, name)
+        if error:
+            fields["error"] = error
+        record(name, duration_ms, **fields)
+
+
+def timed(name=None):
+    """Decorator-Variante von `span`; ohne Namen wird `Modul.Funktion` verwendet."""
+    def decorator(function):
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_profiler():
+    """Startet cProfile für den aktuellen Span (None, falls schon ein Profiler läuft)."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None  # Ab Python 3.12 darf nur ein Profiler gleichzeitig aktiv sein
+    return profiler
+
+
+def dump_profile(profiler, name):
+    """Beendet cProfile und speichert das Ergebnis unter `profiles/<span>-<zeit>.prof`."""
+    profiler.disable()
+    folder = os.path.join(get_perf_folder(), PROFILE_FOLDER_NAME)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        file_name = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{threading.get_ident()}.prof"
+        profiler.dump_stats(os.path.join(folder, file_name))
+    except OSError as e:
+        print(f"⚠️ Profil konnte nicht gespeichert werden: {e}")
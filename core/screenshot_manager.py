@@ -1,68 +1,272 @@
 import json
 import os
+import queue
 import shutil
 import subprocess
+import threading
 import time
+from PyQt5.QtCore import QObject, pyqtSignal
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from core.trainee_manager import TraineeManager
+from core.file_utils import atomic_write_json, atomic_write_text
+from core.fulltext_index import get_fulltext_index
+from core.perf import timed
+from core.trainee_manager import get_trainee_manager
+
+
+def wait_for_write_completion(file_path, stable_interval=0.2, timeout=30.0, max_backoff=1.0, stop_event=None):
+    """Wartet, bis eine Datei fertig geschrieben ist.
+
+    Eine Datei gilt als fertig, wenn Größe und mtime über `stable_interval` gleich
+    bleiben und sie sich exklusiv öffnen lässt. Zwischen den Prüfungen wird mit
+    wachsendem Abstand (bis `max_backoff`) gewartet. Gibt False zurück, wenn die Datei
+    verschwindet, `timeout` überschritten oder `stop_event` gesetzt wird.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    last_state = None
+    stable_since = None
+
+    while time.monotonic() < deadline:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+
+        state = (stat.st_size, stat.st_mtime_ns)
+        now = time.monotonic()
+        if state != last_state or stat.st_size == 0:
+            last_state = state
+            stable_since = now
+        elif now - stable_since >= stable_interval and is_file_unlocked(file_path):
+            return True
+
+        if stop_event:
+            if stop_event.wait(delay):
+                return False
+        else:
+            time.sleep(delay)
+        delay = min(delay * 2, max_backoff)
+
+    return False
+
+
+def is_file_unlocked(file_path):
+    """Prüft, ob die Datei nicht mehr von einem anderen Prozess zum Schreiben geöffnet ist."""
+    try:
+        # Unter Windows schlägt das Öffnen im Schreibmodus fehl, solange der Schreiber die Datei hält
+        with open(file_path, "ab"):
+            return True
+    except OSError:
+        return False
+
+
+class ScreenshotEventBridge(QObject):
+    """Leitet Screenshot-Ereignisse aus Hintergrund-Threads in den Qt-Event-Loop.
+
+    Das Objekt lebt im GUI-Thread; Signale, die aus Watchdog- oder Worker-Threads
+    gesendet werden, stellt Qt daher automatisch als Queued-Connection zu.
+    """
+
+    screenshot_moved = pyqtSignal(str)
 
 
 class ScreenshotHandler(FileSystemEventHandler):
-    """Watchdog Event-Handler, der neue Screenshots erkennt und verschiebt."""
+    """Watchdog Event-Handler, der neue Screenshots erkennt und verschiebt.
+
+    Der Observer-Thread legt neue Dateien nur in eine Warteschlange; kleine
+    Worker-Threads warten das Schreibende ab, verschieben die Dateien parallel und
+    melden sie über die `ScreenshotEventBridge` an die GUI.
+    """
 
+    WORKER_COUNT = 4
+    STOP_TIMEOUT = 2.0  # Höchstens so lange blockiert `stop_workers` (läuft beim Schließen im GUI-Thread)
 
-    def __init__(self, trainee_name, training_name, training_window, gui_callback=None):
+    def __init__(self, trainee_name, training_name, event_bridge, trainee_manager=None):
         self.screenshot_source = os.path.expanduser("~/Pictures/Screenshots")  # Standard-Screenshot-Ordner
         
-        self.trainee_manager = TraineeManager()
-        self.training_window = training_window
+        self.trainee_manager = trainee_manager or get_trainee_manager()
         self.training_folder = os.path.join(self.trainee_manager.get_training_folder(trainee_name, training_name), "screenshots")
         os.makedirs(self.training_folder, exist_ok=True)
-        self.gui_callback = gui_callback 
-    
+        self.event_bridge = event_bridge
+
+        self.pending = queue.Queue()
+        self.workers = []
+        self.stop_event = threading.Event()
+
+    def start_workers(self):
+        """Startet die Worker-Threads, die Screenshots verschieben."""
+        # Neue Warteschlange & neues Stopp-Signal: noch auslaufende Worker eines früheren Starts bleiben beim alten
+        self.pending = queue.Queue()
+        self.stop_event = threading.Event()
+        for _ in range(self.WORKER_COUNT):
+            worker = threading.Thread(target=self.process_queue, args=(self.pending, self.stop_event), daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def stop_workers(self, timeout=None):
+        """Beendet die Worker, ohne die restliche Warteschlange abzuarbeiten.
+
+        Noch nicht verschobene Screenshots bleiben im Screenshot-Ordner liegen. Worker,
+        die gerade auf das Schreibende warten, brechen sofort ab; ein laufendes
+        Verschieben wird noch beendet. Gewartet wird höchstens `timeout` Sekunden.
+        """
+        self.stop_event.set()
+        dropped = 0
+        while True:
+            try:
+                if self.pending.get_nowait() is not None:
+                    dropped += 1
+            except queue.Empty:
+                break
+        if dropped:
+            print(f"⏹️ {dropped} Screenshot(s) nicht verschoben, sie bleiben im Screenshot-Ordner.")
+
+        for _ in self.workers:
+            self.pending.put(None)
+        deadline = time.monotonic() + (self.STOP_TIMEOUT if timeout is None else timeout)
+        for worker in self.workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+        self.workers = [worker for worker in self.workers if worker.is_alive()]
+        if self.workers:
+            print(f"⚠️ {len(self.workers)} Screenshot-Worker noch beschäftigt, werden im Hintergrund beendet.")
+            self.workers = []
+        return dropped
+
     def on_created(self, event):
-        """Wird aufgerufen, wenn eine neue Datei erstellt wird."""
+        """Wird aufgerufen, wenn eine neue Datei erstellt wird (blockiert den Observer nicht)."""
         if event.is_directory:
             return
 
         file_path = event.src_path
         if file_path.lower().endswith(".png"):
-            self.move_screenshot(file_path)
+            self.pending.put(file_path)
+
+    def process_queue(self, pending, stop_event):
+        """Arbeitet die Warteschlange ab, bis ein `None` kommt oder `stop_event` gesetzt ist."""
+        while True:
+            file_path = pending.get()
+            if file_path is None or stop_event.is_set():
+                return
+
+            if wait_for_write_completion(file_path, stop_event=stop_event):
+                self.move_screenshot(file_path)
+            elif not stop_event.is_set():
+                print(f"⚠️ Screenshot wurde nicht fertig geschrieben: {os.path.basename(file_path)}")
 
+    @timed("screenshot_manager.move_screenshot")
     def move_screenshot(self, file_path):
         """Verschiebt den Screenshot in den aktuellen Trainingsordner."""
         filename = os.path.basename(file_path).replace(" ", "_")
         new_path = os.path.join(self.training_folder, filename)
 
-        time.sleep(0.5)
         try:
             shutil.move(file_path, new_path)
             print(f"✅ Screenshot verschoben: {filename}")
-            
-            # Falls GUI vorhanden ist, aktualisiere sie
-            if self.gui_callback:
-                self.gui_callback()
 
-            time.sleep(0.5)
-            self.training_window.on_new_screenshot_detected(new_path)
+            # GUI-Aktualisierung läuft über den Qt-Event-Loop, nicht in diesem Thread
+            self.event_bridge.screenshot_moved.emit(new_path)
 
         except Exception as e:
             print(f"⚠️ Fehler beim Verschieben von {filename}: {e}")
 
+class CommentStore:
+    """Hält die Screenshot-Bemerkungen im Speicher und schreibt `comments.json` verzögert.
+
+    Änderungen markieren den Speicher als "dirty"; mehrere Änderungen innerhalb von
+    `flush_delay` Sekunden werden zu einem einzigen, atomaren Schreibvorgang
+    zusammengefasst. `flush()` schreibt sofort (z. B. vor dem Upload oder beim Schließen).
+    """
+
+    def __init__(self, comments_file, flush_delay=0.5, on_flushed=None, on_changed=None):
+        self.comments_file = comments_file
+        self.flush_delay = flush_delay
+        self.on_flushed = on_flushed
+        self.on_changed = on_changed  # erhält nur die tatsächlich geänderten Bemerkungen (z. B. für den Live-Abgleich)
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self.comments = self.load()
+
+    def load(self):
+        """Liest `comments.json` einmalig ein."""
+        if not os.path.exists(self.comments_file):
+            return {}
+
+        try:
+            with open(self.comments_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Bemerkungen konnten nicht gelesen werden: {e}")
+            return {}
+
+    def get_all(self):
+        """Gibt eine Kopie aller Bemerkungen zurück."""
+        with self._lock:
+            return dict(self.comments)
+
+    def set(self, screenshot_name, comment):
+        """Setzt eine einzelne Bemerkung."""
+        self.update({screenshot_name: comment})
+
+    def update(self, comments):
+        """Setzt mehrere Bemerkungen auf einmal; geschrieben wird höchstens einmal."""
+        with self._lock:
+            changed = {name: comment for name, comment in comments.items() if self.comments.get(name) != comment}
+            if not changed:
+                return
+            self.comments.update(changed)
+            self._dirty = True
+            self.schedule_flush()
+
+        if self.on_changed:
+            self.on_changed(changed)
+
+    def schedule_flush(self):
+        """Plant einen Schreibvorgang ein, falls nicht schon einer aussteht."""
+        with self._lock:
+            if self._timer:
+                return
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Schreibt ausstehende Änderungen sofort und atomar nach `comments.json`."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            atomic_write_json(self.comments_file, self.comments)
+            self._dirty = False
+
+        if self.on_flushed:
+            self.on_flushed()
+
+
 class ScreenshotManager:
     """Verwaltet Screenshots & überwacht den Screenshot-Ordner."""
 
-    def __init__(self, trainee_name, training_name, training_window, gui_callback=None):
-        self.trainee_manager = TraineeManager()
+    def __init__(self, trainee_name, training_name, training_window, gui_callback=None, trainee_manager=None):
+        self.trainee_manager = trainee_manager or get_trainee_manager()
         self.training_folder = self.trainee_manager.get_training_folder(trainee_name, training_name)
         os.makedirs(self.training_folder, exist_ok=True)
-        self.event_handler = ScreenshotHandler(trainee_name, training_name, training_window, gui_callback)
+        self.comment_store = CommentStore(os.path.join(self.training_folder, "comments.json"), on_flushed=self.update_fulltext_index)
+
+        self.event_bridge = ScreenshotEventBridge()
+        if gui_callback:
+            self.event_bridge.screenshot_moved.connect(gui_callback)
+        self.event_bridge.screenshot_moved.connect(training_window.on_new_screenshot_detected)
+
+        self.event_handler = ScreenshotHandler(trainee_name, training_name, self.event_bridge, self.trainee_manager)
         self.observer = Observer()
 
     def start_watching(self):
         """Startet die Überwachung des Screenshot-Ordners."""
+        self.event_handler.start_workers()
         self.observer.schedule(self.event_handler, self.event_handler.screenshot_source, recursive=False)
         self.observer.start()
         print(f"📸 Überwachung gestartet: {self.event_handler.screenshot_source}")
@@ -73,6 +277,7 @@ class ScreenshotManager:
             self.observer.stop()
             self.observer.join()
             self.observer = None
+            self.event_handler.stop_workers()
             print("🛑 Screenshot-Überwachung gestoppt")
 
     def open_in_paint(self, screenshot_name):
@@ -91,6 +296,7 @@ class ScreenshotManager:
             print(f"🗑️ Screenshot gelöscht: {screenshot_path}")
 
 
+    @timed("screenshot_manager.get_screenshots")
     def get_screenshots(self):
         """Gibt eine Liste aller Screenshots im Trainingsordner zurück."""
         screenshots_path = os.path.join(self.training_folder, "screenshots")
@@ -108,33 +314,27 @@ class ScreenshotManager:
 
 
     def save_screenshot_comment(self, screenshot_name, comment):
-        """Speichert die Bemerkung zu einem Screenshot."""
-        comments_file = os.path.join(self.training_folder, "comments.json")
-
-        # Falls Datei nicht existiert, erstelle eine leere JSON-Struktur
-        if not os.path.exists(comments_file):
-            with open(comments_file, "w") as f:
-                json.dump({}, f)
-
-        with open(comments_file, "r+", encoding="utf-8") as f:
-            comments = json.load(f)
-            comments[screenshot_name.replace(" ", "_")] = comment
-            f.seek(0)
-            json.dump(comments, f, indent=4)
-            f.truncate()
-    
-    def load_all_comments(self):
-        """Lädt alle Bemerkungen aus `comments.json`."""
-        comments_file = os.path.join(self.training_folder, "comments.json")
+        """Speichert die Bemerkung zu einem Screenshot (verzögert geschrieben)."""
+        self.comment_store.set(screenshot_name.replace(" ", "_"), comment)
 
-        if not os.path.exists(comments_file):
-            return {}
+    def save_screenshot_comments(self, comments):
+        """Speichert mehrere Bemerkungen auf einmal (verzögert geschrieben)."""
+        self.comment_store.update({name.replace(" ", "_"): comment for name, comment in comments.items()})
 
-        with open(comments_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def flush_comments(self):
+        """Schreibt ausstehende Bemerkungen sofort nach `comments.json`."""
+        self.comment_store.flush()
+    
+    def load_all_comments(self):
+        """Gibt alle Bemerkungen aus dem Speicher zurück."""
+        return self.comment_store.get_all()
     
     def save_general_notes(self, generalNotes):
         """Speichert die allgemeinen Notizen."""
         notes_file = os.path.join(self.training_folder, "notes.txt")
-        with open(notes_file, "w", encoding="utf-8") as f:
-            f.write(generalNotes.toPlainText())
+        atomic_write_text(notes_file, generalNotes.toPlainText())
+        self.update_fulltext_index()
+
+    def update_fulltext_index(self):
+        """Aktualisiert den Volltextindex für dieses Training."""
+        get_fulltext_index().update_training_folder(self.training_folder)
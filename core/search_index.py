@@ -0,0 +1,148 @@
+import re
+import threading
+from collections import defaultdict
+
+
+def trigrams(text):
+    """Zerlegt einen Text in seine Trigramme (mit Leerzeichen-Rand für Wortanfänge)."""
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Vorberechneter Trigramm-Index für die unscharfe Trainee-Suche.
+
+    Jeder Eintrag gehört zu einem Trainee und hat ein Gewicht: Trainee-Name (3),
+    Trainingsname (2). `search()` durchsucht nur diese Namen im Speicher und gibt
+    pro Trainee einen Score zurück, nach dem die Liste sortiert werden kann.
+    Notizen, Bemerkungen & Akten (1) liefert `match_content()` aus dem
+    `FulltextIndex` – eine SQLite-Abfrage, die die Oberfläche erst nach einer
+    Tipp-Pause im Hintergrund startet und mit `merge_scores()` einmischt.
+    """
+
+    NAME_WEIGHT = 3.0
+    TRAINING_WEIGHT = 2.0
+    CONTENT_WEIGHT = 1.0
+    MIN_SIMILARITY = 0.6  # Anteil der Trigramme der Suche, die im Eintrag vorkommen müssen
+
+    def __init__(self, fulltext_index=None):
+        self.fulltext_index = fulltext_index
+        self._lock = threading.Lock()
+        self.entries = []                  # Eintrag-ID → (Trainee, Gewicht, Text in Kleinbuchstaben), None = entfernt
+        self.postings = defaultdict(set)   # Trigramm → Eintrag-IDs
+        self.trainee_entries = defaultdict(list)  # Trainee → Eintrag-IDs
+        self.trainee_names = []
+
+    def add(self, trainee_name, text, weight):
+        """Fügt einen Text zum Index hinzu."""
+        if not text:
+            return
+        with self._lock:
+            entry_id = len(self.entries)
+            self.entries.append((trainee_name, weight, text.lower()))
+            self.trainee_entries[trainee_name].append(entry_id)
+            for trigram in trigrams(text):
+                self.postings[trigram].add(entry_id)
+
+    def remove(self, trainee_name, weights):
+        """Entfernt die Einträge eines Trainees mit den angegebenen Gewichten."""
+        with self._lock:
+            kept = []
+            for entry_id in self.trainee_entries.pop(trainee_name, ()):
+                _, weight, text = self.entries[entry_id]
+                if weight not in weights:
+                    kept.append(entry_id)
+                    continue
+                self.entries[entry_id] = None
+                for trigram in trigrams(text):
+                    self.postings[trigram].discard(entry_id)
+            if kept:
+                self.trainee_entries[trainee_name] = kept
+
+    def build_names(self, trainee_manager):
+        """Indiziert Trainee- und Trainingsnamen aus dem (speicherbasierten) Katalog."""
+        catalog = trainee_manager.get_catalog()
+        self.trainee_names = catalog.get_trainees()
+        for trainee_name in self.trainee_names:
+            self.add(trainee_name, trainee_name, self.NAME_WEIGHT)
+            for training_name in catalog.get_trainings(trainee_name):
+                self.add(trainee_name, training_name, self.TRAINING_WEIGHT)
+
+    def update_names(self, trainee_manager, trainee_name):
+        """Indiziert Name & Trainings eines Trainees neu (nach einer Katalogänderung).
+
+        Ist der Trainee nicht mehr im Katalog, werden alle seine Einträge entfernt.
+        """
+        catalog = trainee_manager.get_catalog()
+        exists = catalog.has_trainee(trainee_name)
+        self.remove(trainee_name, {self.NAME_WEIGHT, self.TRAINING_WEIGHT})
+
+        with self._lock:
+            trainee_names = [name for name in self.trainee_names if name != trainee_name]
+            if exists:
+                trainee_names.append(trainee_name)
+                trainee_names.sort(key=str.lower)
+            self.trainee_names = trainee_names
+        if exists:
+            self.add(trainee_name, trainee_name, self.NAME_WEIGHT)
+            for training_name in catalog.get_trainings(trainee_name):
+                self.add(trainee_name, training_name, self.TRAINING_WEIGHT)
+
+    def search(self, query):
+        """Gibt ein Dict Trainee → Score zurück; None bei leerer Suche (alles anzeigen)."""
+        query = query.strip().lower()
+        if not query:
+            return None
+
+        with self._lock:
+            if len(query) < 3:
+                # Zu kurz für Trigramme: Präfix-/Teilstring-Suche auf den Namen
+                return {name: (2.0 if name.lower().startswith(query) else 1.0)
+                        for name in self.trainee_names if query in name.lower()}
+
+            query_trigrams = trigrams(query)
+            hits = defaultdict(int)
+            for trigram in query_trigrams:
+                for entry_id in self.postings.get(trigram, ()):
+                    hits[entry_id] += 1
+
+            scores = {}
+            words = re.split(r"\s+", query)
+            for entry_id, count in hits.items():
+                similarity = count / len(query_trigrams)
+                if similarity < self.MIN_SIMILARITY:
+                    continue
+
+                trainee_name, weight, text = self.entries[entry_id]  # entfernte IDs stehen in keinem Posting mehr
+                score = similarity * weight
+                if query in text:
+                    score += weight  # Exakter Treffer
+                    if text.startswith(query):
+                        score += 0.5 * weight
+                elif all(word in text for word in words):
+                    score += 0.5 * weight
+                scores[trainee_name] = max(scores.get(trainee_name, 0.0), score)
+            return scores
+
+    def match_content(self, query):
+        """Gibt ein Dict Trainee → Score für Treffer in Notizen, Bemerkungen & Akten zurück.
+
+        Alle Wörter müssen (als Präfix) vorkommen. Fragt SQLite ab und hält dabei
+        keinen Lock des Index – für den Aufruf außerhalb des GUI-Threads gedacht.
+        """
+        query = query.strip().lower()
+        if len(query) < 3 or not self.fulltext_index:
+            return {}
+        trainee_names = set(self.trainee_names)
+        return {trainee_name: 1.5 * self.CONTENT_WEIGHT
+                for trainee_name in self.fulltext_index.match_trainees(query) if trainee_name in trainee_names}
+
+    @staticmethod
+    def merge_scores(name_scores, content_scores):
+        """Führt die Scores von `search()` und `match_content()` zusammen (höchster Score je Trainee)."""
+        if name_scores is None:
+            return None
+        scores = dict(name_scores)
+        for trainee_name, score in content_scores.items():
+            scores[trainee_name] = max(scores.get(trainee_name, 0.0), score)
+        return scores
@@ -1,32 +1,522 @@
 import re
+import hashlib
+import random
+import threading
+import time
 import uuid
+from collections import deque
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 import os
 import base64
 import json
 from datetime import datetime
 
-from core.trainee_manager import TraineeManager
+from core.file_utils import atomic_write_json
+from core.perf import span, timed
+from core.trainee_manager import get_trainee_manager
+from core.upload_journal import UploadJournal, get_upload_journal
+
+try:
+    from PIL import Image  # Optional: nur für die Bildaufbereitung vor dem Upload nötig
+except ImportError:
+    Image = None
+
+
+IMAGE_EXTENSIONS = {"png": ".png", "webp": ".webp", "jpeg": ".jpg"}
+
+# Live-Server; über die Umgebungsvariablen z. B. auf `tools/debrief_server.py` umstellbar
+DEFAULT_API_BASE_URL = "https://yschaffler.de/api/Vatsim/traineemanager/training"
+DEFAULT_VIEWER_BASE_URL = "https://yschaffler.de/vatsim/traineemanager/training"
+API_URL_ENV = "TRAINEEMANAGER_API_URL"
+VIEWER_URL_ENV = "TRAINEEMANAGER_VIEWER_URL"
+
+
+def transform_screenshot(screenshot_path, output_folder, image_format="png", quality=80, max_size=None, thumbnail_size=(320, 180)):
+    """Kodiert einen Screenshot für den Upload neu und erzeugt gleichzeitig ein Vorschaubild.
+
+    `image_format` ist "png" (verlustfrei optimiert), "webp" oder "jpeg" (verlustbehaftet
+    mit `quality`). `max_size` begrenzt die Auflösung unter Beibehaltung des
+    Seitenverhältnisses. Läuft in einem eigenen Prozess und gibt
+    (Upload-Pfad, Vorschaubild-Pfad) zurück. Bereits aktuelle Ergebnisse werden wiederverwendet;
+    jede Kombination der Einstellungen hat einen eigenen Unterordner im Cache.
+    """
+    extension = IMAGE_EXTENSIONS[image_format]
+    stem = os.path.splitext(os.path.basename(screenshot_path))[0]
+    output_folder = os.path.join(output_folder, transform_settings_key(image_format, quality, max_size, thumbnail_size))
+    upload_path = os.path.join(output_folder, stem + extension)
+    thumbnail_path = os.path.join(output_folder, stem + "_thumb" + extension)
+
+    source_mtime = os.path.getmtime(screenshot_path)
+    if all(os.path.exists(path) and os.path.getmtime(path) >= source_mtime for path in (upload_path, thumbnail_path)):
+        return upload_path, thumbnail_path
+
+    os.makedirs(output_folder, exist_ok=True)
+    with Image.open(screenshot_path) as image:
+        image.load()
+        if image_format == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        if max_size:
+            image.thumbnail(max_size, Image.LANCZOS)
+        save_image(image, upload_path, image_format, quality)
+
+        thumbnail = image.copy()
+        thumbnail.thumbnail(thumbnail_size, Image.LANCZOS)
+        save_image(thumbnail, thumbnail_path, image_format, quality)
+
+    return upload_path, thumbnail_path
+
+
+def transform_settings_key(image_format, quality, max_size, thumbnail_size):
+    """Name des Cache-Unterordners für eine Kombination von Einstellungen (z. B. `webp-q80-1920x1080-t320x180`)."""
+    size = f"{max_size[0]}x{max_size[1]}" if max_size else "orig"
+    quality = f"q{quality}" if image_format != "png" else "lossless"
+    return f"{image_format}-{quality}-{size}-t{thumbnail_size[0]}x{thumbnail_size[1]}"
+
+
+def save_image(image, path, image_format, quality):
+    """Speichert ein Bild atomar im gewünschten Format."""
+    temp_path = path + ".tmp"
+    if image_format == "png":
+        image.save(temp_path, format="PNG", optimize=True)
+    elif image_format == "webp":
+        image.save(temp_path, format="WEBP", quality=quality, method=4)
+    else:
+        image.save(temp_path, format="JPEG", quality=quality, optimize=True)
+    os.replace(temp_path, path)
+
+
+class UploadCancelled(Exception):
+    """Der Upload wurde über das Abbruch-Token beendet (zwischen zwei Blöcken)."""
+
+
+class UploadProgress:
+    """Byte-genauer Fortschritt über alle Aufträge eines Uploads, mit Durchsatz & Restzeit.
+
+    Jeder Auftrag (Trainingsdaten, Screenshot) meldet seine Größe an und zählt
+    gesendete Bytes hoch; eine Wiederholung setzt ihren Zähler zurück, damit der
+    Fortschritt nicht über 100 % läuft. Der Durchsatz wird über die letzten
+    `RATE_WINDOW` Sekunden gemittelt. Gleichzeitig ist das Objekt das Abbruch-Token:
+    `check_cancelled()` wird zwischen den Blöcken eines Uploads aufgerufen.
+
+    `on_update(progress)` wird höchstens alle `update_interval` Sekunden aufgerufen
+    (aus dem Upload-Thread).
+    """
+
+    RATE_WINDOW = 5.0
+
+    def __init__(self, cancel_event=None, on_update=None, update_interval=0.1):
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_update = on_update
+        self.update_interval = update_interval
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._sent = {}
+        self._samples = deque()
+        self._last_update = 0.0
+
+    def add_job(self, key, size):
+        """Meldet einen Auftrag mit seiner (geschätzten) Größe an; bekannte Aufträge bleiben unverändert."""
+        with self._lock:
+            self._sizes.setdefault(key, size)
+            self._sent.setdefault(key, 0)
+
+    def set_size(self, key, size):
+        """Korrigiert die Größe, sobald der tatsächliche Body feststeht."""
+        with self._lock:
+            self._sizes[key] = size
+            self._sent.setdefault(key, 0)
+
+    def reset(self, key):
+        """Neuer Versuch: bisher gezählte Bytes dieses Auftrags verwerfen."""
+        with self._lock:
+            self._sent[key] = 0
+
+    def advance(self, key, sent_bytes):
+        """Zählt gesendete Bytes eines Auftrags hoch."""
+        with self._lock:
+            self._sent[key] = min(self._sent.get(key, 0) + sent_bytes, self._sizes.get(key, 0))
+        self.notify()
+
+    def finish(self, key):
+        """Auftrag vollständig übertragen (auch wenn er übersprungen wurde)."""
+        with self._lock:
+            self._sent[key] = self._sizes.get(key, 0)
+        self.notify(force=True)
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise UploadCancelled("Upload abgebrochen")
+
+    @property
+    def sent_bytes(self):
+        with self._lock:
+            return sum(self._sent.values())
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def snapshot(self):
+        """Gibt (gesendet, gesamt, Bytes pro Sekunde, Restzeit in Sekunden oder None) zurück."""
+        now = time.monotonic()
+        with self._lock:
+            sent, total = sum(self._sent.values()), sum(self._sizes.values())
+            self._samples.append((now, sent))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.RATE_WINDOW:
+                self._samples.popleft()
+            first_time, first_sent = self._samples[0]
+        rate = (sent - first_sent) / (now - first_time) if now > first_time else 0.0
+        eta = (total - sent) / rate if rate > 0 else None
+        return sent, total, rate, eta
+
+    def percent(self):
+        sent, total = self.sent_bytes, self.total_bytes
+        return int(sent * 100 / total) if total else 0
+
+    def format(self):
+        """Kurzer Text für die Anzeige: übertragene Menge, Durchsatz & Restzeit."""
+        sent, total, rate, eta = self.snapshot()
+        text = f"{sent / 1e6:.1f} von {total / 1e6:.1f} MB · {rate / 1e6:.1f} MB/s"
+        if eta is not None and sent < total:
+            text += f" · noch ca. {eta:.0f} s"
+        return text
+
+    def notify(self, force=False):
+        if not self.on_update:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_update < self.update_interval:
+                return
+            self._last_update = now
+        self.on_update(self)
+
+
+class MultipartFileStream:
+    """multipart/form-data-Body, der Dateien blockweise direkt vom Datei-Handle liest.
+
+    `requests` erkennt das Objekt über `__iter__`/`__len__` als Stream mit fester
+    Länge und sendet es mit `Content-Length`, ohne den Body im Speicher aufzubauen.
+    Mit `progress` wird jeder gelesene Block als gesendet gezählt und vor jedem
+    Block das Abbruch-Token geprüft.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, fields, files, progress=None, progress_key=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+
+        # Teile sind entweder fertige Bytes oder Dateipfade, die erst beim Senden gelesen werden
+        self._parts = []
+        for name, value in fields.items():
+            header = f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            self._parts.append(header.encode("utf-8") + str(value).encode("utf-8") + b"\r\n")
+        for field_name, filename, path in files:
+            header = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+                f"Content-Type: {self.guess_content_type(filename)}\r\n\r\n"
+            )
+            self._parts.append(header.encode("utf-8"))
+            self._parts.append(path)
+            self._parts.append(b"\r\n")
+        self._parts.append(f"--{self.boundary}--\r\n".encode("utf-8"))
+
+        self.length = sum(len(part) if isinstance(part, bytes) else os.path.getsize(part) for part in self._parts)
+        self._chunks = self._generate_chunks()
+        self._buffer = b""
+
+        self.progress = progress
+        self.progress_key = progress_key
+        if progress:
+            progress.set_size(progress_key, self.length)
+            progress.reset(progress_key)
+
+    @staticmethod
+    def guess_content_type(filename):
+        """Bestimmt den MIME-Typ anhand der Dateiendung."""
+        extension = os.path.splitext(filename)[1].lower()
+        return {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}.get(
+            extension, "application/octet-stream"
+        )
+
+    def _generate_chunks(self):
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            with open(part, "rb") as file:
+                while True:
+                    chunk = file.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+
+    def read(self, size=-1):
+        """Liefert die nächsten `size` Bytes des Bodys (wird von http.client blockweise aufgerufen)."""
+        if self.progress:
+            self.progress.check_cancelled()
+
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._chunks)
+            self._buffer = b""
+        else:
+            while len(self._buffer) < size:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        if self.progress and data:
+            self.progress.advance(self.progress_key, len(data))
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def __len__(self):
+        return self.length
+
+
+class UploadManifest:
+    """Merkt sich pro Training, welche Screenshots (Dateiname & Inhalt) bereits hochgeladen wurden.
+
+    Die Datei `upload_manifest.json` liegt neben `comments.json` und enthält die
+    Training-ID, einen Hash-Cache (Dateiname → Größe, mtime, SHA-256) und den
+    Serverstatus je Dateiname (mit dem Hash des hochgeladenen Inhalts). Der Server
+    speichert Screenshots unter ihrem Namen; inhaltsgleiche Screenshots mit
+    verschiedenen Namen werden daher jeweils hochgeladen.
+    """
+
+    FILE_NAME = "upload_manifest.json"
+
+    def __init__(self, training_folder):
+        self.path = os.path.join(training_folder, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.training_id = None
+        self.files = {}
+        self.uploaded = {}
+        self.load()
+
+    def load(self):
+        """Lädt das Manifest (neu), falls vorhanden; sonst beginnt es leer."""
+        self.training_id = None
+        self.files = {}
+        self.uploaded = {}
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Upload-Manifest konnte nicht gelesen werden, starte neu: {e}")
+            return
+
+        self.training_id = data.get("training_id")
+        self.files = data.get("files", {})
+        self.uploaded = data.get("uploaded", {})
+
+    def save(self):
+        """Schreibt das Manifest atomar (temporäre Datei + Umbenennen)."""
+        with self._lock:
+            data = {"training_id": self.training_id, "files": self.files, "uploaded": self.uploaded}
+            atomic_write_json(self.path, data)
+
+    def file_hash(self, screenshot_name, screenshot_path):
+        """Gibt den SHA-256 der Datei zurück; unveränderte Dateien werden nicht erneut gelesen."""
+        stat = os.stat(screenshot_path)
+        with self._lock:
+            cached = self.files.get(screenshot_name)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            return cached["hash"]
+
+        sha256 = hashlib.sha256()
+        with open(screenshot_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+
+        file_hash = sha256.hexdigest()
+        with self._lock:
+            self.files[screenshot_name] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": file_hash}
+        return file_hash
+
+    def ensure_training_id(self):
+        """Gibt die Training-ID zurück und legt beim ersten Upload eine neue an."""
+        with self._lock:
+            created = not self.training_id
+            if created:
+                self.training_id = str(uuid.uuid4())
+        if created:
+            self.save()
+        return self.training_id
+
+    def is_uploaded(self, screenshot_name, file_hash):
+        """Prüft, ob dieser Screenshot mit genau diesem Inhalt bereits auf dem Server liegt."""
+        with self._lock:
+            entry = self.uploaded.get(screenshot_name, {})
+        return entry.get("hash") == file_hash and entry.get("status") == "uploaded"
+
+    def mark_uploaded(self, screenshot_name, file_hash):
+        """Vermerkt einen erfolgreichen Upload und speichert das Manifest."""
+        with self._lock:
+            self.uploaded[screenshot_name] = {"hash": file_hash, "status": "uploaded"}
+        self.save()
+
+
+_shared_manifests = {}
+_shared_manifests_lock = threading.Lock()
+
+
+def get_upload_manifest(training_folder):
+    """Gibt das prozessweite Manifest eines Trainings zurück (wie `get_upload_journal`).
+
+    So überschreiben sich z. B. der Uploader, der ausstehende Aufträge fortsetzt, und
+    der des Debriefs nicht gegenseitig ihre `uploaded`-Einträge.
+    """
+    key = os.path.normcase(os.path.abspath(training_folder))
+    with _shared_manifests_lock:
+        if key not in _shared_manifests:
+            _shared_manifests[key] = UploadManifest(training_folder)
+        return _shared_manifests[key]
+
+
+class UploadMetrics:
+    """Thread-sichere Zähler für Anfragen, Wiederholungen und Latenz (für das Fortschrittsfenster)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.latencies_ms = []
+
+    def record_request(self, latency_ms, success):
+        with self._lock:
+            self.requests += 1
+            self.latencies_ms.append(latency_ms)
+            if not success:
+                self.failures += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def summary(self):
+        """Gibt die Kennzahlen als Dict zurück (Latenz-Perzentile in ms)."""
+        with self._lock:
+            latencies = sorted(self.latencies_ms)
+            summary = {"requests": self.requests, "retries": self.retries, "failures": self.failures,
+                       "p50_ms": None, "p95_ms": None}
+        if latencies:
+            summary["p50_ms"] = latencies[(len(latencies) - 1) // 2]
+            summary["p95_ms"] = latencies[max(int(len(latencies) * 0.95 + 0.5) - 1, 0)]
+        return summary
+
+    def format(self):
+        """Kurzer Text für die Anzeige im Fortschrittsfenster."""
+        summary = self.summary()
+        text = f"Anfragen: {summary['requests']} · Wiederholungen: {summary['retries']} · Fehler: {summary['failures']}"
+        if summary["p50_ms"] is not None:
+            text += f" · Latenz p50 {summary['p50_ms']:.0f} ms / p95 {summary['p95_ms']:.0f} ms"
+        return text
+
 
 class ServerUploader:
-    """Hochladen von Trainingsdaten & Screenshots auf den Server."""
+    """Hochladen von Trainingsdaten & Screenshots auf den Server.
+
+    Nicht übergebene Einstellungen kommen aus dem Abschnitt `upload` in `config.json`:
+
+        "upload": {"workers": 4, "image_format": "webp", "image_quality": 80,
+                   "max_image_size": [1920, 1080], "thumbnail_size": [320, 180]}
+
+    Ohne `image_format` werden Screenshots unverändert hochgeladen.
+    """
 
-    def __init__(self, trainee_name, training_name, training_date, api_base_url="https://yschaffler.de/api/Vatsim/traineemanager/training"):
-        self.training_id = str(uuid.uuid4())
-        self.api_base_url = api_base_url
+    UPLOAD_MODE_MULTIPART = "multipart"
+    UPLOAD_MODE_JSON = "json"
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+    CONFIG_KEY = "upload"
+
+    def __init__(self, trainee_name, training_name, training_date, api_base_url=None, upload_mode=UPLOAD_MODE_MULTIPART, max_workers=None,
+                 image_format=None, image_quality=None, max_image_size=None, thumbnail_size=None, trainee_manager=None,
+                 viewer_base_url=None, connect_timeout=5.0, read_timeout=60.0, max_retries=4, backoff_base=0.5, backoff_max=15.0):
+        self.trainee_manager = trainee_manager or get_trainee_manager()
+        config = self.trainee_manager.get_config_value(self.CONFIG_KEY, {})
+        if not isinstance(config, dict):
+            print(f"⚠️ Ungültiger Abschnitt '{self.CONFIG_KEY}' in config.json, verwende Standardwerte.")
+            config = {}
+
+        self.api_base_url = (api_base_url or os.getenv(API_URL_ENV) or DEFAULT_API_BASE_URL).rstrip("/")
+        self.viewer_base_url = (viewer_base_url or os.getenv(VIEWER_URL_ENV) or DEFAULT_VIEWER_BASE_URL).rstrip("/")
+        self.upload_mode = upload_mode
+        self._upload_mode_lock = threading.Lock()  # Upload-Worker lesen & wechseln den Modus gleichzeitig
+        self.max_workers = max(1, int(max_workers or config.get("workers", 4)))
+
+        # Zeitlimits (Verbindungsaufbau, Antwort) und Wiederholungen bei 5xx/Verbindungsfehlern
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = UploadMetrics()
+
+        # Optionale Bildaufbereitung: None = Screenshots unverändert hochladen
+        image_format = image_format or config.get("image_format")
+        if image_format and image_format not in IMAGE_EXTENSIONS:
+            print(f"⚠️ Unbekanntes Bildformat '{image_format}', Screenshots werden unverändert hochgeladen.")
+            image_format = None
+        if image_format and Image is None:
+            print("⚠️ Pillow ist nicht installiert, Screenshots werden unverändert hochgeladen.")
+            image_format = None
+        max_image_size = max_image_size or config.get("max_image_size")
+        self.image_format = image_format
+        self.image_quality = int(image_quality or config.get("image_quality", 80))
+        self.max_image_size = tuple(max_image_size) if max_image_size else None
+        self.thumbnail_size = tuple(thumbnail_size or config.get("thumbnail_size", (320, 180)))
+        self.prepared = {}  # Screenshot-Name → (Upload-Pfad, Vorschaubild-Pfad) aus `prepare_screenshots`
+        self.on_screenshot_uploaded = None  # optional: erhält den Namen jedes neu hochgeladenen Screenshots (im Upload-Thread)
         self.training_name = training_name
         self.trainee_name = trainee_name
         self.date = training_date
 
+        self.training_folder = self.trainee_manager.get_training_folder(trainee_name, training_name)
+        self.upload_cache_folder = os.path.join(self.training_folder, "upload_cache")
+
+        # Bestehendes Debrief fortsetzen: Training-ID aus dem Manifest übernehmen
+        self.manifest = get_upload_manifest(self.training_folder)
+        self.training_id = self.manifest.ensure_training_id()
+
+        # Ausstehende Uploads, auch aus früheren Sitzungen
+        self.journal = get_upload_journal(self.training_folder)
+
         print(self.training_id)
         print(self.training_name)
-        self.trainee_manager = TraineeManager()
-        
-        self.training_folder = self.trainee_manager.get_training_folder(trainee_name, training_name)
 
+        # Eine gemeinsame Session mit Keep-Alive-Pool für alle Upload-Worker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def upload_training_data(self):
-        """Lädt alle Trainingsdaten auf den Server hoch."""
+
+    @timed("upload.training_data")
+    def upload_training_data(self, progress=None):
+        """Lädt alle Trainingsdaten auf den Server hoch.
+
+        Gibt True bei Erfolg, False bei Ablehnung durch den Server und None bei einem
+        vorübergehenden Fehler (offline, Zeitüberschreitung, 5xx, Abbruch) zurück.
+        `progress` ist ein `UploadProgress` (Fortschritt & Abbruch-Token).
+        """
         url = f"{self.api_base_url}/v2/{self.training_id}/upload"
         print(self.training_folder)
         # Notizen & Screenshot-Bemerkungen sammeln
@@ -48,50 +538,365 @@ class ServerUploader:
             "screenshot_comments": screenshot_comments
         }
 
+        body = json.dumps(data).encode("utf-8")
+        if progress:
+            progress.set_size(UploadJournal.KIND_TRAINING_DATA, len(body))
+
         try:
-            response = requests.post(url, json=data)
+            response = self.post_with_retry("Trainingsdaten", lambda: self.session.post(
+                url, data=body, headers={"Content-Type": "application/json"}, timeout=self.timeout), progress)
             if response.status_code == 200:
+                if progress:
+                    progress.finish(UploadJournal.KIND_TRAINING_DATA)
                 print("✅ Trainingsdaten erfolgreich hochgeladen!")
-            else:
-                print(f"⚠️ Fehler beim Hochladen der Trainingsdaten: {response.status_code} - {response.text}")
+                return True
+            print(f"⚠️ Fehler beim Hochladen der Trainingsdaten: {response.status_code} - {response.text}")
+            return self.failure_result(response)
+        except UploadCancelled:
+            print("⏹️ Upload der Trainingsdaten abgebrochen.")
+            return None
         except Exception as e:
             print(f"❌ Fehler beim Hochladen der Trainingsdaten: {e}")
+            return self.failure_result(error=e)
 
-    def upload_screenshots(self):
-        """Lädt Screenshots als Base64-kodierte Daten auf den Server hoch."""
-        url = f"{self.api_base_url}/{self.training_id}/upload"
+    def get_screenshot_files(self):
+        """Gibt alle hochzuladenden Screenshots als Liste von (Name, Pfad) zurück."""
         screenshots_path = os.path.join(self.training_folder, "screenshots")
-        print(screenshots_path)
-
         if not os.path.exists(screenshots_path):
-            print("⚠️ Keine Screenshots zum Hochladen gefunden.")
-            return
+            return []
 
+        files = []
         for screenshot in os.listdir(screenshots_path):
             screenshot_path = os.path.join(screenshots_path, screenshot)
-            if not os.path.isfile(screenshot_path):
-                continue
+            if os.path.isfile(screenshot_path):
+                files.append((screenshot, screenshot_path))
+        return files
 
-            with open(screenshot_path, "rb") as file:
-                encoded_string = base64.b64encode(file.read()).decode("utf-8")  # Base64-Kodierung
+    def upload_screenshots(self, files=None, progress_callback=None, cancel_event=None, progress=None):
+        """Trägt Screenshots ins Upload-Journal ein und arbeitet das Journal ab (siehe `drain`).
 
-            payload = {
-                "file": encoded_string,
-                "filename": screenshot
-            }
+        `progress_callback(done, total, screenshot_name, success)` wird nach jedem Auftrag
+        aufgerufen; bereits hochgeladene Screenshots zählen als erledigt. `progress`
+        wie bei `drain`. Gibt wie `drain` (erledigt, fehlgeschlagen, noch ausstehend) zurück.
+        """
+        if files is None:
+            files = self.get_screenshot_files()
 
-            response = requests.post(url, json=payload)
+        if not files and not self.journal.pending():
+            print("⚠️ Keine Screenshots zum Hochladen gefunden.")
+            return 0, 0, 0
 
-            if response.status_code == 200:
-                print(f"✅ Screenshot hochgeladen: {screenshot}")
+        pending = self.filter_pending_screenshots(files)
+        skipped = len(files) - len(pending)
+        if skipped:
+            print(f"⏭️ {skipped} Screenshot(s) bereits hochgeladen, werden übersprungen.")
+
+        self.prepared.update(self.prepare_screenshots(pending))  # Werden von `run_job` direkt verwendet
+        for screenshot_name, screenshot_path in pending:
+            self.journal.enqueue_screenshot(screenshot_name, screenshot_path)
+
+        def on_job_done(done, total, name, success):
+            if progress_callback:
+                progress_callback(done + skipped, total + skipped, name, success)
+
+        if skipped:
+            on_job_done(0, len(self.journal.pending()), "", True)
+        return self.drain(cancel_event, on_job_done, progress)
+
+    def drain(self, cancel_event=None, progress_callback=None, progress=None):
+        """Arbeitet das Upload-Journal mit höchstens `max_workers` gleichzeitigen Aufträgen ab.
+
+        Neue Aufträge werden erst gestartet, wenn ein Platz frei wird; auch Einträge,
+        die während des Abarbeitens hinzukommen, werden mitgenommen. Lehnt der Server
+        einen Auftrag ab, wird der Fehlversuch vermerkt und mit den übrigen Aufträgen
+        weitergemacht (jeder Auftrag läuft pro Aufruf höchstens einmal). Erst ein
+        vorübergehender Fehlschlag (alle Wiederholungen erfolglos, z. B. offline)
+        verhindert neue Starts. Wird `cancel_event` gesetzt, brechen auch laufende
+        Uploads zwischen zwei Blöcken ab (die Verbindung wird geschlossen). Nicht
+        erledigte Aufträge bleiben im Journal und werden beim nächsten Aufruf fortgesetzt.
+
+        `progress` (ein `UploadProgress`) zählt die übertragenen Bytes aller Aufträge;
+        ohne Angabe wird ein eigenes mit `cancel_event` als Abbruch-Token angelegt.
+
+        Gibt (erledigt, fehlgeschlagen, noch ausstehend) zurück.
+        """
+        progress = progress or UploadProgress(cancel_event)
+        cancel_event = progress.cancel_event
+        for job in self.journal.pending():
+            progress.add_job(job["id"], self.estimate_job_size(job))
+
+        done = failed = 0
+        offline = False  # Nach einem vorübergehenden Fehlschlag nichts Neues mehr starten
+        attempted = set()  # Abgelehnte Aufträge bleiben im Journal, laufen in diesem Aufruf aber nicht erneut
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while len(in_flight) < self.max_workers and not offline and not cancel_event.is_set():
+                    job = self.journal.claim_next(exclude=attempted)
+                    if job is None:
+                        break
+                    attempted.add(job["id"])
+                    progress.add_job(job["id"], self.estimate_job_size(job))  # Während des Abarbeitens hinzugekommen
+                    in_flight[executor.submit(self.run_job, job, progress)] = job
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = in_flight.pop(future)
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Upload '{job['id']}' fehlgeschlagen: {e}")
+                        success = False  # Wie eine Ablehnung zählen, damit der Auftrag irgendwann aufgegeben wird
+                    if success is None:
+                        offline = True
+                    try:
+                        if success:
+                            self.journal.complete(job["id"])
+                            done += 1
+                        else:
+                            if success is False:
+                                self.journal.fail(job["id"])  # Nur Ablehnungen zählen, Offline-Zeiten nicht
+                            failed += 1
+                    finally:
+                        self.journal.release(job["id"])
+                    if progress_callback:
+                        remaining = sum(1 for pending in self.journal.pending() if pending["id"] != job["id"])
+                        progress_callback(done + failed, done + failed + remaining, job.get("name", "Trainingsdaten"), success)
+
+        remaining = len(self.journal.pending())
+        if remaining:
+            print(f"⏸️ {remaining} Upload(s) ausstehend, werden beim nächsten Mal fortgesetzt.")
+        return done, failed, remaining
+
+    def run_job(self, job, progress=None):
+        """Führt einen Auftrag aus dem Journal aus (Rückgabe wie `upload_training_data`)."""
+        if job["kind"] == UploadJournal.KIND_TRAINING_DATA:
+            return self.upload_training_data(progress)
+
+        if not os.path.exists(job["path"]):
+            print(f"⏭️ Screenshot '{job['name']}' existiert nicht mehr, Upload entfällt.")
+            if progress:
+                progress.set_size(job["id"], 0)
+            return True
+        prepared = self.prepared.get(job["name"])
+        if prepared and not all(os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(job["path"]) for path in prepared if path):
+            prepared = None  # Screenshot wurde seit dem Aufbereiten geändert
+        return self.upload_screenshot(job["name"], job["path"], prepared, progress=progress)
+
+    def estimate_job_size(self, job):
+        """Geschätzte Upload-Größe in Bytes (wird korrigiert, sobald der Body feststeht)."""
+        if job["kind"] == UploadJournal.KIND_TRAINING_DATA:
+            paths = [os.path.join(self.training_folder, name) for name in ("notes.txt", "comments.json")]
+        else:
+            paths = [job["path"]]
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def filter_pending_screenshots(self, files):
+        """Entfernt Screenshots, die unter diesem Namen mit unverändertem Inhalt bereits hochgeladen wurden."""
+        pending = []
+        for screenshot_name, screenshot_path in files:
+            file_hash = self.manifest.file_hash(screenshot_name, screenshot_path)
+            if not self.manifest.is_uploaded(screenshot_name, file_hash):
+                pending.append((screenshot_name, screenshot_path))
+
+        self.manifest.save()  # Hash-Cache sichern
+        return pending
+
+    def prepare_screenshots(self, files):
+        """Bereitet Screenshots parallel auf allen Kernen für den Upload auf.
+
+        Gibt ein Dict Screenshot-Name → (Upload-Pfad, Vorschaubild-Pfad) zurück; ist
+        keine Bildaufbereitung aktiv oder schlägt sie fehl, fehlt der Eintrag und
+        das Original wird hochgeladen.
+        """
+        if not self.image_format or not files:
+            return {}
+        if len(files) == 1:
+            prepared = self.prepare_screenshot(files[0][1])  # Live-Upload: kein eigener Prozess-Pool für eine Datei
+            return {files[0][0]: prepared} if prepared else {}
+
+        prepared = {}
+        with ProcessPoolExecutor() as executor:
+            futures = {executor.submit(transform_screenshot, path, self.upload_cache_folder, self.image_format, self.image_quality,
+                                       self.max_image_size, self.thumbnail_size): name for name, path in files}
+            for future in as_completed(futures):
+                try:
+                    prepared[futures[future]] = future.result()
+                except Exception as e:
+                    print(f"⚠️ Screenshot {futures[future]} konnte nicht aufbereitet werden: {e}")
+        return prepared
+
+    def prepare_screenshot(self, screenshot_path):
+        """Bereitet einen einzelnen Screenshot im aktuellen Thread auf (für Live-Uploads)."""
+        if not self.image_format:
+            return None
+
+        try:
+            return transform_screenshot(screenshot_path, self.upload_cache_folder, self.image_format, self.image_quality,
+                                        self.max_image_size, self.thumbnail_size)
+        except Exception as e:
+            print(f"⚠️ Screenshot {os.path.basename(screenshot_path)} konnte nicht aufbereitet werden: {e}")
+            return None
+
+    def upload_screenshot(self, screenshot_name, screenshot_path, prepared=None, progress=None):
+        """Lädt einen einzelnen Screenshot hoch.
+
+        Standardmäßig wird die Datei als multipart/form-data direkt vom Datei-Handle
+        gestreamt. Lehnt der Server das Format mit 415 ab, wird auf den alten Base64-JSON-Upload
+        zurückgefallen. Screenshots, die laut Manifest unter diesem Namen mit gleichem
+        Inhalt bereits auf dem Server liegen, werden übersprungen. `prepared` ist das Ergebnis von `transform_screenshot`
+        (aufbereitete Datei & Vorschaubild); fehlt es, wird bei aktiver Bildaufbereitung
+        direkt hier aufbereitet. Vorübergehende Fehler werden mit Backoff wiederholt;
+        der Idempotenz-Schlüssel verhindert doppelte Screenshots auf dem Server.
+        Fortschritt, Abbruch-Token & Rückgabe wie bei `upload_training_data`.
+        """
+        url = f"{self.api_base_url}/{self.training_id}/upload"
+        progress_key = UploadJournal.screenshot_job_id(screenshot_name)
+
+        try:
+            file_hash = self.manifest.file_hash(screenshot_name, screenshot_path)
+            if self.manifest.is_uploaded(screenshot_name, file_hash):
+                print(f"⏭️ Screenshot bereits hochgeladen: {screenshot_name}")
+                if progress:
+                    progress.set_size(progress_key, 0)
+                return True
+
+            upload_path, thumbnail_path = prepared or self.prepare_screenshot(screenshot_path) or (screenshot_path, None)
+            idempotency_key = self.idempotency_key(screenshot_name, file_hash)
+
+            with self._upload_mode_lock:
+                upload_mode = self.upload_mode
+            with span("upload.screenshot", file=screenshot_name, bytes=os.path.getsize(upload_path)):
+                if upload_mode == self.UPLOAD_MODE_MULTIPART:
+                    response = self.post_with_retry(screenshot_name, lambda: self.post_multipart(
+                        url, screenshot_name, upload_path, thumbnail_path, idempotency_key, progress, progress_key), progress)
+                    if response.status_code == 415:  # Nur "Unsupported Media Type"; ein 400 ist eine echte Ablehnung
+                        with self._upload_mode_lock:
+                            if self.upload_mode == self.UPLOAD_MODE_MULTIPART:
+                                print("⚠️ Server akzeptiert keinen Multipart-Upload (415), wechsle auf JSON.")
+                                self.upload_mode = self.UPLOAD_MODE_JSON
+                        response = self.post_with_retry(screenshot_name, lambda: self.post_json(
+                            url, screenshot_name, upload_path, thumbnail_path, idempotency_key, progress, progress_key), progress)
+                else:
+                    response = self.post_with_retry(screenshot_name, lambda: self.post_json(
+                        url, screenshot_name, upload_path, thumbnail_path, idempotency_key, progress, progress_key), progress)
+        except UploadCancelled:
+            print(f"⏹️ Upload von {screenshot_name} abgebrochen.")
+            return None
+        except Exception as e:
+            print(f"❌ Fehler beim Hochladen von {screenshot_name}: {e}")
+            return self.failure_result(error=e)
+
+        if response.status_code == 200:
+            if progress:
+                progress.finish(progress_key)
+            self.manifest.mark_uploaded(screenshot_name, file_hash)
+            print(f"✅ Screenshot hochgeladen: {screenshot_name}")
+            if self.on_screenshot_uploaded:
+                self.on_screenshot_uploaded(screenshot_name)
+            return True
+
+        print(f"⚠️ Fehler beim Hochladen von {screenshot_name}: {response.status_code} - {response.text}")
+        return self.failure_result(response)
+
+    def failure_result(self, response=None, error=None):
+        """None für vorübergehende Fehler (später erneut versuchen), False für endgültige Ablehnungen."""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return None
+        if response is not None and response.status_code in self.RETRY_STATUS_CODES:
+            return None
+        return False
+
+    def idempotency_key(self, screenshot_name, file_hash):
+        """Schlüssel aus Training, Dateiname und Inhalt: eine Wiederholung desselben Uploads ist für den Server erkennbar."""
+        return hashlib.sha256(f"{self.training_id}|{screenshot_name}|{file_hash}".encode("utf-8")).hexdigest()
+
+    def post_with_retry(self, description, send, progress=None):
+        """Führt `send()` aus und wiederholt bei 5xx/429, Zeitüberschreitung oder Verbindungsfehler.
+
+        Zwischen den Versuchen wird exponentiell mit zufälligem Jitter gewartet
+        (bzw. so lange, wie der Server per `Retry-After` verlangt). `send` muss bei
+        jedem Aufruf einen neuen Body erzeugen, da ein Stream nur einmal gelesen werden kann.
+        Mit `progress` wird vor jedem Versuch und während des Wartens auf Abbruch geprüft.
+        """
+        for attempt in range(self.max_retries + 1):
+            if progress:
+                progress.check_cancelled()
+            start = time.perf_counter()
+            error = None
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            retryable = error is not None or response.status_code in self.RETRY_STATUS_CODES
+            self.metrics.record_request((time.perf_counter() - start) * 1000, not retryable)
+
+            if not retryable or attempt == self.max_retries:
+                break
+
+            delay = self.backoff_delay(attempt, response)
+            reason = type(error).__name__ if error else f"HTTP {response.status_code}"
+            print(f"🔁 {description}: {reason}, neuer Versuch ({attempt + 2}/{self.max_retries + 1}) in {delay:.1f} s")
+            self.metrics.record_retry()
+            if progress:
+                progress.cancel_event.wait(delay)  # Abbruch beendet auch das Warten sofort
             else:
-                print(f"⚠️ Fehler beim Hochladen von {screenshot}: {response.status_code} - {response.text}")
+                time.sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
+
+    def backoff_delay(self, attempt, response=None):
+        """Wartezeit vor dem nächsten Versuch: `Retry-After` des Servers oder exponentiell mit vollem Jitter."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def post_multipart(self, url, screenshot_name, screenshot_path, thumbnail_path=None, idempotency_key=None, progress=None, progress_key=None):
+        """Sendet den Screenshot (und ggf. das Vorschaubild) als gestreamten multipart/form-data-Body."""
+        files = [("file", os.path.basename(screenshot_path), screenshot_path)]
+        if thumbnail_path:
+            files.append(("thumbnail", os.path.basename(thumbnail_path), thumbnail_path))
+
+        body = MultipartFileStream({"filename": screenshot_name}, files, progress, progress_key)
+        headers = {"Content-Type": body.content_type}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        return self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+
+    def post_json(self, url, screenshot_name, screenshot_path, thumbnail_path=None, idempotency_key=None, progress=None, progress_key=None):
+        """Sendet den Screenshot Base64-kodiert im JSON-Body (Fallback für ältere Server).
+
+        Der Body liegt komplett im Speicher; der Fortschritt springt daher erst nach
+        der Antwort auf 100 %.
+        """
+        with open(screenshot_path, "rb") as file:
+            encoded_string = base64.b64encode(file.read()).decode("utf-8")  # Base64-Kodierung
+
+        payload = {
+            "file": encoded_string,
+            "filename": screenshot_name
+        }
+        if thumbnail_path:
+            with open(thumbnail_path, "rb") as file:
+                payload["thumbnail"] = base64.b64encode(file.read()).decode("utf-8")
+        body = json.dumps(payload).encode("utf-8")
+        if progress:
+            progress.set_size(progress_key, len(body))
+            progress.reset(progress_key)
+        headers = {"Content-Type": "application/json"}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        return self.session.post(url, data=body, headers=headers, timeout=self.timeout)
 
     def get_debrief_links(self):
         """Erzeugt die URLs für Trainer- & Trainee-Debrief-Seiten."""
-        base_url = "https://yschaffler.de/vatsim/traineemanager/training"
-        trainer_link = f"{base_url}/trainer/{self.training_id}"
-        trainee_link = f"{base_url}/trainee/{self.training_id}"
+        trainer_link = f"{self.viewer_base_url}/trainer/{self.training_id}"
+        trainee_link = f"{self.viewer_base_url}/trainee/{self.training_id}"
         return trainer_link, trainee_link
     
     def get_initials(self, name):
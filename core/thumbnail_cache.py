@@ -0,0 +1,131 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+from core.trainee_manager import TraineeManager
+
+
+class ThumbnailCache(QObject):
+    """Vorschaubild-Cache für Screenshots (LRU im Speicher + begrenzter Cache auf der Platte).
+
+    Schlüssel ist Pfad + mtime, geänderte Screenshots bekommen also automatisch ein
+    neues Vorschaubild. Erzeugt wird im Hintergrund mit `QImage`/`QImageReader`
+    (thread-sicher), die GUI wandelt das Ergebnis nur noch in eine `QPixmap` um.
+    """
+
+    thumbnail_ready = pyqtSignal(str)  # Pfad des Screenshots
+
+    def __init__(self, cache_dir=None, size=(400, 300), max_memory_items=100, max_disk_bytes=200 * 1024 * 1024):
+        super().__init__()
+        self.cache_dir = cache_dir or os.path.join(TraineeManager.CONFIG_DIR, "thumbnails")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.size = size
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()  # Schlüssel → QImage
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+    def cache_key(self, screenshot_path):
+        """Bildet den Cache-Schlüssel aus Pfad, mtime und Zielgröße."""
+        mtime = os.stat(screenshot_path).st_mtime_ns
+        raw_key = f"{os.path.abspath(screenshot_path)}|{mtime}|{self.size[0]}x{self.size[1]}"
+        return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+    def get(self, screenshot_path):
+        """Gibt das Vorschaubild als `QImage` zurück oder None, falls es noch nicht existiert."""
+        try:
+            key = self.cache_key(screenshot_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                return image
+
+        disk_path = os.path.join(self.cache_dir, key + ".png")
+        if os.path.exists(disk_path):
+            image = QImage(disk_path)
+            if not image.isNull():
+                os.utime(disk_path)  # Für die LRU-Verdrängung auf der Platte als benutzt markieren
+                self._remember(key, image)
+                return image
+        return None
+
+    def request(self, screenshot_path):
+        """Erzeugt das Vorschaubild im Hintergrund; danach wird `thumbnail_ready` gesendet."""
+        with self._lock:
+            if screenshot_path in self._pending:
+                return
+            self._pending.add(screenshot_path)
+        self._executor.submit(self._generate, screenshot_path)
+
+    def shutdown(self):
+        """Beendet den Hintergrund-Worker."""
+        self._executor.shutdown(wait=False)
+
+    def _generate(self, screenshot_path):
+        try:
+            key = self.cache_key(screenshot_path)
+            disk_path = os.path.join(self.cache_dir, key + ".png")
+
+            if os.path.exists(disk_path):
+                image = QImage(disk_path)
+            else:
+                # Direkt verkleinert dekodieren statt das volle 4K-Bild zu laden
+                reader = QImageReader(screenshot_path)
+                reader.setScaledSize(reader.size().scaled(self.size[0], self.size[1], Qt.KeepAspectRatio))
+                image = reader.read()
+                if image.isNull():
+                    print(f"⚠️ Vorschaubild konnte nicht erzeugt werden: {reader.errorString()}")
+                    return
+
+                temp_path = disk_path + ".tmp"
+                image.save(temp_path, "PNG")
+                os.replace(temp_path, disk_path)
+                self._evict_disk()
+
+            self._remember(key, image)
+            self.thumbnail_ready.emit(screenshot_path)
+        except OSError as e:
+            print(f"⚠️ Vorschaubild konnte nicht erzeugt werden: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(screenshot_path)
+
+    def _remember(self, key, image):
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Löscht die ältesten Vorschaubilder, sobald der Cache die Maximalgröße überschreitet."""
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_disk_bytes:
+            return
+
+        for _, file_size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= file_size
+            if total_size <= self.max_disk_bytes:
+                break
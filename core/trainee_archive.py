@@ -0,0 +1,332 @@
+"""Export & Import ganzer Trainees als Archiv (Übergabe an andere Mentoren, Backup).
+
+Unterstützte Formate:
+
+    .zip       Screenshots unkomprimiert (ZIP_STORED, sind bereits PNG/JPEG),
+               Notizen, Bemerkungen & Akte mit Deflate
+    .tar.zst   Zstandard mit einem Worker pro CPU-Kern (optional, Paket `zstandard`)
+
+Dateien werden blockweise direkt vom Trainee-Ordner ins Archiv gestreamt bzw. beim
+Import direkt in den Zielordner entpackt – es entstehen keine Zwischenkopien. Das
+Archiv enthält Pfade der Form `<Trainee>/<Training>/...`; das erste Element ist
+ein kleines Manifest mit Anzahl & Größe der Dateien (für den Fortschritt beim Import).
+"""
+import json
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from datetime import datetime
+
+from core.upload_journal import UploadJournal
+
+try:
+    import zstandard  # Optional: nur für .tar.zst-Archive nötig
+except ImportError:
+    zstandard = None
+
+
+MANIFEST_NAME = "traineemanager_export.json"
+FORMAT_VERSION = 1
+COPY_CHUNK_SIZE = 1024 * 1024
+
+ZIP_MAGIC = b"PK\x03\x04"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Bereits komprimierte Formate werden im Zip nur gespeichert
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".zip", ".zst", ".gz"}
+# Lokale, jederzeit neu erzeugbare Dateien gehören nicht ins Archiv. Das Upload-Manifest
+# (`UploadManifest.FILE_NAME`, ohne `requests` zu importieren) enthält die Training-ID
+# dieser Installation: importiert, würde ein Debrief das Training des Originals fortsetzen.
+UPLOAD_MANIFEST_NAME = "upload_manifest.json"
+EXCLUDED_NAMES = {"upload_cache", UploadJournal.FILE_NAME, UPLOAD_MANIFEST_NAME}
+EXCLUDED_SUFFIXES = (".tmp", ".part")
+
+
+class ArchiveCancelled(Exception):
+    """Export oder Import wurde über `cancel_event` abgebrochen."""
+
+
+def is_zstd_path(archive_path):
+    return archive_path.lower().endswith((".tar.zst", ".tzst"))
+
+
+def require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("Für .tar.zst-Archive wird das Paket 'zstandard' benötigt (pip install zstandard).")
+
+
+def collect_entries(trainee_folder, trainee_names):
+    """Sammelt (Pfad, Archivname, Größe) aller zu exportierenden Einträge, sortiert nach Trainee & Training.
+
+    Ordner werden mit Größe None aufgeführt, damit auch leere Trainings erhalten bleiben.
+    """
+    entries = []
+    for trainee_name in sorted(set(trainee_names)):
+        trainee_path = os.path.join(trainee_folder, trainee_name)
+        if not os.path.isdir(trainee_path):
+            raise FileNotFoundError(f"Trainee '{trainee_name}' wurde nicht gefunden.")
+
+        for root, dirs, files in os.walk(trainee_path):
+            dirs[:] = sorted(name for name in dirs if name not in EXCLUDED_NAMES)
+            relative_root = os.path.relpath(root, trainee_folder).replace(os.sep, "/")
+            entries.append((root, relative_root + "/", None))
+            for name in sorted(files):
+                if name in EXCLUDED_NAMES or name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                path = os.path.join(root, name)
+                entries.append((path, f"{relative_root}/{name}", os.path.getsize(path)))
+    return entries
+
+
+def export_archive(trainee_folder, trainee_names, archive_path, progress_callback=None, cancel_event=None):
+    """Schreibt die Trainees nach `archive_path` (Format nach Endung, siehe Modul-Docstring).
+
+    Das Archiv entsteht als `.part` und wird erst am Ende umbenannt; bei Abbruch oder
+    Fehler bleibt keine halbe Datei zurück. Gibt False zurück, wenn abgebrochen wurde.
+    """
+    if is_zstd_path(archive_path):
+        require_zstandard()
+
+    entries = collect_entries(trainee_folder, trainee_names)
+    files = [entry for entry in entries if entry[2] is not None]
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "trainees": sorted(set(trainee_names)),
+        "files": len(files),
+        "bytes": sum(entry[2] for entry in files),
+    }
+
+    temp_path = archive_path + ".part"
+    writer = write_tar_zst if is_zstd_path(archive_path) else write_zip
+    start = time.perf_counter()
+    try:
+        writer(temp_path, manifest, entries, progress_callback, cancel_event)
+        os.replace(temp_path, archive_path)
+    except ArchiveCancelled:
+        os.remove(temp_path)
+        print("⏹️ Export abgebrochen.")
+        return False
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    duration = time.perf_counter() - start
+    print(f"📦 {len(manifest['trainees'])} Trainee(s) exportiert: {manifest['files']} Dateien, "
+          f"{manifest['bytes'] / 1e6:.1f} MB in {duration:.1f} s → {archive_path}")
+    return True
+
+
+def copy_stream(source, target, cancel_event=None):
+    """Kopiert blockweise und prüft zwischen den Blöcken auf Abbruch."""
+    while True:
+        if cancel_event and cancel_event.is_set():
+            raise ArchiveCancelled()
+        chunk = source.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            return
+        target.write(chunk)
+
+
+def write_zip(archive_path, manifest, entries, progress_callback, cancel_event):
+    total = manifest["files"]
+    done = 0
+    with zipfile.ZipFile(archive_path, "w", allowZip64=True) as archive:
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=4), zipfile.ZIP_DEFLATED)
+        for path, name, size in entries:
+            if size is None:
+                archive.writestr(zipfile.ZipInfo.from_file(path, name), b"")
+                continue
+
+            info = zipfile.ZipInfo.from_file(path, name)
+            extension = os.path.splitext(name)[1].lower()
+            info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            with open(path, "rb") as source, archive.open(info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as target:
+                copy_stream(source, target, cancel_event)
+
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+
+
+def write_tar_zst(archive_path, manifest, entries, progress_callback, cancel_event):
+    total = manifest["files"]
+    done = 0
+    compressor = zstandard.ZstdCompressor(level=3, threads=-1)  # -1 = ein Worker pro Kern
+    with open(archive_path, "wb") as output, compressor.stream_writer(output) as stream, \
+            tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+        manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=4).encode("utf-8")
+        info = tarfile.TarInfo(MANIFEST_NAME)
+        info.size = len(manifest_bytes)
+        info.mtime = int(time.time())
+        archive.addfile(info, _BytesReader(manifest_bytes))
+
+        for path, name, size in entries:
+            info = archive.gettarinfo(path, name.rstrip("/"))
+            if size is None:
+                archive.addfile(info)
+                continue
+
+            with open(path, "rb") as source:
+                archive.addfile(info, _CancellableReader(source, cancel_event))
+
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+
+
+class _BytesReader:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self.data)
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+
+class _CancellableReader:
+    """Datei-Wrapper für `tarfile`, der zwischen den Blöcken auf Abbruch prüft."""
+
+    def __init__(self, source, cancel_event):
+        self.source = source
+        self.cancel_event = cancel_event
+
+    def read(self, size=-1):
+        if self.cancel_event and self.cancel_event.is_set():
+            raise ArchiveCancelled()
+        return self.source.read(size)
+
+
+def split_member_name(name):
+    """Prüft einen Archivpfad und gibt seine Bestandteile zurück (None für ungültige oder fremde Pfade)."""
+    name = name.replace("\\", "/").rstrip("/")
+    parts = name.split("/")
+    if (not name or name.startswith("/") or any(part in ("", ".", "..") for part in parts)
+            or ":" in parts[0] or parts[0].startswith(".")):
+        return None
+    return parts
+
+
+def iter_zip_members(archive_path):
+    """Liefert (Name, ist Ordner, Datei-Objekt) für jedes Element eines Zip-Archivs."""
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                yield info.filename, True, None
+                continue
+            with archive.open(info) as source:
+                yield info.filename, False, source
+
+
+def iter_tar_zst_members(archive_path):
+    """Liefert (Name, ist Ordner, Datei-Objekt) für jedes Element eines .tar.zst-Archivs (rein sequenziell)."""
+    require_zstandard()
+    with open(archive_path, "rb") as source, zstandard.ZstdDecompressor().stream_reader(source) as stream, \
+            tarfile.open(fileobj=stream, mode="r|") as archive:
+        for member in archive:
+            if member.isdir():
+                yield member.name, True, None
+            elif member.isfile():
+                yield member.name, False, archive.extractfile(member)
+
+
+def import_archive(trainee_folder, archive_path, progress_callback=None, cancel_event=None):
+    """Entpackt ein Export-Archiv in den Trainee-Ordner.
+
+    Jedes Training wird erst in einem Import-Ordner im Trainee-Ordner vollständig
+    entpackt und dann per Umbenennen an seinen Platz verschoben – ein abgebrochener
+    Import hinterlässt keine halben Trainings. Bereits vorhandene Trainings werden
+    nicht überschrieben, sondern übersprungen.
+
+    Gibt {"trainees": [...], "imported": [...], "skipped": [...]} zurück, bzw. None bei Abbruch.
+    """
+    with open(archive_path, "rb") as f:
+        magic = f.read(4)
+    if magic == ZIP_MAGIC:
+        members = iter_zip_members(archive_path)
+    elif magic == ZSTD_MAGIC:
+        members = iter_tar_zst_members(archive_path)
+    else:
+        raise ValueError(f"'{os.path.basename(archive_path)}' ist kein TraineeManager-Archiv (.zip oder .tar.zst).")
+
+    staging_folder = os.path.join(trainee_folder, f".import-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+    result = {"trainees": [], "imported": [], "skipped": []}
+    state = {"unit": None, "finished": set()}
+    created_folders = set()  # spart bei vielen kleinen Dateien ein makedirs pro Datei
+    total = None
+    done = 0
+
+    def finish_unit():
+        """Verschiebt das fertig entpackte Training (oder eine Datei direkt im Trainee) an seinen Platz."""
+        unit = state["unit"]
+        if unit is None:
+            return
+        state["unit"] = None
+        state["finished"].add(unit)
+        source = os.path.join(staging_folder, *unit)
+        target = os.path.join(trainee_folder, *unit)
+        label = "/".join(unit)
+        if os.path.exists(target):
+            result["skipped"].append(label)
+            print(f"⏭️ '{label}' existiert bereits, wird nicht überschrieben.")
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source, target)
+        result["imported"].append(label)
+
+    try:
+        for name, is_dir, source in members:
+            if cancel_event and cancel_event.is_set():
+                raise ArchiveCancelled()
+
+            if name == MANIFEST_NAME:
+                total = json.load(source).get("files")
+                continue
+            parts = split_member_name(name)
+            if parts is None:
+                print(f"⚠️ Ungültiger Pfad im Archiv übersprungen: {name}")
+                continue
+
+            trainee_name = parts[0]
+            if trainee_name not in result["trainees"]:
+                result["trainees"].append(trainee_name)
+                os.makedirs(os.path.join(trainee_folder, trainee_name), exist_ok=True)
+            if len(parts) == 1:
+                continue  # Der Trainee-Ordner selbst
+
+            unit = tuple(parts[:2])
+            if unit != state["unit"]:
+                finish_unit()
+                if unit in state["finished"]:
+                    print(f"⚠️ '{'/'.join(unit)}' kommt im Archiv mehrfach vor, weitere Einträge übersprungen.")
+                    continue
+                state["unit"] = unit
+
+            path = os.path.join(staging_folder, *parts)
+            folder = path if is_dir else os.path.dirname(path)
+            if folder not in created_folders:
+                os.makedirs(folder, exist_ok=True)
+                created_folders.add(folder)
+            if is_dir:
+                continue
+
+            with open(path, "wb") as target:
+                copy_stream(source, target, cancel_event)
+            done += 1
+            if progress_callback:
+                progress_callback(done, max(total or 0, done))
+
+        finish_unit()
+    except ArchiveCancelled:
+        print("⏹️ Import abgebrochen, bereits vollständig entpackte Trainings bleiben erhalten.")
+        return None
+    finally:
+        shutil.rmtree(staging_folder, ignore_errors=True)
+
+    print(f"📥 Import abgeschlossen: {len(result['imported'])} übernommen, {len(result['skipped'])} übersprungen.")
+    return result
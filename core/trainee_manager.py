@@ -1,17 +1,66 @@
 import os
 import json
 import sys
+import threading
+import time
+from datetime import datetime
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QApplication
 
+from core.perf import timed
+
 class TraineeManager:
     CONFIG_DIR = os.path.join(os.getenv("LOCALAPPDATA"), "TraineeManager")  # ✅ Speichert die Datei im Benutzerverzeichnis
     CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+    CATALOG_FILE = os.path.join(CONFIG_DIR, "catalog.sqlite")
+    TRASH_FOLDER_NAME = ".trash"  # Papierkorb im Trainee-Ordner, damit Löschen ein Umbenennen bleibt
+    CONFIG_CHECK_INTERVAL = 1.0  # Sekunden zwischen zwei Prüfungen, ob `config.json` geändert wurde
 
     def __init__(self):
         if not os.path.exists(self.CONFIG_DIR):  # ✅ Falls Verzeichnis nicht existiert, erstellen
             os.makedirs(self.CONFIG_DIR, exist_ok=True)
+        self._config_mtime = None
+        self._next_config_check = 0.0
+        self._trainee_folder = None
+        self.catalog = None
         self.trainee_folder = self.load_trainee_folder()
 
+    @property
+    def trainee_folder(self):
+        """Der Trainee-Ordner; wird neu geladen, wenn `config.json` von außen geändert wurde.
+
+        Geprüft wird nur im GUI-Thread und höchstens einmal pro `CONFIG_CHECK_INTERVAL`,
+        denn ein ungültiger Ordner öffnet einen Dialog. Upload-, Watcher- und
+        Autosave-Threads erhalten den zuletzt geladenen Wert.
+        """
+        if threading.current_thread() is threading.main_thread() and time.monotonic() >= self._next_config_check:
+            self._next_config_check = time.monotonic() + self.CONFIG_CHECK_INTERVAL
+            config_mtime = self.get_config_mtime()
+            if config_mtime != self._config_mtime:
+                self._config_mtime = config_mtime
+                self._trainee_folder = self.load_trainee_folder()
+        return self._trainee_folder
+
+    @trainee_folder.setter
+    def trainee_folder(self, folder):
+        self._trainee_folder = folder
+        self._config_mtime = self.get_config_mtime()
+
+    def get_config_mtime(self):
+        """Gibt die mtime von `config.json` zurück (None, falls sie fehlt)."""
+        try:
+            return os.stat(self.CONFIG_FILE).st_mtime_ns
+        except OSError:
+            return None
+
+    def get_config_value(self, key, default=None):
+        """Liest einen weiteren Schlüssel aus `config.json` (z. B. `upload`); fehlt er oder ist die Datei ungültig, gilt `default`."""
+        try:
+            with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
+                value = json.load(f).get(key)
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return default
+        return default if value is None else value
+
     def load_trainee_folder(self):
         """Lädt den gespeicherten Trainee-Ordner aus `config.json`. Falls er fehlt oder ungültig ist, fragt das Programm nach einem neuen."""
         if os.path.exists(self.CONFIG_FILE):
@@ -52,9 +101,17 @@ class TraineeManager:
             sys.exit(1)
 
     def save_trainee_folder(self, folder):
-        """Speichert den gewählten Trainee-Ordner in `config.json`."""
+        """Speichert den gewählten Trainee-Ordner in `config.json` (weitere Einstellungen bleiben erhalten)."""
+        try:
+            with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            config = {}
+        if not isinstance(config, dict):
+            config = {}
+        config["trainee_folder"] = folder
         with open(self.CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump({"trainee_folder": folder}, f, indent=4, ensure_ascii=False)
+            json.dump(config, f, indent=4, ensure_ascii=False)
 
     def load_trainee_folder(self):
         """Lädt den gespeicherten Trainee-Ordner oder fragt den Nutzer beim ersten Mal."""
@@ -69,19 +126,43 @@ class TraineeManager:
         """Lässt den Nutzer einen neuen Trainee-Ordner auswählen & speichert ihn."""
         folder = QFileDialog.getExistingDirectory(None, "Trainee-Ordner auswählen")
         if folder:
-            with open(self.CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump({"trainee_folder": folder}, f)
+            self.save_trainee_folder(folder)
             self.trainee_folder = folder
         return folder
     
+    @timed("trainee_manager.get_training_folder")
     def get_training_folder(self, trainee_name, training_name):
         """Gibt den vollen Pfad eines Trainings zurück."""
         if not self.trainee_folder:
             raise ValueError("Kein Trainee-Ordner gesetzt. Bitte zuerst den Trainee-Ordner auswählen.")
         return os.path.join(self.trainee_folder, trainee_name, training_name)
 
+    def get_catalog(self):
+        """Gibt den Trainee-Katalog zurück und legt ihn beim ersten Zugriff (bzw. nach Ordnerwechsel) an.
+
+        Beim ersten Start wird synchron gescannt; danach wird der gespeicherte Katalog
+        sofort verwendet und im Hintergrund mit der Platte abgeglichen. Die
+        Überwachung (watchdog) startet immer im Hintergrund, um das erste Fenster
+        nicht zu verzögern.
+        """
+        from core.catalog import TraineeCatalog
+
+        if self.catalog and self.catalog.trainee_folder == self.trainee_folder:
+            return self.catalog
+
+        if self.catalog:
+            self.catalog.stop_watching()
+
+        self.catalog = TraineeCatalog(self.CATALOG_FILE, self.trainee_folder)
+        if self.catalog.is_empty():
+            self.catalog.refresh()
+            threading.Thread(target=self.catalog.start_watching, daemon=True).start()
+        else:
+            threading.Thread(target=self.catalog.refresh_and_watch, daemon=True).start()
+        return self.catalog
+
     def get_trainees(self):
-        """Gibt eine Liste aller Trainee-Ordner zurück. Falls der Pfad ungültig ist, wird der Nutzer aufgefordert, einen neuen zu wählen."""
+        """Gibt eine Liste aller Trainees aus dem Katalog zurück. Falls der Pfad ungültig ist, wird der Nutzer aufgefordert, einen neuen zu wählen."""
         if not os.path.exists(self.trainee_folder):
             print(f"❌ Fehler: Der Trainee-Ordner '{self.trainee_folder}' wurde nicht gefunden.")
             self.trainee_folder = self.ask_for_trainee_folder()
@@ -90,7 +171,7 @@ class TraineeManager:
             print("❌ Kein Trainee-Ordner gesetzt. Programm wird beendet.")
             sys.exit(1)
 
-        return [f for f in os.listdir(self.trainee_folder) if os.path.isdir(os.path.join(self.trainee_folder, f))]
+        return self.get_catalog().get_trainees()
 
 
     def add_trainee(self, trainee_name):
@@ -102,21 +183,24 @@ class TraineeManager:
             return
 
         os.makedirs(trainee_path)
+        self.get_catalog().refresh_trainee(trainee_name)
         print(f"✅ Neuer Trainee erstellt: {trainee_name}")
 
 
     def get_trainings(self, trainee_name):
-        """Gibt alle Trainings eines Trainees zurück (Ordner im Trainee-Ordner)."""
-        trainee_path = os.path.join(self.trainee_folder, trainee_name)
-        if not os.path.exists(trainee_path):
-            return []
-        return [f for f in os.listdir(trainee_path) if os.path.isdir(os.path.join(trainee_path, f))]
+        """Gibt alle Trainings eines Trainees aus dem Katalog zurück."""
+        return self.get_catalog().get_trainings(trainee_name)
+
+    def get_training_info(self, trainee_name, training_name):
+        """Gibt die im Katalog gespeicherten Metadaten eines Trainings zurück."""
+        return self.get_catalog().get_training_info(trainee_name, training_name)
 
     def add_training(self, trainee_name, training_name):
         """Erstellt einen neuen Trainingsordner für einen Trainee."""
         training_path = os.path.join(self.trainee_folder, trainee_name, training_name)
         if not os.path.exists(training_path):
             os.makedirs(training_path)
+            self.get_catalog().refresh_trainee(trainee_name, only_changed=True)
             print(f"✅ Training hinzugefügt: {training_name}")
 
     def rename_trainee(self, old_name, new_name):
@@ -125,6 +209,8 @@ class TraineeManager:
         new_path = os.path.join(self.trainee_folder, new_name)
         if os.path.exists(old_path) and not os.path.exists(new_path):
             os.rename(old_path, new_path)
+            self.get_catalog().remove_trainee(old_name)
+            self.get_catalog().refresh_trainee(new_name)
             print(f"✅ Trainee umbenannt: {old_name} → {new_name}")
 
     def rename_training(self, trainee_name, old_name, new_name):
@@ -133,16 +219,117 @@ class TraineeManager:
         new_path = os.path.join(self.trainee_folder, trainee_name, new_name)
         if os.path.exists(old_path) and not os.path.exists(new_path):
             os.rename(old_path, new_path)
+            self.get_catalog().refresh_trainee(trainee_name, only_changed=True)
             print(f"✅ Training umbenannt: {old_name} → {new_name}")
 
+    def get_trash_folder(self):
+        """Gibt den Pfad des Papierkorbs im Trainee-Ordner zurück."""
+        return os.path.join(self.trainee_folder, self.TRASH_FOLDER_NAME)
+
     def delete_training(self, trainee_name, training_name):
-        """Löscht ein Training vollständig."""
+        """Verschiebt ein Training in den Papierkorb und gibt den Papierkorb-Pfad zurück (für Rückgängig).
+
+        Da der Papierkorb im selben Ordner liegt, ist das nur ein Umbenennen; das
+        endgültige Löschen übernimmt `purge_trash` im Hintergrund.
+        """
+        training_path = os.path.join(self.trainee_folder, trainee_name, training_name)
+        if not os.path.exists(training_path):
+            return None
+
+        trash_entry = os.path.join(self.get_trash_folder(), datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+        trash_path = os.path.join(trash_entry, trainee_name, training_name)
+        os.makedirs(os.path.dirname(trash_path), exist_ok=True)
+        os.rename(training_path, trash_path)
+
+        self.get_catalog().refresh_trainee(trainee_name, only_changed=True)
+        print(f"🗑️ Training gelöscht: {training_name}")
+        return trash_path
+
+    def restore_training(self, trash_path, trainee_name, training_name):
+        """Holt ein gelöschtes Training aus dem Papierkorb zurück."""
         training_path = os.path.join(self.trainee_folder, trainee_name, training_name)
-        if os.path.exists(training_path):
-            for root, dirs, files in os.walk(training_path, topdown=False):
-                for file in files:
-                    os.remove(os.path.join(root, file))
+        if not os.path.exists(trash_path) or os.path.exists(training_path):
+            return False
+
+        os.makedirs(os.path.dirname(training_path), exist_ok=True)
+        os.rename(trash_path, training_path)
+
+        # Leere Papierkorb-Ordner aufräumen
+        trash_entry = os.path.dirname(os.path.dirname(trash_path))
+        for folder in (os.path.dirname(trash_path), trash_entry):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                break
+
+        self.get_catalog().refresh_trainee(trainee_name, only_changed=True)
+        print(f"↩️ Training wiederhergestellt: {training_name}")
+        return True
+
+    def purge_trash(self, older_than_days=0, progress_callback=None, cancel_event=None):
+        """Löscht Papierkorb-Einträge endgültig, Datei für Datei.
+
+        `progress_callback(erledigt, gesamt)` meldet den Fortschritt; ist `cancel_event`
+        gesetzt, wird nach der aktuellen Datei abgebrochen und False zurückgegeben.
+        """
+        trash_folder = self.get_trash_folder()
+        if not os.path.isdir(trash_folder):
+            return True
+
+        cutoff = time.time() - older_than_days * 24 * 60 * 60
+        entries = [entry.path for entry in os.scandir(trash_folder) if entry.is_dir() and entry.stat().st_mtime <= cutoff]
+
+        files = []
+        for entry in entries:
+            for root, dirs, filenames in os.walk(entry):
+                files.extend(os.path.join(root, filename) for filename in filenames)
+
+        for done, path in enumerate(files, start=1):
+            if cancel_event and cancel_event.is_set():
+                print("⏹️ Papierkorb leeren abgebrochen.")
+                return False
+            os.remove(path)
+            if progress_callback:
+                progress_callback(done, len(files))
+
+        for entry in entries:
+            for root, dirs, filenames in os.walk(entry, topdown=False):
                 for dir in dirs:
                     os.rmdir(os.path.join(root, dir))
-            os.rmdir(training_path)
-            print(f"🗑️ Training gelöscht: {training_name}")
+            os.rmdir(entry)
+
+        print(f"🗑️ Papierkorb geleert ({len(files)} Dateien)")
+        return True
+
+    def export_trainees(self, trainee_names, archive_path, progress_callback=None, cancel_event=None):
+        """Exportiert alle Trainings der Trainees als `.zip` oder `.tar.zst` (siehe `core.trainee_archive`).
+
+        `progress_callback(erledigt, gesamt)` zählt Dateien; bei Abbruch wird False zurückgegeben.
+        """
+        from core.trainee_archive import export_archive
+
+        return export_archive(self.trainee_folder, trainee_names, archive_path, progress_callback, cancel_event)
+
+    def import_archive(self, archive_path, progress_callback=None, cancel_event=None):
+        """Importiert ein Export-Archiv in den Trainee-Ordner; vorhandene Trainings bleiben unverändert.
+
+        Gibt die Zusammenfassung von `core.trainee_archive.import_archive` zurück (None bei Abbruch).
+        """
+        from core.trainee_archive import import_archive
+
+        result = import_archive(self.trainee_folder, archive_path, progress_callback, cancel_event)
+        if result:
+            for trainee_name in result["trainees"]:
+                self.get_catalog().refresh_trainee(trainee_name)
+        return result
+
+
+_shared_trainee_manager = None
+
+
+def get_trainee_manager():
+    """Gibt die prozessweite TraineeManager-Instanz zurück; `config.json` wird nur einmal gelesen."""
+    global _shared_trainee_manager
+    if _shared_trainee_manager is None:
+        _shared_trainee_manager = TraineeManager()
+    return _shared_trainee_manager
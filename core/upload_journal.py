@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+
+from core.file_utils import atomic_write_text
+
+
+class UploadJournal:
+    """Dauerhafte Warteschlange ausstehender Uploads eines Trainings.
+
+    Die Datei `upload_journal.jsonl` liegt neben `upload_manifest.json` und wird nur
+    angehängt: `enqueue`-Zeilen nehmen einen Auftrag auf, `done`-Zeilen erledigen
+    ihn, `failed`-Zeilen zählen Fehlversuche (nach `MAX_ATTEMPTS` wird der Auftrag
+    aufgegeben, damit ein dauerhaft abgelehnter Upload die Warteschlange nicht
+    blockiert). Jede Zeile wird vor der Rückkehr mit `fsync` gesichert, damit
+    ausstehende Uploads einen Absturz oder Neustart überleben. Sind alle Aufträge
+    erledigt, wird die Datei gelöscht; bei vielen erledigten Zeilen wird sie verdichtet.
+    """
+
+    FILE_NAME = "upload_journal.jsonl"
+    COMPACT_AFTER_LINES = 500
+    MAX_ATTEMPTS = 5
+
+    KIND_TRAINING_DATA = "training_data"
+    KIND_SCREENSHOT = "screenshot"
+
+    def __init__(self, training_folder):
+        self.path = os.path.join(training_folder, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.jobs = {}  # Auftrags-ID → Auftrag, in Einfügereihenfolge
+        self._claimed = set()  # Aufträge, die gerade ein Worker bearbeitet
+        self._lines = 0
+        self.load()
+
+    @classmethod
+    def has_pending(cls, training_folder):
+        """Schnelle Prüfung ohne Einlesen: gibt es für das Training ein Journal mit Inhalt?"""
+        try:
+            return os.path.getsize(os.path.join(training_folder, cls.FILE_NAME)) > 0
+        except OSError:
+            return False
+
+    def load(self):
+        """Spielt das Journal ab; eine nach einem Absturz abgeschnittene letzte Zeile wird ignoriert."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._lines += 1
+                    if entry.get("op") == "enqueue":
+                        self.jobs.setdefault(entry["job"]["id"], entry["job"])
+                    elif entry.get("op") == "done":
+                        self.jobs.pop(entry.get("id"), None)
+                    elif entry.get("op") == "failed" and entry.get("id") in self.jobs:
+                        job = self.jobs[entry["id"]]
+                        job["attempts"] = job.get("attempts", 0) + 1
+        except OSError as e:
+            print(f"⚠️ Upload-Journal konnte nicht gelesen werden: {e}")
+
+    def pending(self):
+        """Gibt eine Kopie der ausstehenden Aufträge in Einfügereihenfolge zurück."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def claim_next(self, exclude=()):
+        """Gibt den ältesten Auftrag zurück, den noch kein anderer Worker bearbeitet (oder None).
+
+        Aufträge in `exclude` werden übersprungen.
+        """
+        with self._lock:
+            for job_id, job in self.jobs.items():
+                if job_id not in self._claimed and job_id not in exclude:
+                    self._claimed.add(job_id)
+                    return dict(job)
+        return None
+
+    def release(self, job_id):
+        """Gibt einen beanspruchten Auftrag wieder frei (nach Erfolg oder Fehlversuch)."""
+        with self._lock:
+            self._claimed.discard(job_id)
+
+    def enqueue(self, job_id, kind, **data):
+        """Nimmt einen Auftrag auf; bereits ausstehende Aufträge werden nicht doppelt eingetragen."""
+        with self._lock:
+            if job_id in self.jobs:
+                return False
+            job = {"id": job_id, "kind": kind, **data}
+            self._append({"op": "enqueue", "ts": round(time.time(), 3), "job": job})
+            self.jobs[job_id] = job
+            return True
+
+    def enqueue_training_data(self):
+        """Notizen & Bemerkungen hochladen (gelesen wird erst beim Senden)."""
+        return self.enqueue(self.KIND_TRAINING_DATA, self.KIND_TRAINING_DATA)
+
+    def enqueue_screenshot(self, screenshot_name, screenshot_path):
+        """Einen Screenshot hochladen."""
+        return self.enqueue(self.screenshot_job_id(screenshot_name), self.KIND_SCREENSHOT,
+                            name=screenshot_name, path=screenshot_path)
+
+    @classmethod
+    def screenshot_job_id(cls, screenshot_name):
+        return f"{cls.KIND_SCREENSHOT}:{screenshot_name}"
+
+    def complete(self, job_id):
+        """Markiert einen Auftrag als erledigt."""
+        with self._lock:
+            if self.jobs.pop(job_id, None) is None:
+                return
+            if not self.jobs:
+                self._truncate()
+            elif self._lines >= self.COMPACT_AFTER_LINES:
+                self._compact()
+            else:
+                self._append({"op": "done", "id": job_id})
+
+    def fail(self, job_id):
+        """Vermerkt einen Fehlversuch; gibt False zurück, wenn der Auftrag damit aufgegeben wurde."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False
+            job["attempts"] = job.get("attempts", 0) + 1
+            if job["attempts"] < self.MAX_ATTEMPTS:
+                self._append({"op": "failed", "id": job_id})
+                return True
+        print(f"❌ Upload '{job_id}' nach {job['attempts']} Versuchen aufgegeben.")
+        self.complete(job_id)
+        return False
+
+    def _append(self, entry):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._lines += 1
+
+    def _truncate(self):
+        """Alles erledigt: Journal entfernen."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._lines = 0
+
+    def _compact(self):
+        """Schreibt nur noch die ausstehenden Aufträge (atomar) zurück."""
+        lines = [json.dumps({"op": "enqueue", "job": job}, ensure_ascii=False) + "\n" for job in self.jobs.values()]
+        atomic_write_text(self.path, "".join(lines))
+        self._lines = len(lines)
+
+
+_shared_journals = {}
+_shared_journals_lock = threading.Lock()
+
+
+def get_upload_journal(training_folder):
+    """Gibt das prozessweite Journal eines Trainings zurück (alle Uploader teilen sich eine Sicht auf die Datei)."""
+    key = os.path.normcase(os.path.abspath(training_folder))
+    with _shared_journals_lock:
+        if key not in _shared_journals:
+            _shared_journals[key] = UploadJournal(training_folder)
+        return _shared_journals[key]
@@ -4,6 +4,9 @@ import os
 import pyperclip
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QTextEdit, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QLineEdit
 
+from core.fulltext_index import get_fulltext_index
+from core.perf import timed
+
 class AkteWindow(QWidget):
     """Fenster zum Schreiben der Akte während des Trainings."""
     
@@ -146,6 +149,7 @@ class AkteWindow(QWidget):
 
 
 
+    @timed("akte.save")
     def save_akte(self):
         """Speichert die Akte als JSON-Datei im Trainingsordner."""
         akte_data = {
@@ -176,6 +180,9 @@ class AkteWindow(QWidget):
                 json.dump(akte_data, file, indent=4, ensure_ascii=False)
         except Exception as e:
             QMessageBox.warning(self, "Fehler", f"Fehler beim Speichern: {e}")
+            return
+
+        get_fulltext_index().update_training_folder(self.training_folder)
 
 
 
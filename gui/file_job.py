@@ -0,0 +1,39 @@
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class FileJob(QThread):
+    """Führt eine Dateioperation im Hintergrund aus, damit die GUI reagiert.
+
+    Mit `reports_progress=True` bekommt die Funktion zusätzlich `progress_callback`
+    und `cancel_event` übergeben; `cancel()` setzt das Event und die Funktion bricht
+    beim nächsten Schritt ab.
+    """
+
+    progress = pyqtSignal(int, int)  # erledigt, gesamt
+    done = pyqtSignal(object)        # Rückgabewert der Funktion
+    failed = pyqtSignal(str)
+
+    def __init__(self, description, function, *args, reports_progress=False):
+        super().__init__()
+        self.description = description
+        self.function = function
+        self.args = args
+        self.reports_progress = reports_progress
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        """Führt die Funktion aus und meldet Ergebnis oder Fehler."""
+        try:
+            if self.reports_progress:
+                result = self.function(*self.args, progress_callback=self.progress.emit, cancel_event=self.cancel_event)
+            else:
+                result = self.function(*self.args)
+        except Exception as e:
+            self.failed.emit(f"{self.description}: {e}")
+            return
+        self.done.emit(result)
+
+    def cancel(self):
+        """Bittet die laufende Operation, beim nächsten Schritt abzubrechen."""
+        self.cancel_event.set()
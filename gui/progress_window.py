@@ -1,30 +1,51 @@
-import sys
-import requests
-import webbrowser
-import pyperclip
+import threading
+
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar, QPushButton
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from core.server_uploader import ServerUploader
 
 class UploadThread(QThread):
     """Hintergrund-Thread für den Upload-Prozess"""
-    progress = pyqtSignal(int)
+    progress = pyqtSignal(int)  # Prozent der übertragenen Bytes
+    status = pyqtSignal(str)
+    transfer = pyqtSignal(str)  # Übertragene Menge, Durchsatz & Restzeit
+    metrics = pyqtSignal(str)  # Anfragen, Wiederholungen & Latenz
     finished = pyqtSignal(str, str)
+    stopped = pyqtSignal(str)  # Abgebrochen oder offline; ausstehende Uploads bleiben im Journal
 
     def __init__(self, server_uploader):
         super().__init__()
         self.server_uploader = server_uploader
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Bricht den Upload ab: laufende Anfragen enden beim nächsten Block (kein `terminate()`)."""
+        self.cancel_event.set()
 
     def run(self):
-        """Startet den Upload und sendet Fortschrittssignale"""
-        self.server_uploader.upload_training_data()
-        self.progress.emit(50)  # 50% Fortschritt nach Trainingsdaten-Upload
+        """Trägt Trainingsdaten & Screenshots ins Upload-Journal ein und arbeitet es ab"""
+        from core.server_uploader import UploadProgress
+
+        self.server_uploader.journal.enqueue_training_data()
+
+        def on_bytes(progress):
+            self.progress.emit(progress.percent())
+            self.transfer.emit(progress.format())
+
+        def on_job_done(done, total, name, success):
+            self.status.emit(f"Upload {done}/{total}: {name}")
+            self.metrics.emit(self.server_uploader.metrics.format())
 
-        self.server_uploader.upload_screenshots()
-        self.progress.emit(100)  # 100% Fortschritt nach Screenshot-Upload
+        progress = UploadProgress(self.cancel_event, on_bytes)
+        _, _, remaining = self.server_uploader.upload_screenshots(progress_callback=on_job_done, progress=progress)
 
-        trainer_link, trainee_link = self.server_uploader.get_debrief_links()
-        self.finished.emit(trainer_link, trainee_link)
+        if self.cancel_event.is_set():
+            self.stopped.emit(f"Upload abgebrochen – {remaining} ausstehende Uploads werden später fortgesetzt.")
+        elif remaining:
+            self.stopped.emit(f"Server nicht erreichbar – {remaining} Uploads werden beim nächsten Öffnen fortgesetzt.")
+        else:
+            self.progress.emit(100)
+            trainer_link, trainee_link = self.server_uploader.get_debrief_links()
+            self.finished.emit(trainer_link, trainee_link)
 
 class ProgressWindow(QWidget):
     """Fenster mit Fortschrittsanzeige für den Upload"""
@@ -37,7 +58,11 @@ class ProgressWindow(QWidget):
 
         self.upload_thread = UploadThread(server_uploader)
         self.upload_thread.progress.connect(self.update_progress)
+        self.upload_thread.status.connect(self.label.setText)
+        self.upload_thread.transfer.connect(self.transferLabel.setText)
+        self.upload_thread.metrics.connect(self.metricsLabel.setText)
         self.upload_thread.finished.connect(self.upload_complete)
+        self.upload_thread.stopped.connect(self.upload_stopped)
         self.upload_thread.start()
 
     def initUI(self):
@@ -53,6 +78,15 @@ class ProgressWindow(QWidget):
         self.progressBar.setMaximum(100)
         layout.addWidget(self.progressBar)
 
+        self.transferLabel = QLabel("")
+        self.transferLabel.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.transferLabel)
+
+        self.metricsLabel = QLabel("")
+        self.metricsLabel.setAlignment(Qt.AlignCenter)
+        self.metricsLabel.setStyleSheet("color: gray;")
+        layout.addWidget(self.metricsLabel)
+
         self.cancelButton = QPushButton("Abbrechen")
         self.cancelButton.clicked.connect(self.cancel_upload)
         layout.addWidget(self.cancelButton)
@@ -65,6 +99,9 @@ class ProgressWindow(QWidget):
 
     def upload_complete(self, trainer_link, trainee_link):
         """Wird aufgerufen, wenn der Upload abgeschlossen ist"""
+        import webbrowser
+        import pyperclip
+
         self.label.setText("Upload abgeschlossen!")
 
         webbrowser.open(trainer_link)  # Öffnet die Trainer-Debrief-Seite im Browser
@@ -83,7 +120,16 @@ class ProgressWindow(QWidget):
         msg.exec_()
 
 
+    def upload_stopped(self, message):
+        """Der Upload wurde abgebrochen oder ist offline hängen geblieben; das Fenster kann geschlossen werden."""
+        self.label.setText(message)
+        self.cancelButton.setText("Schließen")
+        self.cancelButton.setEnabled(True)
+        self.cancelButton.clicked.disconnect()
+        self.cancelButton.clicked.connect(self.close)
+
     def cancel_upload(self):
-        """Schließt das Fenster"""
-        self.upload_thread.terminate()
-        self.close()
+        """Bricht den Upload sicher ab: laufende Anfragen werden beendet, der Rest bleibt im Journal"""
+        self.upload_thread.cancel()
+        self.label.setText("Upload wird abgebrochen...")
+        self.cancelButton.setEnabled(False)
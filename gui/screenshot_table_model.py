@@ -0,0 +1,99 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class ScreenshotTableModel(QAbstractTableModel):
+    """Tabellenmodell für Screenshots & Bemerkungen mit In-Memory-Index.
+
+    Neue Screenshots werden als einzelne Zeile angehängt, statt die ganze Tabelle
+    neu aufzubauen. Bemerkungen werden beim Bearbeiten direkt über den
+    `ScreenshotManager` gespeichert.
+    """
+
+    HEADERS = ["Screenshot", "Bemerkung"]
+
+    def __init__(self, screenshot_manager, parent=None):
+        super().__init__(parent)
+        self.screenshot_manager = screenshot_manager
+        self.screenshots = []  # Reihenfolge der Zeilen
+        self.rows = {}         # Screenshot-Name → Zeile
+        self.comments = {}     # Screenshot-Name → Bemerkung
+
+    def reload(self):
+        """Liest Screenshots & Bemerkungen einmal komplett von der Platte."""
+        self.beginResetModel()
+        self.screenshots = self.screenshot_manager.get_screenshots()
+        self.rows = {name: row for row, name in enumerate(self.screenshots)}
+        self.comments = self.screenshot_manager.load_all_comments()
+        self.endResetModel()
+
+    def add_screenshot(self, screenshot_name):
+        """Hängt einen neuen Screenshot als Zeile an und gibt die Zeilennummer zurück."""
+        if screenshot_name in self.rows:
+            return self.rows[screenshot_name]
+
+        row = len(self.screenshots)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.screenshots.append(screenshot_name)
+        self.rows[screenshot_name] = row
+        self.endInsertRows()
+        return row
+
+    def remove_screenshot(self, screenshot_name):
+        """Entfernt die Zeile eines Screenshots."""
+        row = self.rows.get(screenshot_name)
+        if row is None:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.screenshots[row]
+        del self.rows[screenshot_name]
+        for following_row, name in enumerate(self.screenshots[row:], start=row):
+            self.rows[name] = following_row
+        self.endRemoveRows()
+
+    def screenshot_name(self, row):
+        """Gibt den Dateinamen des Screenshots in einer Zeile zurück."""
+        return self.screenshots[row]
+
+    def comment(self, screenshot_name):
+        """Gibt die Bemerkung zu einem Screenshot zurück."""
+        return self.comments.get(screenshot_name, "")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.screenshots)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        screenshot_name = self.screenshots[index.row()]
+        if index.column() == 0:
+            return screenshot_name
+        return self.comment(screenshot_name)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 1 or role != Qt.EditRole:
+            return False
+
+        screenshot_name = self.screenshots[index.row()]
+        if self.comments.get(screenshot_name, "") == value:
+            return False
+
+        self.comments[screenshot_name] = value
+        self.screenshot_manager.save_screenshot_comment(screenshot_name, value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 1:
+            flags |= Qt.ItemIsEditable  # Nur die Bemerkung ist editierbar
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
@@ -0,0 +1,76 @@
+import threading
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt5.QtCore import QTimer
+
+from core.fulltext_index import get_fulltext_index
+
+
+class SearchWindow(QWidget):
+    """Volltextsuche über Notizen, Bemerkungen und Akten aller Trainings."""
+
+    KIND_LABELS = {"notes": "Notizen", "comments": "Bemerkungen", "akte": "Akte"}
+
+    def __init__(self, open_training_callback=None):
+        super().__init__()
+        self.open_training_callback = open_training_callback
+        self.fulltext_index = get_fulltext_index()
+
+        self.initUI()
+
+        # Index im Hintergrund mit der Platte abgleichen (nur geänderte Dateien)
+        threading.Thread(target=self.fulltext_index.refresh, daemon=True).start()
+
+    def initUI(self):
+        self.setWindowTitle("Volltextsuche")
+        self.setGeometry(350, 250, 800, 500)
+        layout = QVBoxLayout()
+
+        self.searchInput = QLineEdit()
+        self.searchInput.setPlaceholderText("Suchbegriff, z. B. squawk...")
+        self.searchInput.textChanged.connect(self.schedule_search)
+        self.searchInput.returnPressed.connect(self.run_search)
+        layout.addWidget(self.searchInput)
+
+        self.statusLabel = QLabel("")
+        layout.addWidget(self.statusLabel)
+
+        self.resultTable = QTableWidget(0, 4)
+        self.resultTable.setHorizontalHeaderLabels(["Trainee", "Training", "Quelle", "Treffer"])
+        self.resultTable.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.resultTable.setSelectionBehavior(QTableWidget.SelectRows)
+        self.resultTable.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.resultTable.cellDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.resultTable)
+
+        self.setLayout(layout)
+
+        # Suche erst nach kurzer Tipp-Pause ausführen
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+
+    def schedule_search(self):
+        """Startet den Timer für die verzögerte Suche neu."""
+        self.search_timer.start()
+
+    def run_search(self):
+        """Führt die Suche aus und zeigt die Treffer an."""
+        self.search_timer.stop()
+        results = self.fulltext_index.search(self.searchInput.text())
+
+        self.resultTable.setRowCount(len(results))
+        for row, result in enumerate(results):
+            self.resultTable.setItem(row, 0, QTableWidgetItem(result["trainee"]))
+            self.resultTable.setItem(row, 1, QTableWidgetItem(result["training"]))
+            self.resultTable.setItem(row, 2, QTableWidgetItem(self.KIND_LABELS.get(result["kind"], result["kind"])))
+            self.resultTable.setItem(row, 3, QTableWidgetItem(result["snippet"]))
+        self.statusLabel.setText(f"{len(results)} Treffer")
+
+    def open_result(self, row, column):
+        """Öffnet das Training des angeklickten Treffers."""
+        if not self.open_training_callback:
+            return
+        trainee_name = self.resultTable.item(row, 0).text()
+        training_name = self.resultTable.item(row, 1).text()
+        self.open_training_callback(trainee_name, training_name)
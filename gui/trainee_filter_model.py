@@ -0,0 +1,38 @@
+from PyQt5.QtCore import QSortFilterProxyModel, Qt
+
+
+class TraineeFilterProxyModel(QSortFilterProxyModel):
+    """Filtert & sortiert die Trainee-Liste nach den Scores des Suchindex.
+
+    Das Quellmodell bleibt unverändert; bei jeder Eingabe werden nur die Scores
+    ausgetauscht und die Ansicht neu gefiltert.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scores = None  # None = keine Suche aktiv, alle Trainees anzeigen
+
+    def set_scores(self, scores):
+        """Setzt die Treffer der aktuellen Suche (Trainee → Score) und filtert neu."""
+        self.scores = scores
+        self.invalidate()
+        self.sort(0)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.scores is None:
+            return True
+        name = self.sourceModel().index(source_row, 0, source_parent).data(Qt.DisplayRole)
+        return name in self.scores
+
+    def lessThan(self, left, right):
+        left_name = left.data(Qt.DisplayRole)
+        right_name = right.data(Qt.DisplayRole)
+        if self.scores is None:
+            return left_name.lower() < right_name.lower()
+
+        # Höchster Score zuerst, bei Gleichstand alphabetisch
+        left_score = self.scores.get(left_name, 0.0)
+        right_score = self.scores.get(right_name, 0.0)
+        if left_score != right_score:
+            return left_score > right_score
+        return left_name.lower() < right_name.lower()
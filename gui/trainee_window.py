@@ -1,16 +1,38 @@
+import bisect
+import threading
 from datetime import datetime
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QListWidget, QMessageBox, QInputDialog, QMenuBar, QAction, QMenu
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QListView, QMessageBox, QInputDialog, QMenuBar, QAction, QMenu, QProgressBar, QFileDialog
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt
-from core.trainee_manager import TraineeManager
-from gui.training_window import TrainingWindow
+from PyQt5.QtCore import Qt, QStringListModel, QTimer, pyqtSignal
+from core.fulltext_index import get_fulltext_index
+from core.search_index import SearchIndex
+from core.trainee_manager import get_trainee_manager
+from gui.file_job import FileJob
+from gui.trainee_filter_model import TraineeFilterProxyModel
 
 class TraineeWindow(QMainWindow):
-    def __init__(self):
+    content_matches_ready = pyqtSignal(str, object)  # Suchtext, Trainee → Score (aus dem Such-Thread)
+
+    TRASH_RETENTION_DAYS = 7  # Gelöschte Trainings bleiben so lange im Papierkorb
+    CONTENT_SEARCH_DELAY_MS = 200  # Volltext erst nach einer Tipp-Pause abfragen
+    purged_trash_folders = set()  # Papierkörbe, die in diesem Prozess schon aufgeräumt wurden
+
+    def __init__(self, trainee_manager=None):
         super().__init__()
-        self.trainee_manager = TraineeManager()
+        self.trainee_manager = trainee_manager or get_trainee_manager()
+        self.search_index = SearchIndex()
+        self.name_scores = None  # Scores der Namenssuche für den aktuellen Suchtext
+        self.catalog = None  # Katalog, dessen Änderungen gerade angezeigt werden
+        self.jobs = []
+        self.last_deleted = None  # (Papierkorb-Pfad, Trainee, Training) für Rückgängig
         self.initUI()
 
+        # Alte Papierkorb-Einträge still im Hintergrund endgültig löschen (einmal pro Prozess, nicht pro Fenster)
+        trash_folder = self.trainee_manager.get_trash_folder()
+        if trash_folder not in TraineeWindow.purged_trash_folders:
+            TraineeWindow.purged_trash_folders.add(trash_folder)
+            self.run_job("Papierkorb aufräumen", self.trainee_manager.purge_trash, self.TRASH_RETENTION_DAYS)
+
     def initUI(self):
         self.setWindowTitle("Trainee Verwaltung")
         self.setGeometry(300, 300, 600, 500)
@@ -39,6 +61,15 @@ class TraineeWindow(QMainWindow):
         self.delete_training_action.triggered.connect(self.delete_training)
         training_menu.addAction(self.delete_training_action)
 
+        self.undo_delete_action = QAction("Löschen rückgängig", self)
+        self.undo_delete_action.setDisabled(True)
+        self.undo_delete_action.triggered.connect(self.undo_delete_training)
+        training_menu.addAction(self.undo_delete_action)
+
+        empty_trash_action = QAction("Papierkorb leeren", self)
+        empty_trash_action.triggered.connect(self.empty_trash)
+        training_menu.addAction(empty_trash_action)
+
         # **🔹 Trainee-Menü**
         trainee_menu = menubar.addMenu("Trainee")
 
@@ -51,12 +82,32 @@ class TraineeWindow(QMainWindow):
         self.rename_trainee_action.triggered.connect(self.rename_trainee)
         trainee_menu.addAction(self.rename_trainee_action)
 
+        trainee_menu.addSeparator()
+        self.export_trainee_action = QAction("Exportieren...", self)
+        self.export_trainee_action.setDisabled(True)
+        self.export_trainee_action.triggered.connect(self.export_trainee)
+        trainee_menu.addAction(self.export_trainee_action)
+
+        export_all_action = QAction("Alle Trainees exportieren...", self)
+        export_all_action.triggered.connect(self.export_all_trainees)
+        trainee_menu.addAction(export_all_action)
+
+        import_action = QAction("Importieren...", self)
+        import_action.triggered.connect(self.import_trainees)
+        trainee_menu.addAction(import_action)
+
         # **🔹 Einstellungen-Menü**
         settings_menu = menubar.addMenu("Einstellungen")
         select_folder_action = QAction("Trainee-Ordner auswählen", self)
         select_folder_action.triggered.connect(self.select_trainee_folder)
         settings_menu.addAction(select_folder_action)
 
+        # **🔹 Suche-Menü**
+        search_menu = menubar.addMenu("Suche")
+        fulltext_search_action = QAction("Volltextsuche", self)
+        fulltext_search_action.triggered.connect(self.open_search_window)
+        search_menu.addAction(fulltext_search_action)
+
         main_layout = QVBoxLayout()
 
         # Suchfeld für Trainees
@@ -66,14 +117,27 @@ class TraineeWindow(QMainWindow):
         self.searchInput.textChanged.connect(self.filter_trainees)
         search_layout.addWidget(self.searchInput)
 
+        # Namen werden sofort gefiltert, Treffer in Notizen & Akten kommen nach einer Tipp-Pause dazu
+        self.content_search_timer = QTimer(self)
+        self.content_search_timer.setSingleShot(True)
+        self.content_search_timer.setInterval(self.CONTENT_SEARCH_DELAY_MS)
+        self.content_search_timer.timeout.connect(self.start_content_search)
+        self.content_matches_ready.connect(self.on_content_matches)
+
         main_layout.addLayout(search_layout)
 
         # **🔹 Trainee-Liste mit Kontextmenü**
-        self.traineeList = QListWidget()
+        self.trainee_model = QStringListModel()
+        self.trainee_proxy = TraineeFilterProxyModel()
+        self.trainee_proxy.setSourceModel(self.trainee_model)
+
+        self.traineeList = QListView()
+        self.traineeList.setModel(self.trainee_proxy)
+        self.traineeList.setEditTriggers(QListView.NoEditTriggers)
         self.traineeList.setContextMenuPolicy(Qt.CustomContextMenu)
         self.traineeList.customContextMenuRequested.connect(self.open_trainee_context_menu)
-        self.traineeList.itemClicked.connect(self.load_trainings)
-        self.traineeList.itemSelectionChanged.connect(self.update_menu_state)
+        self.traineeList.clicked.connect(lambda index: self.load_trainings())
+        self.traineeList.selectionModel().selectionChanged.connect(self.update_menu_state)
         main_layout.addWidget(self.traineeList)
 
         # **🔹 Trainings-Liste mit Kontextmenü**
@@ -87,20 +151,86 @@ class TraineeWindow(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
 
+        # **🔹 Statusleiste mit Fortschritt für Hintergrund-Operationen**
+        self.jobProgress = QProgressBar()
+        self.jobProgress.setMaximumWidth(200)
+        self.jobProgress.hide()
+        self.statusBar().addPermanentWidget(self.jobProgress)
+
+        self.cancelJobButton = QPushButton("Abbrechen")
+        self.cancelJobButton.hide()
+        self.statusBar().addPermanentWidget(self.cancelJobButton)
+
         self.load_trainees()
 
     def load_trainees(self):
-        """Lädt die Trainee-Liste."""
-        self.traineeList.clear()
-        self.traineeList.addItems(self.trainee_manager.get_trainees())
+        """Lädt die Trainee-Liste und baut den Suchindex neu auf (beim Start & nach einem Ordnerwechsel).
+
+        Danach halten die Änderungsmeldungen des Katalogs Liste und Index aktuell.
+        """
+        self.trainee_model.setStringList(self.trainee_manager.get_trainees())
+
+        # Änderungen im Trainee-Ordner (auch von außen) kommen über den Katalog
+        catalog = self.trainee_manager.get_catalog()
+        if catalog is not self.catalog:
+            if self.catalog:
+                self.catalog.events.trainee_changed.disconnect(self.on_trainee_changed)
+            catalog.events.trainee_changed.connect(self.on_trainee_changed)
+            self.catalog = catalog
+
+        fulltext_index = get_fulltext_index()
+        self.search_index = SearchIndex(fulltext_index)
+        self.search_index.build_names(self.trainee_manager)
+        # Volltextindex im Hintergrund abgleichen (liest nur geänderte Dateien neu)
+        threading.Thread(target=fulltext_index.refresh, daemon=True).start()
+
+        self.filter_trainees()
+
+    def on_trainee_changed(self, trainee_name):
+        """Übernimmt eine Katalogänderung in Liste & Suchindex, ohne alles neu aufzubauen."""
+        if self.catalog is None:
+            return  # Meldung war beim Schließen des Fensters schon in der Warteschlange
+        names = self.trainee_model.stringList()
+        exists = self.catalog.has_trainee(trainee_name)
+        if exists and trainee_name not in names:
+            row = bisect.bisect_left([name.lower() for name in names], trainee_name.lower())
+            self.trainee_model.insertRows(row, 1)
+            self.trainee_model.setData(self.trainee_model.index(row), trainee_name)
+        elif not exists and trainee_name in names:
+            self.trainee_model.removeRows(names.index(trainee_name), 1)
+
+        self.search_index.update_names(self.trainee_manager, trainee_name)
+        threading.Thread(target=self.search_index.fulltext_index.refresh_trainee, args=(trainee_name,), daemon=True).start()
+        self.filter_trainees()
+        if self.selected_trainee_name() == trainee_name:
+            self.load_trainings(keep_selection=True)
 
     def filter_trainees(self):
-        """Filtert die Trainee-Liste basierend auf der Sucheingabe."""
-        search_text = self.searchInput.text().lower()
-        self.traineeList.clear()
-        for trainee in self.trainee_manager.get_trainees():
-            if search_text in trainee.lower():
-                self.traineeList.addItem(trainee)
+        """Filtert die Trainee-Liste über den Suchindex (nur die Ansicht, die Liste wird nicht neu aufgebaut)."""
+        self.name_scores = self.search_index.search(self.searchInput.text())
+        self.trainee_proxy.set_scores(self.name_scores)
+        if self.name_scores is None:
+            self.content_search_timer.stop()
+        else:
+            self.content_search_timer.start()
+
+    def start_content_search(self):
+        """Sucht den aktuellen Text im Volltextindex (im Hintergrund, das Tippen bleibt flüssig)."""
+        text = self.searchInput.text()
+        search_index = self.search_index
+        threading.Thread(target=lambda: self.content_matches_ready.emit(text, search_index.match_content(text)),
+                         daemon=True).start()
+
+    def on_content_matches(self, text, content_scores):
+        """Mischt die Volltext-Treffer ein, sofern der Suchtext inzwischen nicht geändert wurde."""
+        if text != self.searchInput.text() or not content_scores:
+            return
+        self.trainee_proxy.set_scores(self.search_index.merge_scores(self.name_scores, content_scores))
+
+    def selected_trainee_name(self):
+        """Gibt den Namen des ausgewählten Trainees zurück (oder None)."""
+        index = self.traineeList.currentIndex()
+        return index.data(Qt.DisplayRole) if index.isValid() else None
 
     def create_trainee(self):
         """Erstellt einen neuen Trainee."""
@@ -115,22 +245,19 @@ class TraineeWindow(QMainWindow):
             QMessageBox.warning(self, "Fehler", f"Der Trainee '{new_name}' existiert bereits.")
             return
 
-        self.trainee_manager.add_trainee(new_name)
-        self.load_trainees()
+        self.trainee_manager.add_trainee(new_name)  # Liste & Suchindex folgen über den Katalog
 
     def rename_trainee(self):
         """Benennt einen Trainee um."""
-        selected_trainee = self.traineeList.currentItem()
-        if not selected_trainee:
+        old_name = self.selected_trainee_name()
+        if not old_name:
             QMessageBox.warning(self, "Fehler", "Kein Trainee ausgewählt.")
             return
 
-        old_name = selected_trainee.text()
         new_name, ok = QInputDialog.getText(self, "Trainee umbenennen", "Neuen Namen eingeben:", text=old_name)
 
         if ok and new_name.strip():
-            self.trainee_manager.rename_trainee(old_name, new_name.strip())
-            self.load_trainees()
+            self.run_job("Trainee umbenennen", self.trainee_manager.rename_trainee, old_name, new_name.strip())
 
     def select_trainee_folder(self):
         """Lässt den Nutzer einen neuen Trainee-Ordner auswählen & lädt die Trainees neu."""
@@ -138,84 +265,146 @@ class TraineeWindow(QMainWindow):
         if new_folder:
             self.load_trainees()
 
+    def export_trainee(self):
+        """Exportiert den ausgewählten Trainee mit allen Trainings als Archiv."""
+        trainee_name = self.selected_trainee_name()
+        if not trainee_name:
+            QMessageBox.warning(self, "Fehler", "Kein Trainee ausgewählt.")
+            return
+        self.export_trainees([trainee_name], trainee_name)
+
+    def export_all_trainees(self):
+        """Exportiert alle Trainees in ein gemeinsames Archiv (z. B. als Backup)."""
+        trainee_names = self.trainee_manager.get_trainees()
+        if trainee_names:
+            self.export_trainees(trainee_names, f"Trainees {datetime.now().strftime('%Y-%m-%d')}")
+
+    def export_trainees(self, trainee_names, default_name):
+        """Fragt nach dem Zielarchiv und exportiert im Hintergrund (abbrechbar)."""
+        archive_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Trainee exportieren", default_name, "Zip-Archiv (*.zip);;Zstandard-Archiv (*.tar.zst)")
+        if not archive_path:
+            return
+        if not archive_path.lower().endswith((".zip", ".tar.zst")):
+            archive_path += ".tar.zst" if "zst" in selected_filter else ".zip"
+
+        def on_exported(exported):
+            if exported:
+                self.statusBar().showMessage(f"📦 Export gespeichert: {archive_path}", 5000)
 
+        self.run_job("Trainees exportieren", self.trainee_manager.export_trainees, trainee_names, archive_path,
+                     on_done=on_exported, reports_progress=True)
 
-    def load_trainings(self):
-        """Lädt die Trainings des gewählten Trainees."""
-        selected_item = self.traineeList.currentItem()
-        if not selected_item:
+    def import_trainees(self):
+        """Importiert Trainees aus einem Export-Archiv im Hintergrund (abbrechbar)."""
+        archive_path, _ = QFileDialog.getOpenFileName(
+            self, "Trainees importieren", "", "TraineeManager-Archive (*.zip *.tar.zst)")
+        if not archive_path:
             return
-        trainee_name = selected_item.text()
+
+        def on_imported(result):
+            if result and result["skipped"]:
+                QMessageBox.information(self, "Import", "Folgende Trainings existieren bereits und wurden nicht importiert:\n\n"
+                                        + "\n".join(result["skipped"]))
+
+        self.run_job("Trainees importieren", self.trainee_manager.import_archive, archive_path,
+                     on_done=on_imported, reports_progress=True)
+
+    def load_trainings(self, keep_selection=False):
+        """Lädt die Trainings des gewählten Trainees (Tooltip: Datum, Screenshots, Akte)."""
+        trainee_name = self.selected_trainee_name()
+        if not trainee_name:
+            return
+        current_item = self.trainingList.currentItem() if keep_selection else None
+        current_training = current_item.text() if current_item else None
         self.trainingList.clear()
-        self.trainingList.addItems(self.trainee_manager.get_trainings(trainee_name))
+        for training_name in self.trainee_manager.get_trainings(trainee_name):
+            item = QListWidgetItem(training_name)
+            info = self.trainee_manager.get_training_info(trainee_name, training_name)
+            if info:
+                akte = "Akte vorhanden" if info["has_akte"] else "keine Akte"
+                item.setToolTip(f"{info['date']} · {info['screenshot_count']} Screenshots · {akte}")
+            self.trainingList.addItem(item)
+            if training_name == current_training:
+                self.trainingList.setCurrentItem(item)
 
     def create_training(self):
         """Erstellt ein neues Training."""
-        selected_trainee = self.traineeList.currentItem()
-        if not selected_trainee:
+        trainee_name = self.selected_trainee_name()
+        if not trainee_name:
             QMessageBox.warning(self, "Fehler", "Kein Trainee ausgewählt.")
             return
 
-        trainee_name = selected_trainee.text()
         training_name, ok = QInputDialog.getText(self, "Neues Training", "Namen des neuen Trainings eingeben:")
 
         if ok and training_name.strip():
+            from gui.training_window import TrainingWindow  # Erst bei Bedarf laden (schnellerer Start)
             training_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             self.trainee_manager.add_training(trainee_name, training_name.strip())
 
-            self.training_window = TrainingWindow(trainee_name, training_name.strip(), training_date)
+            self.training_window = TrainingWindow(trainee_name, training_name.strip(), training_date, trainee_manager=self.trainee_manager)
             self.training_window.show()
             self.close()
 
     def open_training(self):
         """Erstellt ein Training öffnen."""
-        selected_trainee = self.traineeList.currentItem()
-        if not selected_trainee:
+        trainee_name = self.selected_trainee_name()
+        if not trainee_name:
             QMessageBox.warning(self, "Fehler", "Kein Trainee ausgewählt.")
             return
 
-        trainee_name = selected_trainee.text()
         training_name = self.trainingList.currentItem().text()
+        self.open_training_by_name(trainee_name, training_name)
 
-
+    def open_training_by_name(self, trainee_name, training_name):
+        """Öffnet ein Training anhand von Trainee- und Trainingsnamen."""
+        from gui.training_window import TrainingWindow  # Erst bei Bedarf laden (schnellerer Start)
         training_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.trainee_manager.add_training(trainee_name, training_name.strip())
 
-        self.training_window = TrainingWindow(trainee_name, training_name.strip(), training_date)
+        self.training_window = TrainingWindow(trainee_name, training_name.strip(), training_date, trainee_manager=self.trainee_manager)
         self.training_window.show()
         self.close()
 
+    def open_search_window(self):
+        """Öffnet die Volltextsuche über alle Trainings."""
+        from gui.search_window import SearchWindow
+        self.search_window = SearchWindow(self.open_training_by_name)
+        self.search_window.show()
+
     def rename_training(self):
         """Fragt nach einem neuen Namen und benennt das Training um."""
-        selected_trainee = self.traineeList.currentItem()
+        trainee_name = self.selected_trainee_name()
         selected_training = self.trainingList.currentItem()
 
-        if not selected_trainee or not selected_training:
+        if not trainee_name or not selected_training:
             QMessageBox.warning(self, "Fehler", "Bitte zuerst einen Trainee und ein Training auswählen.")
             return
 
         old_name = selected_training.text()
-        trainee_name = selected_trainee.text()
 
         # **💡 `QInputDialog.getText()` verwenden, um den neuen Namen abzufragen**
         new_name, ok = QInputDialog.getText(self, "Training umbenennen", "Neuen Namen eingeben:", text=old_name)
 
         if ok and new_name.strip():
-            self.trainee_manager.rename_training(trainee_name, old_name, new_name.strip())
-            self.load_trainings()
-            QMessageBox.information(self, "Erfolg", f"Training '{old_name}' wurde in '{new_name.strip()}' umbenannt.")
+            new_name = new_name.strip()
+
+            def on_renamed(_):
+                self.load_trainings()
+                QMessageBox.information(self, "Erfolg", f"Training '{old_name}' wurde in '{new_name}' umbenannt.")
+
+            self.run_job("Training umbenennen", self.trainee_manager.rename_training, trainee_name, old_name, new_name, on_done=on_renamed)
 
 
     def delete_training(self):
         """Fragt den Nutzer, bevor ein Training gelöscht wird."""
-        selected_trainee = self.traineeList.currentItem()
+        trainee_name = self.selected_trainee_name()
         selected_training = self.trainingList.currentItem()
 
-        if not selected_trainee or not selected_training:
+        if not trainee_name or not selected_training:
             QMessageBox.warning(self, "Fehler", "Bitte zuerst einen Trainee und ein Training auswählen.")
             return
 
-        trainee_name = selected_trainee.text()
         training_name = selected_training.text()
 
         reply = QMessageBox.question(self, "Training löschen",
@@ -223,9 +412,94 @@ class TraineeWindow(QMainWindow):
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            self.trainee_manager.delete_training(trainee_name, training_name)
+            self.run_job("Training löschen", self.trainee_manager.delete_training, trainee_name, training_name,
+                         on_done=lambda trash_path: self.on_training_deleted(trash_path, trainee_name, training_name))
+
+    def on_training_deleted(self, trash_path, trainee_name, training_name):
+        """Merkt sich das gelöschte Training für Rückgängig und aktualisiert die Liste."""
+        if trash_path:
+            self.last_deleted = (trash_path, trainee_name, training_name)
+            self.undo_delete_action.setEnabled(True)
+            self.statusBar().showMessage(f"Training '{training_name}' gelöscht (Trainings → Löschen rückgängig)", 10000)
+        self.load_trainings()
+
+    def undo_delete_training(self):
+        """Stellt das zuletzt gelöschte Training wieder her."""
+        if not self.last_deleted:
+            return
+
+        trash_path, trainee_name, training_name = self.last_deleted
+        self.last_deleted = None
+        self.undo_delete_action.setDisabled(True)
+
+        def on_restored(restored):
+            if not restored:
+                QMessageBox.warning(self, "Fehler", f"Training '{training_name}' konnte nicht wiederhergestellt werden.")
             self.load_trainings()
 
+        self.run_job("Training wiederherstellen", self.trainee_manager.restore_training, trash_path, trainee_name, training_name,
+                     on_done=on_restored)
+
+    def empty_trash(self):
+        """Löscht alle Trainings im Papierkorb endgültig (abbrechbar)."""
+        reply = QMessageBox.question(self, "Papierkorb leeren",
+                                    "Möchtest du alle gelöschten Trainings endgültig löschen?",
+                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        self.last_deleted = None
+        self.undo_delete_action.setDisabled(True)
+        self.run_job("Papierkorb leeren", self.trainee_manager.purge_trash, 0, reports_progress=True)
+
+    def run_job(self, description, function, *args, on_done=None, reports_progress=False):
+        """Startet eine Dateioperation im Hintergrund und zeigt sie in der Statusleiste an.
+
+        Jobs laufen nacheinander: so greifen nie zwei Operationen gleichzeitig auf
+        denselben Ordner zu, und Fortschrittsbalken & Abbrechen gehören immer zum
+        laufenden Job. Weitere Jobs warten, bis der vorherige fertig ist.
+        """
+        job = FileJob(description, function, *args, reports_progress=reports_progress)
+        self.jobs.append(job)
+        if on_done:
+            job.done.connect(on_done)
+        job.failed.connect(lambda message: QMessageBox.warning(self, "Fehler", message))
+        job.finished.connect(lambda: self.finish_job(job))
+
+        if len(self.jobs) == 1:
+            self.start_job(job)
+        else:
+            self.statusBar().showMessage(f"{description} wartet auf '{self.jobs[0].description}'...")
+        return job
+
+    def start_job(self, job):
+        """Startet den nächsten Job und verbindet Fortschrittsbalken & Abbrechen mit ihm."""
+        self.statusBar().showMessage(f"{job.description}...")
+        if job.reports_progress:
+            self.jobProgress.setValue(0)
+            self.jobProgress.show()
+            self.cancelJobButton.show()
+            self.cancelJobButton.clicked.connect(job.cancel)
+            job.progress.connect(self.update_job_progress)
+        job.start()
+
+    def update_job_progress(self, done, total):
+        """Aktualisiert den Fortschrittsbalken in der Statusleiste."""
+        self.jobProgress.setMaximum(max(total, 1))
+        self.jobProgress.setValue(done)
+
+    def finish_job(self, job):
+        """Räumt nach einer abgeschlossenen Hintergrund-Operation auf und startet den nächsten Job."""
+        self.jobs.remove(job)
+        if job.reports_progress:
+            self.cancelJobButton.clicked.disconnect(job.cancel)
+            self.jobProgress.hide()
+            self.cancelJobButton.hide()
+        if self.statusBar().currentMessage() == f"{job.description}...":
+            self.statusBar().clearMessage()
+        if self.jobs:
+            self.start_job(self.jobs[0])
+
     def open_trainee_context_menu(self, position):
         """Öffnet das Kontextmenü für Trainees."""
         menu = QMenu()
@@ -238,6 +512,10 @@ class TraineeWindow(QMainWindow):
         rename_action.triggered.connect(self.rename_trainee)
         menu.addAction(rename_action)
 
+        export_action = QAction("Trainee exportieren", self)
+        export_action.triggered.connect(self.export_trainee)
+        menu.addAction(export_action)
+
         menu.exec_(self.traineeList.viewport().mapToGlobal(position))
 
     def open_training_context_menu(self, position):
@@ -264,13 +542,19 @@ class TraineeWindow(QMainWindow):
 
     def update_menu_state(self):
         """Aktualisiert die Aktivierung der Menüeinträge basierend auf der Auswahl."""
-        trainee_selected = self.traineeList.currentItem() is not None
+        trainee_selected = self.selected_trainee_name() is not None
         training_selected = self.trainingList.currentItem() is not None
 
         self.rename_trainee_action.setEnabled(trainee_selected)
+        self.export_trainee_action.setEnabled(trainee_selected)
         self.create_training_action.setEnabled(trainee_selected)
         self.rename_training_action.setEnabled(training_selected)
         self.delete_training_action.setEnabled(training_selected)
 
-
-
+    def closeEvent(self, event):
+        """Meldet das Fenster vom Katalog ab, damit geschlossene Fenster keine Änderungen mehr verarbeiten."""
+        if self.catalog:
+            self.catalog.events.trainee_changed.disconnect(self.on_trainee_changed)
+            self.catalog = None
+        self.content_search_timer.stop()
+        event.accept()
@@ -1,22 +1,31 @@
-import base64
 import sys
 import os
 import json
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QTableWidget, QHeaderView, QToolBar, QAction, QTextEdit, QFontComboBox, QSpinBox, QTableWidgetItem, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPushButton, QMenu, QAction, QMessageBox, QMenuBar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QTableView, QHeaderView, QToolBar, QAction, QTextEdit, QFontComboBox, QSpinBox, QVBoxLayout, QHBoxLayout, QLabel, QTextEdit, QPushButton, QMenu, QAction, QMessageBox, QMenuBar
 from PyQt5.QtGui import QPixmap, QFont, QTextCharFormat
-from PyQt5.QtCore import Qt
-import requests
-
-from gui.notes_window import NotesWindow
-from gui.akte_window import AkteWindow
-from core.trainee_manager import TraineeManager
-from gui.progress_window import ProgressWindow
-from core import server_uploader
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+
+from gui.screenshot_table_model import ScreenshotTableModel
+from core.autosave import AutosaveService
+from core.change_feed import ChangeFeed, document_text
+from core.perf import span, timed
+from core.trainee_manager import get_trainee_manager
+from core.thumbnail_cache import ThumbnailCache
+from core.upload_journal import UploadJournal
 from core import screenshot_manager
 
+# Upload (requests), Akte (pyperclip) und Notiz-Popout werden erst beim ersten Öffnen importiert
+
 
 class TrainingWindow(QMainWindow):
-    def __init__(self, trainee_name, training_name, training_date, training_id=None):
+    uploads_pending = pyqtSignal(int, int)  # erledigt, noch ausstehend (aus dem Upload-Thread)
+
+    UPLOAD_RETRY_DELAY_MS = 5000  # Erster neuer Versuch, wenn Uploads ausstehen (z. B. offline)
+    MAX_UPLOAD_RETRY_DELAY_MS = 5 * 60 * 1000
+
+    def __init__(self, trainee_name, training_name, training_date, training_id=None, trainee_manager=None):
         super().__init__()
         
         self.trainee_name = trainee_name
@@ -27,14 +36,28 @@ class TrainingWindow(QMainWindow):
         self.training_id = training_id
 
         self.server_uploader = None
-
-        self.trainee_manager = TraineeManager()
-        self.training_folder = self.trainee_manager.get_training_folder(trainee_name, training_name)
-
-        self.screenshot_manager = screenshot_manager.ScreenshotManager(trainee_name, training_name, self, self.update_screenshot_list)
-        
-        self.initUI()
-        self.screenshot_manager.start_watching()
+        self.live_channel = None  # Live-Ereignisse an die Debrief-Seiten, sobald das Debrief läuft
+        self.change_feed = None  # Deltas von Notizen & Bemerkungen über den Live-Kanal
+        self.upload_executor = ThreadPoolExecutor(max_workers=2)  # Live-Uploads während des Debriefs
+        self.upload_cancel_event = threading.Event()  # Beim Schließen: keine neuen Uploads mehr starten
+        self.upload_retry_delay = self.UPLOAD_RETRY_DELAY_MS
+        self.upload_retry_timer = QTimer(self)  # Arbeitet das Journal erneut ab, solange das Fenster offen ist
+        self.upload_retry_timer.setSingleShot(True)
+        self.upload_retry_timer.timeout.connect(self.resume_pending_uploads)
+        self.uploads_pending.connect(self.schedule_upload_retry)
+
+        with span("training_window.open"):
+            self.trainee_manager = trainee_manager or get_trainee_manager()
+            self.training_folder = self.trainee_manager.get_training_folder(trainee_name, training_name)
+
+            self.screenshot_manager = screenshot_manager.ScreenshotManager(trainee_name, training_name, self, self.add_screenshot_row, self.trainee_manager)
+            self.screenshot_model = ScreenshotTableModel(self.screenshot_manager)
+            self.thumbnail_cache = ThumbnailCache()
+            self.thumbnail_cache.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+            self.initUI()
+            self.screenshot_manager.start_watching()
+            self.resume_pending_uploads()
 
     def initUI(self):
         self.setWindowTitle(f"Trainee Manager - Training {self.training_name}")
@@ -122,9 +145,8 @@ class TrainingWindow(QMainWindow):
         bottom_layout = QHBoxLayout()
 
         # Screenshot-Tabelle (2/3 Breite)
-        self.screenshotTable = QTableWidget()
-        self.screenshotTable.setColumnCount(2)
-        self.screenshotTable.setHorizontalHeaderLabels(["Screenshot", "Bemerkung"])
+        self.screenshotTable = QTableView()
+        self.screenshotTable.setModel(self.screenshot_model)
 
         # **🔹 Automatische Spaltenverteilung**
         header = self.screenshotTable.horizontalHeader()
@@ -133,8 +155,7 @@ class TrainingWindow(QMainWindow):
 
         self.screenshotTable.setContextMenuPolicy(Qt.CustomContextMenu)
         self.screenshotTable.customContextMenuRequested.connect(self.open_context_menu)
-        self.screenshotTable.itemSelectionChanged.connect(self.load_screenshot)
-        self.screenshotTable.itemChanged.connect(self.save_screenshot_note)
+        self.screenshotTable.selectionModel().currentRowChanged.connect(self.load_screenshot)
         bottom_layout.addWidget(self.screenshotTable, 2)  # 2/3 der Breite
 
         # Screenshot-Vorschau (1/3 Breite)
@@ -172,6 +193,13 @@ class TrainingWindow(QMainWindow):
 
         self.load_training_data()
 
+        # **🔹 Automatisches Speichern der Notizen nach kurzer Tipp-Pause**
+        self.notes_autosave = AutosaveService(os.path.join(self.training_folder, "notes.txt"), self.generalNotes.toPlainText,
+                                              AutosaveService.configured_interval(self.trainee_manager), parent=self,
+                                              on_flushed=self.screenshot_manager.update_fulltext_index)
+        self.generalNotes.textChanged.connect(self.notes_autosave.touch)
+
+    @timed("training_window.load_training_data")
     def load_training_data(self):
         """Lädt vorhandene Screenshots und Notizen. Erstellt Dateien falls sie fehlen."""
         comments_file = os.path.join(self.training_folder, "comments.json")
@@ -196,61 +224,54 @@ class TrainingWindow(QMainWindow):
             self.generalNotes.setText(f.read())
 
         """Lädt Screenshots & Bemerkungen in die Tabelle."""
-        screenshots = self.screenshot_manager.get_screenshots()
-        self.screenshotTable.setRowCount(len(screenshots))
-
-        # Lade bestehende Bemerkungen
-        comments = self.screenshot_manager.load_all_comments()
-
-        for row, screenshot in enumerate(screenshots):
-            filename_item = QTableWidgetItem(screenshot)
-            filename_item.setFlags(filename_item.flags() & ~Qt.ItemIsEditable)  # Filename nicht editierbar
+        self.screenshot_model.reload()
 
-            # Lade bestehende Bemerkung oder setze leeren Text
-            comment_text = comments.get(screenshot, "")
-            comment_item = QTableWidgetItem(comment_text)
-
-            self.screenshotTable.setItem(row, 0, filename_item)
-            self.screenshotTable.setItem(row, 1, comment_item)
-
-            # Falls kein Kommentar existiert, fokussiere direkt das Feld
-            if comment_text == "":
-                self.screenshotTable.setCurrentCell(row, 1)
+        # Falls Screenshots ohne Bemerkung existieren, fokussiere direkt das Feld des letzten
+        for row in reversed(range(self.screenshot_model.rowCount())):
+            if self.screenshot_model.comment(self.screenshot_model.screenshot_name(row)) == "":
+                self.screenshotTable.setCurrentIndex(self.screenshot_model.index(row, 1))
+                break
 
     def update_screenshot_list(self):
-        """Aktualisiert die Screenshot-Tabelle."""
-        self.screenshotTable.clearContents()
-        self.screenshotTable.setRowCount(0)  # Zurücksetzen
-
-        screenshots = self.screenshot_manager.get_screenshots()
-        comments = self.screenshot_manager.load_all_comments()
-
-        self.screenshotTable.setRowCount(len(screenshots))
-
-        for row, screenshot in enumerate(screenshots):
-            filename_item = QTableWidgetItem(screenshot)
-            filename_item.setFlags(filename_item.flags() & ~Qt.ItemIsEditable)  # Name nicht editierbar
+        """Lädt die Screenshot-Tabelle komplett neu (Refresh)."""
+        self.screenshot_model.reload()
 
-            comment_text = comments.get(screenshot, "")
-            comment_item = QTableWidgetItem(comment_text)
+    def add_screenshot_row(self, screenshot_path):
+        """Fügt einen neu erkannten Screenshot als einzelne Zeile hinzu."""
+        self.screenshot_model.add_screenshot(os.path.basename(screenshot_path))
+        self.thumbnail_cache.request(screenshot_path)  # Vorschau schon vor der ersten Auswahl erzeugen
 
-            self.screenshotTable.setItem(row, 0, filename_item)
-            self.screenshotTable.setItem(row, 1, comment_item)
+    def current_screenshot_name(self):
+        """Gibt den Namen des ausgewählten Screenshots zurück (oder None)."""
+        selected_row = self.screenshotTable.currentIndex().row()
+        if selected_row == -1:
+            return None
+        return self.screenshot_model.screenshot_name(selected_row)
 
 
     def load_screenshot(self):
         """Lädt den Screenshot in die Vorschau, wenn eine Zeile angeklickt wird."""
-        selected_row = self.screenshotTable.currentRow()
-        if selected_row == -1:
+        screenshot_name = self.current_screenshot_name()
+        if screenshot_name is None:
             return
 
-        screenshot_name = self.screenshotTable.item(selected_row, 0).text()
         screenshot_path = os.path.join(self.screenshot_manager.training_folder,"screenshots", screenshot_name)
 
-        if os.path.exists(screenshot_path):
-            self.screenshotPreview.setPixmap(QPixmap(screenshot_path).scaled(400, 300, Qt.KeepAspectRatio))
-        else:
+        if not os.path.exists(screenshot_path):
             self.screenshotPreview.setText("Fehler: Datei nicht gefunden")
+            return
+
+        thumbnail = self.thumbnail_cache.get(screenshot_path)
+        if thumbnail is not None:
+            self.screenshotPreview.setPixmap(QPixmap.fromImage(thumbnail))
+        else:
+            self.screenshotPreview.setText("Vorschau wird geladen...")
+            self.thumbnail_cache.request(screenshot_path)
+
+    def on_thumbnail_ready(self, screenshot_path):
+        """Zeigt ein fertig erzeugtes Vorschaubild an, falls der Screenshot noch ausgewählt ist."""
+        if os.path.basename(screenshot_path) == self.current_screenshot_name():
+            self.load_screenshot()
 
 
     def on_new_screenshot_detected(self, screenshot_path):
@@ -260,12 +281,13 @@ class TrainingWindow(QMainWindow):
         """
         screenshot_name = os.path.basename(screenshot_path)
 
-        if self.screenshot_notes_window:
-                self.screenshot_notes_window.update_screenshot(screenshot_name)
+        screenshot_notes_window = getattr(self, "screenshot_notes_window", None)
+        if screenshot_notes_window:
+                screenshot_notes_window.update_screenshot(screenshot_name)
                 
         if self.server_uploader:
             print(f"📸 Neuer Screenshot erkannt: {screenshot_name} (wird hochgeladen)")
-            self.upload_screenshot(screenshot_name, screenshot_path)  # ✅ Hochladen
+            self.upload_screenshot(screenshot_name, screenshot_path)  # ✅ Hochladen, Live-Ereignis erst nach Erfolg
         else:
             print(f"📸 Neuer Screenshot erkannt: {screenshot_name} (aber Debrief noch nicht gestartet)")
 
@@ -273,7 +295,7 @@ class TrainingWindow(QMainWindow):
 
 
     def upload_screenshot(self, screenshot_name, screenshot_path):
-        """Lädt einen Screenshot automatisch auf den Server hoch."""
+        """Lädt einen Screenshot im Hintergrund automatisch auf den Server hoch."""
         if not os.path.exists(screenshot_path):
             QMessageBox.warning(self, "Fehler", f"Screenshot '{screenshot_name}' wurde nicht gefunden.")
             return
@@ -283,46 +305,53 @@ class TrainingWindow(QMainWindow):
             print(f"⚠️ Screenshot '{screenshot_name}' konnte nicht hochgeladen werden (Debrief nicht gestartet).")
             return
 
-        try:
-            with open(screenshot_path, "rb") as file:
-                encoded_string = base64.b64encode(file.read()).decode("utf-8")
-
-            url = f"{self.server_uploader.api_base_url}/{self.server_uploader.training_id}/upload"
-            payload = {
-                "file": encoded_string,
-                "filename": screenshot_name
-            }
-
-            response = requests.post(url, json=payload)
+        # Über das Journal, damit der Upload auch nach einem Verbindungsabbruch oder Neustart nachgeholt wird
+        self.upload_executor.submit(self.run_upload, self.server_uploader.upload_screenshots,
+                                    [(screenshot_name, screenshot_path)], None, self.upload_cancel_event)
+
+    def run_upload(self, upload, *args):
+        """Führt einen Upload im Upload-Thread aus und meldet, was danach noch im Journal steht."""
+        done, failed, remaining = upload(*args)
+        if not self.upload_cancel_event.is_set():
+            self.uploads_pending.emit(done, remaining)
+
+    def resume_pending_uploads(self):
+        """Setzt Uploads fort, die in einer früheren Sitzung nicht fertig geworden sind."""
+        if UploadJournal.has_pending(self.training_folder):
+            print("⏯️ Ausstehende Uploads gefunden, werden im Hintergrund fortgesetzt.")
+            self.upload_executor.submit(self.run_upload, self.drain_pending_uploads)
+
+    def schedule_upload_retry(self, done, remaining):
+        """Plant den nächsten Durchlauf durch das Journal; die Wartezeit verdoppelt sich ohne Fortschritt."""
+        if self.upload_cancel_event.is_set():
+            return
+        if done or not remaining:
+            self.upload_retry_delay = self.UPLOAD_RETRY_DELAY_MS
+        if remaining and not self.upload_retry_timer.isActive():
+            print(f"🔁 Neuer Upload-Versuch in {self.upload_retry_delay / 1000:.0f} s")
+            self.upload_retry_timer.start(self.upload_retry_delay)
+            self.upload_retry_delay = min(self.upload_retry_delay * 2, self.MAX_UPLOAD_RETRY_DELAY_MS)
 
-            if response.status_code == 200:
-                print(f"✅ Screenshot '{screenshot_name}' erfolgreich hochgeladen.")
-            else:
-                print(f"⚠️ Fehler beim Hochladen von {screenshot_name}: {response.status_code} - {response.text}")
+    def drain_pending_uploads(self):
+        """Arbeitet das Upload-Journal im Hintergrund ab (eigener Uploader, das Debrief bleibt unverändert)."""
+        from core import server_uploader
 
-        except Exception as e:
-            print(f"❌ Fehler beim Hochladen von {screenshot_name}: {e}")
+        uploader = server_uploader.ServerUploader(self.trainee_name, self.training_name, self.training_date, trainee_manager=self.trainee_manager)
+        uploader.on_screenshot_uploaded = self.on_screenshot_uploaded
+        return uploader.drain(self.upload_cancel_event)
 
 
     def save_general_notes(self):
         """Speichert die allgemeinen Notizen."""
         self.screenshot_manager.save_general_notes(self.generalNotes)
 
-    def save_screenshot_note(self, item):
-        """Speichert die Bemerkung zum Screenshot, wenn die zweite Spalte geändert wird."""
-        if item.column() == 1:  # Nur Änderungen in der Bemerkungs-Spalte speichern
-            screenshot_name = self.screenshotTable.item(item.row(), 0).text()
-            comment = item.text()
-            self.screenshot_manager.save_screenshot_comment(screenshot_name, comment)
-
     def save_all_data(self):
         """Speichert allgemeine Notizen & Screenshot-Bemerkungen."""
         self.save_general_notes()
 
-        for row in range(self.screenshotTable.rowCount()):
-            screenshot_name = self.screenshotTable.item(row, 0).text()
-            comment = self.screenshotTable.item(row, 1).text()
-            self.screenshot_manager.save_screenshot_comment(screenshot_name, comment)
+        comments = {name: self.screenshot_model.comment(name) for name in self.screenshot_model.screenshots}
+        self.screenshot_manager.save_screenshot_comments(comments)
+        self.screenshot_manager.flush_comments()
 
         print("✅ Alle Daten gespeichert!")
 
@@ -334,6 +363,11 @@ class TrainingWindow(QMainWindow):
         open_paint_action.triggered.connect(self.open_in_paint)
         menu.addAction(open_paint_action)
 
+        if self.live_channel:
+            show_action = QAction("Dem Trainee zeigen", self)
+            show_action.triggered.connect(self.show_screenshot_to_trainee)
+            menu.addAction(show_action)
+
         delete_action = QAction("Screenshot löschen", self)
         delete_action.triggered.connect(self.delete_screenshot)
         menu.addAction(delete_action)
@@ -342,49 +376,80 @@ class TrainingWindow(QMainWindow):
 
     def open_in_paint(self):
         """Ruft die Paint-Funktion aus `screenshot_manager.py` auf."""
-        selected_row = self.screenshotTable.currentRow()
-        if selected_row != -1:
-            screenshot_name = self.screenshotTable.item(selected_row, 0).text()
+        screenshot_name = self.current_screenshot_name()
+        if screenshot_name is not None:
             self.screenshot_manager.open_in_paint(screenshot_name)
 
+    def show_screenshot_to_trainee(self):
+        """Zeigt den ausgewählten Screenshot live auf den Debrief-Seiten an."""
+        screenshot_name = self.current_screenshot_name()
+        if screenshot_name is not None:
+            self.send_live_event("show_screenshot", filename=screenshot_name)
+
+    def on_notes_contents_change(self, position, chars_removed, chars_added):
+        """Gibt Änderungen der General Notes als Patch an den Live-Abgleich weiter."""
+        document = self.generalNotes.document()
+        inserted_text = document_text(document, position, chars_added)
+        self.change_feed.notes_changed(position, chars_removed, inserted_text, document.characterCount() - 1)
+
+    def on_screenshot_uploaded(self, screenshot_name):
+        """Meldet einen Screenshot erst live, wenn der Server ihn hat (läuft im Upload-Thread, `send` ist thread-sicher)."""
+        self.send_live_event("screenshot", filename=screenshot_name)
+
+    def send_live_event(self, event_type, **data):
+        """Sendet ein Ereignis über den Live-Kanal (ohne Debrief passiert nichts)."""
+        if self.live_channel:
+            self.live_channel.send(event_type, **data)
+
     def delete_screenshot(self):
         """Ruft die Lösch-Funktion aus `screenshot_manager.py` auf."""
-        selected_row = self.screenshotTable.currentRow()
-        if selected_row != -1:
-            screenshot_name = self.screenshotTable.item(selected_row, 0).text()
+        screenshot_name = self.current_screenshot_name()
+        if screenshot_name is not None:
             self.screenshot_manager.delete_screenshot(screenshot_name)
-            self.update_screenshot_list()  # Nach dem Löschen Liste aktualisieren
+            self.screenshot_model.remove_screenshot(screenshot_name)  # Nur die gelöschte Zeile entfernen
 
 
     def start_debrief(self):
         """Speichert alle Daten & lädt sie auf den Server hoch."""
+        from core import server_uploader
+        from core.live_channel import LiveChannel
+        from gui.progress_window import ProgressWindow
+
         self.save_all_data()  # Lokale Speicherung vor dem Upload
-        self.server_uploader = server_uploader.ServerUploader(self.trainee_name, self.training_name, self.training_date)  
+        self.server_uploader = server_uploader.ServerUploader(self.trainee_name, self.training_name, self.training_date, trainee_manager=self.trainee_manager)  
+        self.server_uploader.on_screenshot_uploaded = self.on_screenshot_uploaded
         self.progress_window = ProgressWindow(self.server_uploader)
         self.progress_window.show()
 
+        if self.live_channel is None:
+            self.live_channel = LiveChannel(self.server_uploader.api_base_url, self.server_uploader.training_id)
+            self.live_channel.start()
+
+            # Ab jetzt nur noch Änderungen übertragen: Grundlage senden, dann Deltas
+            self.change_feed = ChangeFeed(self.live_channel, self.generalNotes.toPlainText, parent=self)
+            self.change_feed.reset_notes()
+            self.generalNotes.document().contentsChange.connect(self.on_notes_contents_change)
+            self.screenshot_manager.comment_store.on_changed = self.change_feed.comments_changed
+
 
     def open_trainee_window(self):
         """Öffnet das Trainee-Verwaltungsfenster."""
         from gui.trainee_window import TraineeWindow
-        self.trainee_window = TraineeWindow()
+        self.trainee_window = TraineeWindow(self.trainee_manager)
         self.trainee_window.show()
    
     def open_akte_window(self):
         """Öffnet die Akte für das aktuelle Training."""
+        from gui.akte_window import AkteWindow
         self.akte_window = AkteWindow(self.training_name, self.training_date, self.training_folder)
         self.akte_window.show()
 
     def open_notes_window(self):
-        """Öffnet das Notizen-Popout-Fenster & verbindet es mit den General Notes."""
-        self.notes_window = NotesWindow(self.training_folder)
-        self.notes_window.notes_updated.connect(self.update_general_notes)  # ✅ Verbindung zum Signal
+        """Öffnet das Notizen-Popout-Fenster auf dem Dokument der General Notes."""
+        from gui.notes_window import NotesWindow
+        self.notes_window = NotesWindow(self.generalNotes.document())  # Autosave & Live-Abgleich bleiben hier
         self.notes_window.show()
 
-    def update_general_notes(self, text):
-        """Aktualisiert das General Notes Feld im TrainingWindow, wenn sich Notizen ändern."""
-        self.generalNotes.setPlainText(text)  # ✅ Automatische Aktualisierung
-
     
     def end_training(self):
         """Speichert das Training und schließt das Fenster."""
@@ -426,6 +491,20 @@ class TrainingWindow(QMainWindow):
     def closeEvent(self, event):
         """Wird aufgerufen, wenn das Fenster geschlossen wird."""
         self.screenshot_manager.stop_watching()
+        self.screenshot_manager.flush_comments()
+        notes_window = getattr(self, "notes_window", None)
+        if notes_window:
+            notes_window.close()  # Das Popout zeigt das Dokument der General Notes
+        self.notes_autosave.close()
+        self.upload_retry_timer.stop()
+        self.upload_cancel_event.set()  # Laufende Uploads beenden, der Rest bleibt im Journal
+        self.upload_executor.shutdown(wait=False)
+        if self.change_feed:
+            self.screenshot_manager.comment_store.on_changed = None
+            self.change_feed.flush()
+        if self.live_channel:
+            self.live_channel.close()
+        self.thumbnail_cache.shutdown()
         event.accept()
     
 if __name__ == "__main__":
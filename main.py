@@ -1,11 +1,15 @@
+import multiprocessing
 import sys
 from PyQt5.QtWidgets import QApplication
 
+from core.perf import span
 from gui.trainee_window import TraineeWindow
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Gepackte Windows-Version: Worker der Bildaufbereitung starten sonst die GUI neu
     app = QApplication(sys.argv)
-    window = TraineeWindow()
-    window.show()
+    with span("startup.trainee_window"):
+        window = TraineeWindow()
+        window.show()
     sys.exit(app.exec_())
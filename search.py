@@ -0,0 +1,26 @@
+import argparse
+import sys
+
+from core.fulltext_index import get_fulltext_index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Volltextsuche über Notizen, Bemerkungen und Akten aller Trainings.")
+    parser.add_argument("query", nargs="?", help="Suchbegriff(e); alle Wörter müssen vorkommen")
+    parser.add_argument("--limit", type=int, default=50, help="maximale Anzahl Treffer")
+    parser.add_argument("--no-refresh", action="store_true", help="Index vor der Suche nicht mit der Platte abgleichen")
+    args = parser.parse_args()
+
+    fulltext_index = get_fulltext_index()
+    if not args.no_refresh:
+        fulltext_index.refresh()
+
+    if not args.query:
+        sys.exit(0)
+
+    results = fulltext_index.search(args.query, args.limit)
+    for result in results:
+        print(f"{result['trainee']} / {result['training']} [{result['kind']}]: {result['snippet']}")
+    if not results:
+        print("Keine Treffer.")
+        sys.exit(1)
@@ -0,0 +1,565 @@
+"""Benchmarks für die Dateisystem- und Upload-Pfade des TraineeManagers.
+
+Erzeugt einen synthetischen Trainee-Ordner, misst die heißen Pfade von
+`TraineeManager`, der Trainee-Suche (Taste für Taste über 10k Trainings),
+`ScreenshotManager` und `ServerUploader` (gegen den lokalen Debrief-Server aus
+`tools/debrief_server.py`) und vergleicht die Mediane mit
+einer gespeicherten Baseline. Zusätzlich wird der Spitzenverbrauch an Speicher
+beim Upload kleiner und großer Screenshots gemessen (`--memory-sizes`): er muss
+unabhängig von der Dateigröße bleiben, da der Body gestreamt wird.
+
+Aufruf aus dem Projektordner:
+    python tools/benchmark.py                          # Skala "small", Vergleich mit Baseline
+    python tools/benchmark.py --scale full             # 1k Trainees, 10k Trainings, 100k Screenshots
+    python tools/benchmark.py --scale full --tree-dir D:/bench   # Baum wiederverwenden
+    python tools/benchmark.py --save-baseline          # Ergebnis als neue Baseline speichern
+Der Exit-Code ist 1, wenn ein Benchmark mehr als `--threshold` langsamer als die Baseline ist
+oder eine Prüfung fehlschlägt (Speicherbedarf beim Upload wächst mit der Dateigröße,
+Screenshot-Burst verliert Dateien oder das Stoppen der Worker blockiert).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(PROJECT_DIR, "tools", "benchmark_baseline.json")
+sys.path.insert(0, PROJECT_DIR)
+
+from tools.debrief_server import DebriefServer, FaultConfig
+
+# Skala → (Trainees, Trainings pro Trainee, Screenshots pro Training)
+SCALES = {
+    "small": (100, 10, 10),
+    "medium": (300, 10, 10),
+    "full": (1000, 10, 10),
+}
+
+# Der Speicherbedarf eines Uploads darf mit der Dateigröße höchstens um so viel wachsen
+UPLOAD_MEMORY_SLACK_KIB = 2048
+
+# Werden Taste für Taste in die Trainee-Suche getippt (Name, Trainingsname, Notizen)
+SEARCH_QUERIES = ["Trainee 0815", "Training 07", "notizen zu training 3 von"]
+
+# Kleinstes gültiges PNG (1×1 Pixel) für den synthetischen Baum
+TINY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100ffff03000006000557bfab"
+    "d40000000049454e44ae426082"
+)
+
+
+class DummyTrainingWindow:
+    """Ersatz für das Trainingsfenster; der `ScreenshotManager` verbindet nur dieses Signal-Ziel."""
+
+    def on_new_screenshot_detected(self, screenshot_path):
+        pass
+
+
+def generate_tree(trainee_folder, trainees, trainings, screenshots):
+    """Erzeugt den synthetischen Trainee-Ordner (wird übersprungen, falls er schon in dieser Größe existiert)."""
+    marker = os.path.join(trainee_folder, f".benchmark-{trainees}-{trainings}-{screenshots}")
+    if os.path.exists(marker):
+        print(f"♻️ Verwende vorhandenen Baum: {trainee_folder}")
+        return
+
+    if os.path.isdir(trainee_folder):
+        shutil.rmtree(trainee_folder)
+    print(f"🏗️ Erzeuge {trainees} Trainees × {trainings} Trainings × {screenshots} Screenshots...")
+    start = time.perf_counter()
+    for trainee_index in range(trainees):
+        for training_index in range(trainings):
+            training_folder = os.path.join(trainee_folder, f"Trainee {trainee_index:04d}", f"Training {training_index:02d}")
+            screenshots_folder = os.path.join(training_folder, "screenshots")
+            os.makedirs(screenshots_folder)
+
+            comments = {}
+            for screenshot_index in range(screenshots):
+                screenshot_name = f"screenshot_{screenshot_index:03d}.png"
+                with open(os.path.join(screenshots_folder, screenshot_name), "wb") as f:
+                    f.write(TINY_PNG)
+                comments[screenshot_name] = f"Bemerkung {screenshot_index} zu Training {training_index}"
+
+            with open(os.path.join(training_folder, "comments.json"), "w", encoding="utf-8") as f:
+                json.dump(comments, f)
+            with open(os.path.join(training_folder, "notes.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Notizen zu Training {training_index} von Trainee {trainee_index}\n")
+    open(marker, "w").close()
+    print(f"   fertig in {time.perf_counter() - start:.1f} s")
+
+
+def create_upload_training(trainee_folder, count, size, training_name="Upload Training"):
+    """Legt ein eigenes Training mit `count` zufälligen Screenshots à `size` Bytes für die Upload-Benchmarks an."""
+    training_folder = os.path.join(trainee_folder, "Upload Trainee", training_name)
+    screenshots_folder = os.path.join(training_folder, "screenshots")
+    if os.path.isdir(training_folder):
+        shutil.rmtree(training_folder)
+    os.makedirs(screenshots_folder)
+    for index in range(count):
+        with open(os.path.join(screenshots_folder, f"upload_{index:03d}.png"), "wb") as f:
+            f.write(os.urandom(size))  # Zufallsinhalt, damit die Inhalts-Deduplizierung nichts überspringt
+    return training_folder
+
+
+def start_server_process():
+    """Startet den Debrief-Server als eigenen Prozess und gibt (Prozess, API-URL) zurück.
+
+    Für die Speichermessung: der Server hält alle Uploads im Speicher und würde
+    im selben Prozess die Messung des Clients überdecken.
+    """
+    process = subprocess.Popen([sys.executable, "-u", os.path.join(PROJECT_DIR, "tools", "debrief_server.py"), "--port", "0"],
+                               stdout=subprocess.PIPE, encoding="utf-8", env=dict(os.environ, PYTHONIOENCODING="utf-8"))
+    match = re.search(r"http://\S+", process.stdout.readline())
+    if not match:
+        process.kill()
+        raise RuntimeError("Debrief-Server konnte nicht gestartet werden")
+    return process, match.group(0) + "/api"
+
+
+def measure_upload_memory(manager, trainee_folder, api_base_url, size_mb):
+    """Lädt einen Screenshot mit `size_mb` MB hoch und gibt den Spitzenverbrauch des Clients in KiB zurück (tracemalloc)."""
+    from core.server_uploader import ServerUploader
+
+    training_name = f"Speicher {size_mb} MB"
+    screenshots_folder = os.path.join(trainee_folder, "Memory Trainee", training_name, "screenshots")
+    os.makedirs(screenshots_folder, exist_ok=True)
+    screenshot_path = os.path.join(screenshots_folder, "large.png")
+    with open(screenshot_path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        uploader = ServerUploader("Memory Trainee", training_name, "2025-01-01 00:00:00", api_base_url=api_base_url,
+                                  trainee_manager=manager)
+        tracemalloc.start()
+        try:
+            start_memory, _ = tracemalloc.get_traced_memory()
+            success = uploader.upload_screenshot("large.png", screenshot_path)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    if not success:
+        raise RuntimeError(f"Upload mit {size_mb} MB fehlgeschlagen")
+
+    result = {"peak_kib": (peak_memory - start_memory) / 1024}
+    print(f"   {'server_uploader.upload_memory (' + str(size_mb) + ' MB)':<45} peak   {result['peak_kib']:10.0f} KiB")
+    return result
+
+
+class BurstEventBridge:
+    """Ersatz für die `ScreenshotEventBridge`: sammelt die Pfade verschobener Screenshots (ohne Qt-Event-Loop)."""
+
+    def __init__(self):
+        self.moved = []
+        self.screenshot_moved = self  # `screenshot_moved.emit(path)` wie beim Qt-Signal
+
+    def emit(self, path):
+        self.moved.append(path)
+
+
+def write_slowly(path, size, chunks, duration):
+    """Schreibt eine Datei in `chunks` Blöcken über `duration` Sekunden (wie ein langsames Screenshot-Tool)."""
+    with open(path, "wb") as f:
+        for index in range(chunks):
+            f.write(os.urandom(size // chunks + (size % chunks if index == chunks - 1 else 0)))
+            f.flush()
+            time.sleep(duration / chunks)
+
+
+def start_screenshot_burst(handler, source_folder, count, size, write_duration):
+    """Legt `count` Screenshots gleichzeitig an und meldet sie dem Handler, sobald die Datei existiert (wie watchdog)."""
+    from watchdog.events import FileCreatedEvent
+
+    os.makedirs(source_folder, exist_ok=True)
+    writers = []
+    for index in range(count):
+        path = os.path.join(source_folder, f"Burst {index:03d}.png")
+        open(path, "wb").close()
+        writer = threading.Thread(target=write_slowly, args=(path, size, 10, write_duration))
+        writer.start()
+        writers.append(writer)
+        handler.on_created(FileCreatedEvent(path))
+    return writers
+
+
+def run_screenshot_burst(handler, source_folder, count, size, write_duration, timeout=60.0):
+    """Burst mit langsamen Schreibern: wartet, bis alle Screenshots verschoben sind, und prüft sie auf Vollständigkeit."""
+    handler.event_bridge.moved.clear()
+    with contextlib.redirect_stdout(io.StringIO()):  # Jeder verschobene Screenshot wird gemeldet
+        handler.start_workers()
+        writers = start_screenshot_burst(handler, source_folder, count, size, write_duration)
+        deadline = time.monotonic() + timeout
+        while len(handler.event_bridge.moved) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for writer in writers:
+            writer.join()
+        handler.stop_workers()
+
+    moved = list(handler.event_bridge.moved)
+    incomplete = [path for path in moved if os.path.getsize(path) != size]
+    for path in moved:
+        os.remove(path)
+    if len(moved) != count or incomplete:
+        raise RuntimeError(f"Burst: {len(moved)}/{count} verschoben, {len(incomplete)} unvollständig")
+
+
+def check_screenshot_stop(handler, source_folder, count, size, write_duration):
+    """Stoppt die Worker mitten im Burst: `stop_workers` muss innerhalb von `STOP_TIMEOUT` zurückkehren,
+    und kein Screenshot darf halb verschoben werden. Gibt die Verstöße zurück."""
+    handler.event_bridge.moved.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler.start_workers()
+        writers = start_screenshot_burst(handler, source_folder, count, size, write_duration)
+        time.sleep(write_duration / 2)
+        start = time.perf_counter()
+        dropped = handler.stop_workers()
+        stop_seconds = time.perf_counter() - start
+    for writer in writers:
+        writer.join()
+
+    moved = list(handler.event_bridge.moved)
+    remaining = [name for name in os.listdir(source_folder) if name.endswith(".png")]
+    print(f"   {'screenshot_handler.stop_workers (im Burst)':<45} {stop_seconds * 1000:10.2f} ms   "
+          f"{len(moved)} verschoben, {dropped} verworfen")
+    violations = []
+    if stop_seconds > handler.STOP_TIMEOUT + 0.5:
+        print(f"❌ stop_workers blockierte {stop_seconds:.1f} s (erlaubt: {handler.STOP_TIMEOUT:.1f} s)")
+        violations.append("screenshot_handler.stop_workers")
+    if len(moved) + len(remaining) != count or any(os.path.getsize(path) != size for path in moved):
+        print(f"❌ Screenshots verloren oder unvollständig: {len(moved)} verschoben, {len(remaining)} liegen noch im Quellordner")
+        violations.append("screenshot_handler.stop_workers (Dateien)")
+    for name in remaining:
+        os.remove(os.path.join(source_folder, name))
+    for path in moved:
+        os.remove(path)
+    return violations
+
+
+def metric(result):
+    """Gibt (Schlüssel, Einheit) der Messgröße eines Ergebnisses zurück (Zeit oder Speicher)."""
+    return ("peak_kib", "KiB") if "peak_kib" in result else ("median_ms", "ms")
+
+
+def measure(name, function, repeat, setup=None):
+    """Führt `function` `repeat`-mal aus (mit optionalem `setup` davor) und gibt die Zeiten in ms zurück."""
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):  # Die Manager sind gesprächig
+            argument = setup() if setup else None
+            start = time.perf_counter()
+            if setup:
+                function(argument)
+            else:
+                function()
+            times.append((time.perf_counter() - start) * 1000)
+    result = {"median_ms": statistics.median(times), "min_ms": min(times), "max_ms": max(times), "repeat": repeat}
+    print(f"   {name:<45} median {result['median_ms']:10.2f} ms   min {result['min_ms']:10.2f} ms")
+    return result
+
+
+def run_benchmarks(args, base_dir, trainee_folder):
+    """Führt alle Benchmarks aus und gibt ein Dict Name → Ergebnis zurück."""
+    # Erst hier importieren: CONFIG_DIR hängt von LOCALAPPDATA ab
+    from core.catalog import TraineeCatalog
+    from core.screenshot_manager import ScreenshotManager
+    from core.server_uploader import ServerUploader, get_upload_manifest
+    from core.trainee_manager import TraineeManager
+
+    results = {}
+    problems = []  # Namen fehlgeschlagener Prüfungen (unabhängig von der Baseline)
+    repeat = args.repeat
+    catalog_db = os.path.join(base_dir, "benchmark-catalog.sqlite")
+    # Vor den Katalog-Benchmarks anlegen, damit jeder Lauf denselben Baum sieht
+    training_folder = create_upload_training(trainee_folder, args.upload_files, args.upload_size)
+
+    print("📂 TraineeManager / Katalog")
+
+    def fresh_catalog():
+        if os.path.exists(catalog_db):
+            os.remove(catalog_db)
+
+    def cold_scan(_):
+        catalog = TraineeCatalog(catalog_db, trainee_folder)
+        catalog.refresh()
+        catalog.connection.close()
+
+    results["catalog.cold_scan"] = measure("catalog.cold_scan", cold_scan, repeat, setup=fresh_catalog)
+
+    def warm_load():
+        catalog = TraineeCatalog(catalog_db, trainee_folder)
+        catalog.get_trainees()
+        catalog.connection.close()
+
+    results["catalog.warm_load"] = measure("catalog.warm_load", warm_load, repeat)
+
+    manager = TraineeManager()
+    manager.get_catalog()
+    trainees = manager.get_trainees()
+    results["trainee_manager.get_trainees"] = measure("trainee_manager.get_trainees", manager.get_trainees, repeat)
+    results["trainee_manager.get_trainings (alle)"] = measure(
+        "trainee_manager.get_trainings (alle)", lambda: [manager.get_trainings(name) for name in trainees], repeat)
+
+    print(f"🔎 Trainee-Suche ({args.search_trainees * 10} Trainings)")
+    from core.fulltext_index import FulltextIndex
+    from core.search_index import SearchIndex
+    # Eigener Baum ohne Screenshots: die Suche soll unabhängig von `--scale` immer gleich groß sein
+    search_folder = os.path.join(os.path.dirname(trainee_folder), f"trainees-search-{args.search_trainees}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_tree(search_folder, args.search_trainees, 10, 0)
+    search_catalog = TraineeCatalog(os.path.join(base_dir, "search-catalog.sqlite"), search_folder)
+    search_catalog.refresh()
+    fulltext_index = FulltextIndex(search_folder, os.path.join(base_dir, "search-fulltext.sqlite"))
+    results["fulltext_index.refresh (kalt)"] = measure("fulltext_index.refresh (kalt)", fulltext_index.refresh, 1)
+    results["fulltext_index.refresh (warm)"] = measure("fulltext_index.refresh (warm)", fulltext_index.refresh, repeat)
+
+    search_index = SearchIndex(fulltext_index)
+    search_index.build_names(types.SimpleNamespace(get_catalog=lambda: search_catalog))
+
+    def type_queries():
+        for query in SEARCH_QUERIES:
+            for length in range(1, len(query) + 1):
+                search_index.search(query[:length])
+
+    keystrokes = sum(len(query) for query in SEARCH_QUERIES)
+    results["search_index.keystrokes"] = measure(f"search_index.search ×{keystrokes} Tastendrücke", type_queries, repeat)
+    # Volltext nur einmal pro Suchbegriff, wie nach der Tipp-Pause in der Trainee-Verwaltung
+    results["search_index.match_content"] = measure(
+        f"search_index.match_content ×{len(SEARCH_QUERIES)}",
+        lambda: [search_index.match_content(query) for query in SEARCH_QUERIES], repeat)
+    search_catalog.connection.close()
+    fulltext_index.connection.close()
+
+    print("📸 ScreenshotManager")
+    random.seed(42)
+    sample = [(trainee, "Training 00") for trainee in random.sample(trainees, min(args.sample, len(trainees)))]
+    window = DummyTrainingWindow()
+
+    def open_managers():
+        return [ScreenshotManager(trainee, training, window, trainee_manager=manager) for trainee, training in sample]
+
+    results["screenshot_manager.open"] = measure("screenshot_manager.open", open_managers, repeat)
+    screenshot_managers = open_managers()
+    results["screenshot_manager.get_screenshots"] = measure(
+        "screenshot_manager.get_screenshots", lambda: [m.get_screenshots() for m in screenshot_managers], repeat)
+    results["screenshot_manager.load_all_comments"] = measure(
+        "screenshot_manager.load_all_comments", lambda: [m.load_all_comments() for m in screenshot_managers], repeat)
+
+    def save_comments():
+        screenshot_manager = screenshot_managers[0]
+        for index in range(args.comment_edits):
+            screenshot_manager.save_screenshot_comment(f"screenshot_{index % 10:03d}.png", f"Bearbeitung {index}")
+        screenshot_manager.flush_comments()
+
+    results["screenshot_manager.save_screenshot_comment"] = measure(
+        f"screenshot_manager.save_screenshot_comment ×{args.comment_edits}", save_comments, repeat)
+
+    print("📥 Screenshot-Burst (langsame Schreiber)")
+    from core.screenshot_manager import ScreenshotHandler
+    burst_source = os.path.join(base_dir, "burst-source")
+    handler = ScreenshotHandler("Burst Trainee", "Burst Training", BurstEventBridge(), manager)
+    results[f"screenshot_handler.burst ({args.burst_files} Dateien)"] = measure(
+        f"screenshot_handler.burst ({args.burst_files} Dateien, {args.burst_write_ms:.0f} ms Schreibzeit)",
+        lambda: run_screenshot_burst(handler, burst_source, args.burst_files, 256 * 1024, args.burst_write_ms / 1000), repeat)
+    problems += check_screenshot_stop(handler, burst_source, args.burst_files, 256 * 1024, args.burst_write_ms / 1000)
+    shutil.rmtree(os.path.join(trainee_folder, "Burst Trainee"), ignore_errors=True)
+
+    print("📦 Export / Import")
+    from core.trainee_archive import zstandard
+    archive_trainees = sorted({"Upload Trainee", *(trainee for trainee, _ in sample)})
+    import_folder = os.path.join(base_dir, "import-target")
+
+    def fresh_import_folder():
+        if os.path.isdir(import_folder):
+            shutil.rmtree(import_folder)
+        os.makedirs(import_folder)
+        importer = TraineeManager()
+        importer.trainee_folder = import_folder
+        importer.catalog = TraineeCatalog(os.path.join(base_dir, "import-catalog.sqlite"), import_folder)
+        return importer
+
+    for extension in (".zip", ".tar.zst") if zstandard else (".zip",):
+        archive_path = os.path.join(base_dir, f"benchmark-export{extension}")
+        results[f"trainee_manager.export_trainees ({extension})"] = measure(
+            f"trainee_manager.export_trainees ({extension}) {len(archive_trainees)} Trainees",
+            lambda: manager.export_trainees(archive_trainees, archive_path), repeat)
+        results[f"trainee_manager.import_archive ({extension})"] = measure(
+            f"trainee_manager.import_archive ({extension})",
+            lambda importer: importer.import_archive(archive_path), repeat, setup=fresh_import_folder)
+        print(f"   {'Archivgröße':<45} {os.path.getsize(archive_path) / 1e6:10.1f} MB")
+
+    print("🌐 ServerUploader")
+    faults = FaultConfig(latency_ms=args.latency, bandwidth_kib=args.bandwidth, error_rate=args.error_rate, seed=42)
+    server = DebriefServer(faults=faults).start_in_background()
+
+    def new_uploader(upload_mode, training_name="Upload Training"):
+        def setup():
+            manifest = os.path.join(trainee_folder, "Upload Trainee", training_name, "upload_manifest.json")
+            if os.path.exists(manifest):
+                os.remove(manifest)  # Sonst werden alle Screenshots als bereits hochgeladen übersprungen
+            get_upload_manifest(os.path.dirname(manifest)).load()  # Das geteilte Manifest hält den Stand im Speicher
+            server.store.forget_trainings()
+            return ServerUploader("Upload Trainee", training_name, "2025-01-01 00:00:00", api_base_url=server.api_base_url,
+                                  upload_mode=upload_mode, trainee_manager=manager)
+        return setup
+
+    def debrief_ready(uploader):
+        """Wie der Debrief-Button: Trainingsdaten & alle Screenshots über das Journal, bis die Links bereitstehen."""
+        uploader.journal.enqueue_training_data()
+        _, _, remaining = uploader.upload_screenshots()
+        if remaining:
+            raise RuntimeError(f"{remaining} Uploads nicht abgeschlossen")
+
+    try:
+        results["server_uploader.upload_training_data"] = measure(
+            "server_uploader.upload_training_data", lambda uploader: uploader.upload_training_data(), repeat,
+            setup=new_uploader(ServerUploader.UPLOAD_MODE_MULTIPART))
+        for upload_mode in (ServerUploader.UPLOAD_MODE_MULTIPART, ServerUploader.UPLOAD_MODE_JSON):
+            name = f"server_uploader.upload_screenshots ({upload_mode})"
+            results[name] = measure(f"{name} {args.upload_files}×{args.upload_size // 1024} KiB",
+                                    lambda uploader: uploader.upload_screenshots(), repeat, setup=new_uploader(upload_mode))
+
+        # Zeit bis zum fertigen Debrief in Abhängigkeit von der Anzahl der Screenshots
+        for count in args.debrief_counts:
+            training_name = f"Debrief {count}"
+            create_upload_training(trainee_folder, count, args.upload_size, training_name)
+            results[f"server_uploader.debrief_ready ({count} Screenshots)"] = measure(
+                f"server_uploader.debrief_ready ({count}×{args.upload_size // 1024} KiB)", debrief_ready, repeat,
+                setup=new_uploader(ServerUploader.UPLOAD_MODE_MULTIPART, training_name))
+            shutil.rmtree(os.path.join(trainee_folder, "Upload Trainee", training_name))
+    finally:
+        server.shutdown()
+
+    print("🧠 Speicherbedarf beim Upload (Server in eigenem Prozess)")
+    server_process, api_base_url = start_server_process()
+    try:
+        sizes = sorted(args.memory_sizes)
+        for size_mb in sizes:
+            results[f"server_uploader.upload_memory ({size_mb} MB)"] = measure_upload_memory(
+                manager, trainee_folder, api_base_url, size_mb)
+        problems += check_upload_memory(results, sizes)
+    finally:
+        server_process.kill()
+        server_process.wait()
+        shutil.rmtree(os.path.join(trainee_folder, "Memory Trainee"), ignore_errors=True)
+        manager.catalog.stop_watching()
+
+    return results, problems
+
+
+def check_upload_memory(results, sizes):
+    """Prüft, dass der Spitzenverbrauch beim Upload nicht mit der Dateigröße wächst; gibt die Verstöße zurück."""
+    if len(sizes) < 2:
+        return []
+    sizes = sorted(sizes)
+    smallest = results[f"server_uploader.upload_memory ({sizes[0]} MB)"]["peak_kib"]
+    violations = []
+    for size_mb in sizes[1:]:
+        name = f"server_uploader.upload_memory ({size_mb} MB)"
+        if results[name]["peak_kib"] > smallest + UPLOAD_MEMORY_SLACK_KIB:
+            print(f"❌ {name}: {results[name]['peak_kib']:.0f} KiB statt höchstens {smallest + UPLOAD_MEMORY_SLACK_KIB:.0f} KiB")
+            violations.append(name)
+    return violations
+
+
+def compare(results, baseline, threshold):
+    """Vergleicht die Ergebnisse mit der Baseline und gibt die Namen der Regressionen zurück."""
+    regressions = []
+    print(f"\n📊 Vergleich mit Baseline vom {baseline['created']} ({baseline['platform']})")
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if not reference:
+            print(f"   {name:<45} neu")
+            continue
+        key, unit = metric(result)
+        if key not in reference:
+            print(f"   {name:<45} neu")
+            continue
+        change = result[key] / reference[key] - 1 if reference[key] else 0.0
+        marker = "❌" if change > threshold else ("✅" if change < -threshold else "  ")
+        print(f"   {marker} {name:<42} {reference[key]:10.2f} → {result[key]:10.2f} {unit} ({change:+.0%})")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für TraineeManager, ScreenshotManager & ServerUploader.")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="Größe des synthetischen Trainee-Ordners")
+    parser.add_argument("--tree-dir", help="Ordner für den synthetischen Baum (wird wiederverwendet)")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Benchmark")
+    parser.add_argument("--sample", type=int, default=100, help="Anzahl Trainings für die ScreenshotManager-Benchmarks")
+    parser.add_argument("--comment-edits", type=int, default=1000, help="Bemerkungs-Änderungen pro Durchlauf")
+    parser.add_argument("--upload-files", type=int, default=50, help="Anzahl Screenshots für die Upload-Benchmarks")
+    parser.add_argument("--debrief-counts", type=lambda value: [int(count) for count in value.split(",")], default=[10, 100, 500],
+                        help="Anzahl Screenshots für die Messung bis zum fertigen Debrief (kommagetrennt)")
+    parser.add_argument("--upload-size", type=int, default=512 * 1024, help="Größe je Upload-Screenshot in Bytes")
+    parser.add_argument("--latency", type=float, default=0, help="Simulierte Server-Latenz in ms")
+    parser.add_argument("--bandwidth", type=float, help="Simulierte Upload-Bandbreite in KiB/s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlschlagender Upload-Anfragen")
+    parser.add_argument("--memory-sizes", type=lambda value: [int(size) for size in value.split(",")], default=[1, 200],
+                        help="Dateigrößen in MB für die Speichermessung beim Upload (kommagetrennt)")
+    parser.add_argument("--search-trainees", type=int, default=1000, help="Trainees (à 10 Trainings) für die Such-Benchmarks")
+    parser.add_argument("--burst-files", type=int, default=50, help="Anzahl gleichzeitig entstehender Screenshots im Burst")
+    parser.add_argument("--burst-write-ms", type=float, default=500, help="Schreibdauer je Burst-Screenshot in ms")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Erlaubte Verschlechterung gegenüber der Baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Pfad zur Baseline-Datei")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnisse als neue Baseline speichern")
+    args = parser.parse_args()
+
+    base_dir = tempfile.mkdtemp(prefix="traineemanager-benchmark-")
+    tree_dir = args.tree_dir or base_dir
+    trainee_folder = os.path.join(tree_dir, f"trainees-{args.scale}")
+    try:
+        # Eigener Konfigurationsordner, damit die echte config.json & der Katalog unberührt bleiben
+        os.environ["LOCALAPPDATA"] = base_dir
+        config_dir = os.path.join(base_dir, "TraineeManager")
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, "config.json"), "w", encoding="utf-8") as f:
+            json.dump({"trainee_folder": trainee_folder}, f)
+
+        generate_tree(trainee_folder, *SCALES[args.scale])
+        results, regressions = run_benchmarks(args, base_dir, trainee_folder)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.scale in baselines:
+        regressions += compare(results, baselines[args.scale], args.threshold)
+    else:
+        print(f"\nℹ️ Keine Baseline für Skala '{args.scale}' – mit --save-baseline anlegen.")
+
+    if args.save_baseline:
+        baselines[args.scale] = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": f"{platform.system()} {platform.release()}, Python {platform.python_version()}",
+            "results": results,
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=4, ensure_ascii=False)
+        print(f"💾 Baseline gespeichert: {args.baseline}")
+
+    if regressions:
+        print(f"❌ Langsamer als die Baseline bzw. Prüfung fehlgeschlagen: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,645 @@
+"""Lokaler Ersatz für den Debrief-Server (für Offline-Tests & Lastmessungen).
+
+Implementiert dieselben Endpunkte wie der Live-Server:
+
+    POST /api/v2/<id>/upload           Trainingsdaten (JSON)
+    POST /api/<id>/upload              Screenshot (multipart/form-data oder Base64-JSON)
+    GET  /api/<id>/events              Live-Kanal: WebSocket, JSON-Zeilen hin, Bestätigungen zurück
+    GET  /trainer/<id>, /trainee/<id>  Debrief-Seiten für Trainer & Trainee
+    GET  /api/<id>/state               Live-Zustand (aktueller Screenshot, Notizen, Bemerkungen) für die Seiten
+    GET  /api/<id>/screenshots/<name>  Hochgeladener Screenshot
+    GET  /stats                        Zähler (Anfragen, Bytes, injizierte Fehler)
+
+Latenz, Bandbreite und Fehler lassen sich einstellen, damit Upload-Durchsatz und
+Retry-Verhalten reproduzierbar ohne Netz gemessen werden können:
+
+    python tools/debrief_server.py --port 8765 --latency 80 --bandwidth 2048 --error-rate 0.05
+
+Der TraineeManager nutzt den Server, wenn die Umgebungsvariablen gesetzt sind:
+
+    TRAINEEMANAGER_API_URL=http://127.0.0.1:8765/api
+    TRAINEEMANAGER_VIEWER_URL=http://127.0.0.1:8765
+"""
+import argparse
+import base64
+import hashlib
+import html
+import json
+import random
+import re
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote
+
+API_PREFIX = "/api"
+READ_CHUNK_SIZE = 16 * 1024
+
+TRAINING_UPLOAD_ROUTE = re.compile(rf"^{API_PREFIX}/v2/([^/]+)/upload$")
+SCREENSHOT_UPLOAD_ROUTE = re.compile(rf"^{API_PREFIX}/([^/]+)/upload$")
+SCREENSHOT_ROUTE = re.compile(rf"^{API_PREFIX}/([^/]+)/screenshots/([^/]+)$")
+# Die Debrief-Seiten fragen den Live-Zustand regelmäßig ab und zeigen Notizen & den vom Trainer gewählten Screenshot.
+LIVE_SCRIPT = """
+const live = document.getElementById('live');
+let shown = null;
+async function poll() {
+  try {
+    const state = await (await fetch('%(state_url)s')).json();
+    const name = state.current_screenshot;
+    if (name && name !== shown) {
+      shown = name;
+      live.querySelector('img').src = '%(screenshot_url)s' + encodeURIComponent(name);
+    }
+    if (shown) {
+      live.querySelector('figcaption').textContent = shown + ': ' + (state.screenshot_comments[shown.split(' ').join('_')] || state.screenshot_comments[shown] || '');
+    }
+    document.getElementById('notes').textContent = state.general_notes;
+  } catch (e) {}
+  setTimeout(poll, 1000);
+}
+poll();
+"""
+EVENTS_ROUTE = re.compile(rf"^{API_PREFIX}/([^/]+)/events$")
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+STATE_ROUTE = re.compile(rf"^{API_PREFIX}/([^/]+)/state$")
+VIEWER_ROUTE = re.compile(r"^/(trainer|trainee)/([^/]+)$")
+
+MULTIPART_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+MULTIPART_NAME = re.compile(r'[;\s]name="([^"]*)"')
+MULTIPART_FILENAME = re.compile(r'filename="([^"]*)"')
+
+
+class FaultConfig:
+    """Simulierte Netzbedingungen: Latenz, gemeinsame Bandbreite und Fehlerinjektion."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, bandwidth_kib=None, error_rate=0.0, error_status=503,
+                 drop_rate=0.0, reject_multipart=False, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth = bandwidth_kib * 1024 if bandwidth_kib else None  # Bytes pro Sekunde
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.reject_multipart = reject_multipart
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_free = 0.0
+
+    def roll(self, rate):
+        """True mit Wahrscheinlichkeit `rate` (reproduzierbar über `seed`)."""
+        with self._lock:
+            return rate > 0 and self.random.random() < rate
+
+    def delay(self):
+        """Wartet die eingestellte Latenz (plus zufälligem Jitter) ab."""
+        with self._lock:
+            jitter = self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000)
+
+    def throttle(self, byte_count):
+        """Begrenzt den Durchsatz aller Verbindungen zusammen wie eine gemeinsame Leitung."""
+        if not self.bandwidth:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + byte_count / self.bandwidth
+            wait = self._next_free - now
+        time.sleep(wait)
+
+
+class DebriefStore:
+    """Hält hochgeladene Trainings & Screenshots im Speicher und zählt die Anfragen."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.trainings = {}  # Training-ID → {"data": ..., "screenshots": {Name → Bytes}, "thumbnails": {...}}
+        self.idempotent_responses = {}  # Idempotency-Key → Antwort des ersten erfolgreichen Uploads
+        self.stats = {"requests": 0, "training_uploads": 0, "screenshot_uploads": 0, "multipart_uploads": 0,
+                      "json_uploads": 0, "duplicate_uploads": 0, "idempotent_replays": 0, "bytes_received": 0,
+                      "injected_errors": 0, "dropped_connections": 0, "rejected_multipart": 0,
+                      "event_streams": 0, "event_batches": 0, "events": 0, "duplicate_events": 0,
+                      "notes_patches": 0, "notes_resyncs": 0, "aborted_requests": 0}
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def forget_trainings(self):
+        """Verwirft alle gespeicherten Trainings (zwischen Benchmark-Läufen, damit der Speicher nicht wächst)."""
+        with self._lock:
+            self.trainings.clear()
+            self.idempotent_responses.clear()
+
+    def training(self, training_id):
+        """Gibt den Eintrag eines Trainings zurück und legt ihn bei Bedarf an (Aufrufer hält den Lock)."""
+        return self.trainings.setdefault(training_id, {"data": {}, "screenshots": {}, "thumbnails": {}, "announced": [],
+                                                       "current_screenshot": None, "last_sequence": {}, "events": 0,
+                                                       "live": {}, "notes_out_of_sync": False})
+
+    def save_training_data(self, training_id, data):
+        with self._lock:
+            training = self.training(training_id)
+            training["data"] = self.merge_live(data, training["live"])
+            self.stats["training_uploads"] += 1
+
+    @staticmethod
+    def merge_live(data, live):
+        """Live übertragene Notizen & Bemerkungen sind neuer als ein (verspätet ankommender) Gesamt-Upload."""
+        data = dict(data)
+        if "general_notes" in live:
+            data["general_notes"] = live["general_notes"]
+        if live.get("screenshot_comments"):
+            data["screenshot_comments"] = {**data.get("screenshot_comments", {}), **live["screenshot_comments"]}
+        return data
+
+    def save_screenshot(self, training_id, filename, content, thumbnail=None):
+        with self._lock:
+            training = self.training(training_id)
+            if filename in training["screenshots"]:
+                self.stats["duplicate_uploads"] += 1
+            training["screenshots"][filename] = content
+            if thumbnail is not None:
+                training["thumbnails"][filename] = thumbnail
+            self.stats["screenshot_uploads"] += 1
+
+    def replay(self, idempotency_key):
+        """Gibt die gespeicherte Antwort zu einem bereits verarbeiteten Idempotenz-Schlüssel zurück (oder None)."""
+        if not idempotency_key:
+            return None
+        with self._lock:
+            response = self.idempotent_responses.get(idempotency_key)
+            if response is not None:
+                self.stats["idempotent_replays"] += 1
+            return response
+
+    def remember(self, idempotency_key, response):
+        if idempotency_key:
+            with self._lock:
+                self.idempotent_responses[idempotency_key] = response
+
+    def apply_events(self, training_id, session_id, events):
+        """Wendet Live-Ereignisse an (bekannte Sequenznummern werden verworfen).
+
+        Gibt die Antwortzeile zurück: höchste Sequenznummer und ggf. `resync`, wenn
+        die Notizen nach einem Patch nicht mehr die vom Client erwartete Länge haben.
+        """
+        resync = []
+        with self._lock:
+            training = self.training(training_id)
+            last_sequence = training["last_sequence"].get(session_id, 0)
+            self.stats["event_batches"] += 1
+            for event in events:
+                sequence = event.get("seq", 0)
+                if sequence <= last_sequence:
+                    self.stats["duplicate_events"] += 1
+                    continue
+                last_sequence = sequence
+                training["events"] += 1
+                self.stats["events"] += 1
+
+                event_type = event.get("type")
+                if event_type == "screenshot":
+                    training["announced"].append(event.get("filename"))
+                elif event_type == "show_screenshot":
+                    training["current_screenshot"] = event.get("filename")
+                elif event_type == "comments":
+                    training["live"].setdefault("screenshot_comments", {}).update(event.get("comments", {}))
+                elif event_type == "notes_reset":
+                    training["live"]["general_notes"] = event.get("text", "")
+                    training["notes_out_of_sync"] = False
+                elif event_type == "notes_patch" and not training["notes_out_of_sync"]:
+                    if not self.apply_notes_patch(training, event):
+                        training["notes_out_of_sync"] = True  # Weitere Patches bis zum nächsten Reset ignorieren
+                        self.stats["notes_resyncs"] += 1
+                        resync.append("notes")
+            training["last_sequence"][session_id] = last_sequence
+            training["data"] = self.merge_live(training["data"], training["live"])
+
+        response = {"ack": last_sequence}
+        if resync:
+            response["resync"] = resync
+        return response
+
+    def apply_notes_patch(self, training, event):
+        """Wendet `[Position, entfernte Zeichen, Text]`-Patches an; False, wenn die Länge nicht passt."""
+        text = training["live"].get("general_notes", training["data"].get("general_notes", ""))
+        for position, chars_removed, inserted_text in event.get("patches", []):
+            position = min(position, len(text))
+            text = text[:position] + inserted_text + text[position + chars_removed:]
+            self.stats["notes_patches"] += 1
+        training["live"]["general_notes"] = text
+        return len(text) == event.get("length", len(text))
+
+    def get_state(self, training_id):
+        """Live-Zustand eines Trainings für die Debrief-Seiten."""
+        with self._lock:
+            training = self.trainings.get(training_id)
+            if not training:
+                return None
+            return {"current_screenshot": training["current_screenshot"], "announced": list(training["announced"]),
+                    "screenshots": sorted(training["screenshots"]), "events": training["events"],
+                    "screenshot_comments": dict(training["data"].get("screenshot_comments", {})),
+                    "general_notes": training["data"].get("general_notes", "")}
+
+    def get_training(self, training_id):
+        with self._lock:
+            training = self.trainings.get(training_id)
+            if not training:
+                return None
+            return {"data": dict(training["data"]), "screenshots": dict(training["screenshots"])}
+
+    def snapshot_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["trainings"] = len(self.trainings)
+            return stats
+
+
+class DebriefRequestHandler(BaseHTTPRequestHandler):
+    """Beantwortet die Debrief-Endpunkte; Keep-Alive wie beim echten Server (HTTP/1.1)."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def store(self):
+        return self.server.store
+
+    @property
+    def faults(self):
+        return self.server.faults
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def do_POST(self):
+        self.store.count("requests")
+        if self.faults.roll(self.faults.drop_rate):
+            # Verbindung ohne Antwort schließen (Client sieht einen Verbindungsfehler)
+            self.store.count("dropped_connections")
+            self.close_connection = True
+            return
+
+        body = self.read_body()
+        if body is None:
+            self.store.count("aborted_requests")
+            self.close_connection = True
+            return
+
+        self.faults.delay()
+        if self.faults.roll(self.faults.error_rate):
+            self.store.count("injected_errors")
+            self.send_json(self.faults.error_status, {"error": "injizierter Fehler"})
+            return
+
+        match = TRAINING_UPLOAD_ROUTE.match(self.path)
+        if match:
+            self.handle_training_upload(match.group(1), body)
+            return
+
+        match = SCREENSHOT_UPLOAD_ROUTE.match(self.path)
+        if match:
+            self.handle_screenshot_upload(match.group(1), body)
+            return
+
+        self.send_json(404, {"error": "unbekannter Endpunkt"})
+
+    def do_GET(self):
+        self.store.count("requests")
+        path = unquote(self.path.split("?", 1)[0])
+        match = EVENTS_ROUTE.match(path)
+        if match:
+            self.handle_event_socket(match.group(1))
+            return
+
+        self.faults.delay()
+
+        if path == "/stats":
+            self.send_json(200, self.store.snapshot_stats())
+            return
+
+        match = SCREENSHOT_ROUTE.match(path)
+        if match:
+            self.handle_screenshot_download(*match.groups())
+            return
+
+        match = STATE_ROUTE.match(path)
+        if match:
+            state = self.store.get_state(match.group(1))
+            self.send_json(200 if state else 404, state or {"error": "Training nicht gefunden"})
+            return
+
+        match = VIEWER_ROUTE.match(path)
+        if match:
+            self.handle_viewer(*match.groups())
+            return
+
+        self.send_json(404, {"error": "unbekannter Endpunkt"})
+
+    # ------------------------------------------------------------------
+    # Endpunkte
+    # ------------------------------------------------------------------
+
+    def handle_training_upload(self, training_id, body):
+        try:
+            data = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.send_json(400, {"error": "ungültiges JSON"})
+            return
+        self.store.save_training_data(training_id, data)
+        self.send_json(200, {"status": "ok", "training_id": training_id})
+
+    def handle_screenshot_upload(self, training_id, body):
+        idempotency_key = self.headers.get("Idempotency-Key")
+        replayed = self.store.replay(idempotency_key)
+        if replayed is not None:
+            self.send_json(200, replayed)  # Wiederholung eines bereits gespeicherten Uploads
+            return
+
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            if self.faults.reject_multipart:
+                self.store.count("rejected_multipart")
+                self.send_json(415, {"error": "multipart wird nicht unterstützt"})
+                return
+            fields, files = self.parse_multipart(content_type, body)
+            screenshot = files.get("file")
+            filename = fields.get("filename") or (screenshot[0] if screenshot else None)
+            content = screenshot[1] if screenshot else None
+            thumbnail = files.get("thumbnail", (None, None))[1]
+            self.store.count("multipart_uploads")
+        else:
+            try:
+                payload = json.loads(body)
+                filename = payload.get("filename")
+                content = base64.b64decode(payload["file"])
+                thumbnail = base64.b64decode(payload["thumbnail"]) if payload.get("thumbnail") else None
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, ValueError, AttributeError):
+                self.send_json(400, {"error": "ungültiger Upload"})
+                return
+            self.store.count("json_uploads")
+
+        if not filename or content is None:
+            self.send_json(400, {"error": "Datei oder Dateiname fehlt"})
+            return
+
+        self.store.save_screenshot(training_id, filename, content, thumbnail)
+        response = {"status": "ok", "filename": filename, "size": len(content)}
+        self.store.remember(idempotency_key, response)
+        self.send_json(200, response)
+
+    def handle_event_socket(self, training_id):
+        """Live-Kanal: WebSocket-Upgrade, danach wird jede Text-Nachricht sofort bestätigt."""
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self.send_json(426, {"error": "Live-Kanal erwartet ein WebSocket-Upgrade"})
+            return
+
+        session_id = self.headers.get("X-Session-Id", "")
+        self.faults.delay()
+        self.store.count("event_streams")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True  # Nach dem WebSocket ist die Verbindung keine HTTP-Verbindung mehr
+
+        message = b""
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                return  # Client ist weg
+            fin, opcode, payload = frame
+            if opcode == 0x8:
+                self.write_frame(0x8, payload[:2])
+                return
+            if opcode == 0x9:
+                self.write_frame(0xA, payload)
+                continue
+            if opcode not in (0x0, 0x1):
+                continue
+
+            self.faults.throttle(len(payload))
+            self.store.count("bytes_received", len(payload))
+            if self.faults.roll(self.faults.drop_rate):
+                # Verbindung mitten im Kanal abbrechen, ohne zu bestätigen
+                self.store.count("dropped_connections")
+                return
+
+            message += payload
+            if not fin:
+                continue
+            events = [json.loads(line) for line in message.splitlines() if line.strip()]
+            message = b""
+            response = self.store.apply_events(training_id, session_id, events)
+            self.write_frame(0x1, json.dumps(response).encode("utf-8"))
+
+    def read_frame(self):
+        """Liest einen (maskierten) Client-Frame; None, wenn die Verbindung endet."""
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.rfile.read(8))[0]
+        key = self.rfile.read(4) if header[1] & 0x80 else b""
+        payload = self.rfile.read(length)
+        if len(payload) < length:
+            return None
+        if key:
+            mask = (key * (length // 4 + 1))[:length]
+            payload = (int.from_bytes(payload, "big") ^ int.from_bytes(mask, "big")).to_bytes(length, "big")
+        return bool(header[0] & 0x80), header[0] & 0x0F, payload
+
+    def write_frame(self, opcode, payload):
+        """Schreibt einen unmaskierten Server-Frame."""
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+    def handle_screenshot_download(self, training_id, filename):
+        training = self.store.get_training(training_id)
+        content = training["screenshots"].get(filename) if training else None
+        if content is None:
+            self.send_json(404, {"error": "Screenshot nicht gefunden"})
+            return
+        self.send_bytes(200, content, "image/png")
+
+    def handle_viewer(self, role, training_id):
+        training = self.store.get_training(training_id)
+        if not training:
+            self.send_bytes(404, "<h1>Training nicht gefunden</h1>".encode("utf-8"), "text/html; charset=utf-8")
+            return
+
+        data = training["data"]
+        comments = data.get("screenshot_comments", {})
+        rows = []
+        for filename in sorted(training["screenshots"]):
+            comment = comments.get(filename.replace(" ", "_"), comments.get(filename, ""))
+            rows.append(
+                f'<figure><img src="{API_PREFIX}/{quote(training_id)}/screenshots/{quote(filename)}" width="480">'
+                f"<figcaption>{html.escape(filename)}: {html.escape(comment)}</figcaption></figure>"
+            )
+
+        title = "Trainer-Debrief" if role == "trainer" else "Trainee-Debrief"
+        page = (
+            f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>"
+            f"<h1>{title}: {html.escape(str(data.get('training_name', training_id)))}</h1>"
+            f"<p>Trainee: {html.escape(str(data.get('trainee_name', '')))} – {html.escape(str(data.get('date', '')))}</p>"
+            f"<h2>Notizen</h2><pre id='notes'>{html.escape(str(data.get('general_notes', '')))}</pre>"
+            f"<h2>Aktueller Screenshot</h2><figure id='live'><img width='960'><figcaption></figcaption></figure>"
+            f"<h2>Screenshots ({len(rows)})</h2>{''.join(rows)}"
+            f"<script>{LIVE_SCRIPT % {'state_url': f'{API_PREFIX}/{quote(training_id)}/state', 'screenshot_url': f'{API_PREFIX}/{quote(training_id)}/screenshots/'}}</script>"
+            f"</body></html>"
+        )
+        self.send_bytes(200, page.encode("utf-8"), "text/html; charset=utf-8")
+
+    # ------------------------------------------------------------------
+    # Hilfsfunktionen
+    # ------------------------------------------------------------------
+
+    def read_body(self):
+        """Liest den Request-Body blockweise (gedrosselt auf die eingestellte Bandbreite).
+
+        Gibt None zurück, wenn der Client die Verbindung vor dem Ende des Bodys
+        schließt (z. B. abgebrochener Upload) – ein halber Screenshot wird nie gespeichert.
+        """
+        remaining = int(self.headers.get("Content-Length", 0))
+        chunks = []
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, READ_CHUNK_SIZE))
+            if not chunk:
+                break
+            self.faults.throttle(len(chunk))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        body = b"".join(chunks)
+        self.store.count("bytes_received", len(body))
+        return body if remaining <= 0 else None
+
+    @staticmethod
+    def parse_multipart(content_type, body):
+        """Zerlegt einen multipart/form-data-Body in Felder {Name → Text} und Dateien {Name → (Dateiname, Bytes)}.
+
+        Bewusst ein einfaches Aufteilen an der Boundary statt `email.parser`, der bei
+        großen Binärteilen zeilenweise parst und die Upload-Messungen verfälschen würde.
+        """
+        fields, files = {}, {}
+        match = MULTIPART_BOUNDARY.search(content_type)
+        if not match:
+            return fields, files
+
+        delimiter = b"--" + match.group(1).encode("utf-8")
+        for part in body.split(delimiter)[1:]:
+            if part.startswith(b"--"):
+                break  # Abschluss-Boundary
+            headers, _, content = part.partition(b"\r\n\r\n")
+            if content.endswith(b"\r\n"):
+                content = content[:-2]
+            disposition = headers.decode("utf-8", errors="replace")
+            name = MULTIPART_NAME.search(disposition)
+            filename = MULTIPART_FILENAME.search(disposition)
+            if not name:
+                continue
+            if filename:
+                files[name.group(1)] = (filename.group(1), content)
+            else:
+                fields[name.group(1)] = content.decode("utf-8", errors="replace")
+        return fields, files
+
+    def send_json(self, status, data):
+        self.send_bytes(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def send_bytes(self, status, content, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class DebriefServer(ThreadingHTTPServer):
+    """HTTP-Server mit gemeinsamem Speicher & Fehlerkonfiguration für alle Verbindungen."""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), faults=None, verbose=False):
+        super().__init__(address, DebriefRequestHandler)
+        self.faults = faults or FaultConfig()
+        self.store = DebriefStore()
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base_url(self):
+        """Wert für `TRAINEEMANAGER_API_URL` bzw. `ServerUploader(api_base_url=...)`."""
+        return self.base_url + API_PREFIX
+
+    @property
+    def viewer_base_url(self):
+        """Wert für `TRAINEEMANAGER_VIEWER_URL` bzw. `ServerUploader(viewer_base_url=...)`."""
+        return self.base_url
+
+    def start_in_background(self):
+        """Startet den Server in einem Daemon-Thread (für Benchmarks) und gibt ihn zurück."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Debrief-Server mit einstellbarer Latenz, Bandbreite und Fehlern.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="Zusätzliche Latenz pro Anfrage in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Zufälliger Zuschlag zur Latenz in ms (0 bis N)")
+    parser.add_argument("--bandwidth", type=float, help="Gemeinsame Upload-Bandbreite in KiB/s (Standard: unbegrenzt)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Anfragen, die mit --error-status beantwortet werden")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP-Status für injizierte Fehler")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Anteil der Anfragen, bei denen die Verbindung abbricht")
+    parser.add_argument("--reject-multipart", action="store_true", help="multipart-Uploads mit 415 ablehnen (JSON-Fallback testen)")
+    parser.add_argument("--seed", type=int, help="Startwert für reproduzierbare Fehlerinjektion")
+    parser.add_argument("--verbose", action="store_true", help="Jede Anfrage protokollieren")
+    args = parser.parse_args()
+
+    faults = FaultConfig(args.latency, args.jitter, args.bandwidth, args.error_rate, args.error_status,
+                         args.drop_rate, args.reject_multipart, args.seed)
+    server = DebriefServer((args.host, args.port), faults, verbose=args.verbose)
+
+    print(f"🛰️ Debrief-Server läuft auf {server.base_url}")
+    print(f"   TRAINEEMANAGER_API_URL={server.api_base_url}")
+    print(f"   TRAINEEMANAGER_VIEWER_URL={server.viewer_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("📊 " + json.dumps(server.store.snapshot_stats(), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
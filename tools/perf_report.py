@@ -0,0 +1,104 @@
+"""Fasst das Performance-Log (`perf.log` im Konfigurationsordner) pro Span zusammen.
+
+Aufruf aus dem Projektordner:
+    python tools/perf_report.py
+    python tools/perf_report.py --span upload --last-hours 24
+    python tools/perf_report.py --log C:/pfad/zu/perf.log --sort count
+
+Das Log wird mit `TRAINEEMANAGER_PERF=1` (oder `"performance_log": true` in `config.json`) geschrieben.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def default_log_path():
+    """Pfad des Performance-Logs im Konfigurationsordner."""
+    from core import perf
+    return os.path.join(perf.get_perf_folder(), perf.LOG_FILE_NAME)
+
+
+def read_entries(log_path):
+    """Liest alle Einträge aus dem Log und seinen rotierten Vorgängern (`perf.log.1`, ...)."""
+    entries = []
+    for path in sorted(glob.glob(glob.escape(log_path) + ".*"), reverse=True) + [log_path]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Abgeschnittene Zeile nach einem Absturz
+        except OSError:
+            continue
+    return entries
+
+
+def percentile(sorted_values, fraction):
+    """Perzentil nach dem Nearest-Rank-Verfahren."""
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(entries):
+    """Gruppiert die Messwerte nach Span: Anzahl, p50, p95, Maximum, Summe und Fehler."""
+    durations = defaultdict(list)
+    errors = defaultdict(int)
+    for entry in entries:
+        durations[entry["span"]].append(entry["ms"])
+        if entry.get("error"):
+            errors[entry["span"]] += 1
+
+    summary = []
+    for name, values in durations.items():
+        values.sort()
+        summary.append({
+            "span": name,
+            "count": len(values),
+            "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95),
+            "max": values[-1],
+            "total": sum(values),
+            "errors": errors[name],
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zeigt p50/p95 pro Span aus dem Performance-Log.")
+    parser.add_argument("--log", help="Pfad zum Log (Standard: perf.log im Konfigurationsordner)")
+    parser.add_argument("--span", help="Nur Spans, deren Name diesen Text enthält")
+    parser.add_argument("--last-hours", type=float, help="Nur Einträge der letzten N Stunden")
+    parser.add_argument("--sort", choices=["p95", "p50", "count", "total"], default="p95", help="Sortierung (absteigend)")
+    args = parser.parse_args()
+
+    log_path = args.log or default_log_path()
+    entries = read_entries(log_path)
+    if args.span:
+        entries = [entry for entry in entries if args.span in entry["span"]]
+    if args.last_hours:
+        since = time.time() - args.last_hours * 3600
+        entries = [entry for entry in entries if entry.get("ts", 0) >= since]
+
+    if not entries:
+        print(f"❌ Keine Messwerte in '{log_path}' gefunden.")
+        return 1
+
+    summary = sorted(summarize(entries), key=lambda row: row[args.sort], reverse=True)
+    width = max(len(row["span"]) for row in summary)
+    print(f"{'Span':<{width}}  {'Anzahl':>7}  {'p50 ms':>9}  {'p95 ms':>9}  {'max ms':>9}  {'Summe ms':>10}  Fehler")
+    for row in summary:
+        print(f"{row['span']:<{width}}  {row['count']:>7}  {row['p50']:>9.1f}  {row['p95']:>9.1f}  "
+              f"{row['max']:>9.1f}  {row['total']:>10.1f}  {row['errors']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Startup-Benchmark für den TraineeManager.
+
+Misst zwei Dinge in frischen Python-Prozessen:
+
+1. Importzeit von `gui.trainee_window` über `python -X importtime` inkl. der teuersten Module.
+   Module aus dem Trainings-/Upload-/Akte-Stack dürfen beim Start nicht geladen werden.
+2. Zeit bis zum ersten Paint des Trainee-Fensters (Prozessstart → erstes Paint-Event).
+
+Damit kein Dialog erscheint, läuft alles mit einem temporären Konfigurationsordner
+(`LOCALAPPDATA`) und einem synthetischen Trainee-Ordner.
+
+Aufruf aus dem Projektordner:
+    python tools/startup_benchmark.py
+    python tools/startup_benchmark.py --runs 10 --top 25
+Der Exit-Code ist 1, wenn ein Zielwert überschritten oder ein verbotenes Modul geladen wird.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Zielwerte (Median über alle Läufe)
+TARGET_IMPORT_MS = 400
+TARGET_FIRST_PAINT_MS = 1500
+
+# Diese Module gehören zum Trainings-/Upload-/Akte-Stack und werden erst bei Bedarf geladen
+DEFERRED_MODULES = [
+    "requests",
+    "watchdog",
+    "pyperclip",
+    "PIL",
+    "gui.training_window",
+    "gui.akte_window",
+    "gui.progress_window",
+    "gui.notes_window",
+    "core.server_uploader",
+    "core.screenshot_manager",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+FIRST_PAINT_SCRIPT = """
+import sys
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+from gui.trainee_window import TraineeWindow
+
+class PaintWatcher(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            import time
+            print(f"PAINTED {time.time()}", flush=True)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+window = TraineeWindow()
+watcher = PaintWatcher()
+window.installEventFilter(watcher)
+window.show()
+QTimer.singleShot(10000, app.quit)
+app.exec_()
+"""
+
+
+def create_environment(base_dir, trainee_count):
+    """Legt einen Konfigurationsordner und einen synthetischen Trainee-Ordner an und gibt die Umgebung zurück."""
+    trainee_folder = os.path.join(base_dir, "trainees")
+    for index in range(trainee_count):
+        os.makedirs(os.path.join(trainee_folder, f"Trainee {index:03d}", "Training 1"), exist_ok=True)
+
+    config_dir = os.path.join(base_dir, "TraineeManager")
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump({"trainee_folder": trainee_folder}, f)
+
+    env = dict(os.environ)
+    env["LOCALAPPDATA"] = base_dir
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = PROJECT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def parse_importtime(output):
+    """Liest die Ausgabe von `-X importtime` als Liste von (Modul, self µs, kumuliert µs, Tiefe)."""
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+def measure_import(env):
+    """Importiert `gui.trainee_window` in einem frischen Prozess und gibt die Modulliste zurück."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gui.trainee_window"],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import fehlgeschlagen:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def measure_first_paint(env):
+    """Startet das Trainee-Fenster und gibt die Zeit bis zum ersten Paint in ms zurück."""
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT_SCRIPT],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, timeout=60,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("PAINTED "):
+            return (float(line.split()[1]) - start) * 1000
+    raise RuntimeError(f"Kein Paint-Event erhalten:\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Misst Importzeit und Zeit bis zum ersten Paint.")
+    parser.add_argument("--runs", type=int, default=5, help="Anzahl Messläufe (Median wird bewertet)")
+    parser.add_argument("--top", type=int, default=15, help="Anzahl der teuersten Module in der Ausgabe")
+    parser.add_argument("--trainees", type=int, default=200, help="Anzahl synthetischer Trainees")
+    parser.add_argument("--skip-paint", action="store_true", help="Nur die Importzeit messen (ohne Qt-Fenster)")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as base_dir:
+        env = create_environment(base_dir, args.trainees)
+
+        import_times = []
+        modules = []
+        for _ in range(args.runs):
+            modules = measure_import(env)
+            import_times.append(sum(self_us for _, self_us, _, _ in modules) / 1000)
+        import_ms = statistics.median(import_times)
+
+        print(f"⏱️ Importzeit gui.trainee_window: {import_ms:.1f} ms (Ziel {TARGET_IMPORT_MS} ms)")
+        print("   Teuerste Module (kumuliert):")
+        for name, _, cumulative_us, _ in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+        if import_ms > TARGET_IMPORT_MS:
+            failed = True
+
+        loaded = {name for name, _, _, _ in modules}
+        eager = [name for name in DEFERRED_MODULES if name in loaded]
+        if eager:
+            print(f"❌ Beim Start geladen, obwohl erst bei Bedarf gebraucht: {', '.join(eager)}")
+            failed = True
+
+        if not args.skip_paint:
+            paint_times = [measure_first_paint(env) for _ in range(args.runs)]
+            paint_ms = statistics.median(paint_times)
+            print(f"🖼️ Zeit bis zum ersten Paint: {paint_ms:.1f} ms "
+                  f"(min {min(paint_times):.1f}, max {max(paint_times):.1f}, Ziel {TARGET_FIRST_PAINT_MS} ms)")
+            if paint_ms > TARGET_FIRST_PAINT_MS:
+                failed = True
+
+    print("❌ Zielwerte verfehlt" if failed else "✅ Zielwerte eingehalten")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())